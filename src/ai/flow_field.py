@@ -0,0 +1,100 @@
+"""Shared distance field toward the player for every chasing enemy.
+
+One breadth-first search over the room's tile grid gives each open tile its
+path length to the player's tile, and a step table records which neighbour
+lies downhill. Chasers look up the tile under their centre and head for
+that neighbour, so the per-enemy cost is one array lookup however many
+enemies are pathing.
+
+When the player moves a short way the field is repaired instead of rebuilt:
+adding the moved distance to every tile gives valid upper bounds (a path
+through the old source), and only tiles that got closer are revisited.
+"""
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import *
+
+UNREACHABLE = 1 << 30
+FLOW_REPAIR_MAX_STEPS = 4  # Source moves longer than this rebuild the field
+
+
+class FlowField:
+    """Path distances to one source tile over a solid-tile grid (borders solid)"""
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.rows, self.cols = grid.shape
+        self.open = (~grid).ravel().tolist()
+        self.distances = [UNREACHABLE] * grid.size
+        self.distance = np.full(grid.shape, UNREACHABLE, dtype=np.int64)
+        self.step_x = np.zeros(grid.shape, dtype=np.int64)
+        self.step_y = np.zeros(grid.shape, dtype=np.int64)
+        self.source = None
+        self.rebuilds = 0
+        self.repairs = 0
+
+    def set_source(self, col, row):
+        """Point the field at a tile; solid or out-of-grid tiles keep the old source"""
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return
+        cell = row * self.cols + col
+        if cell == self.source or not self.open[cell]:
+            return
+        moved = self.distances[cell]
+        if self.source is None or moved > FLOW_REPAIR_MAX_STEPS:
+            self.distances = [UNREACHABLE] * len(self.open)
+            self.rebuilds += 1
+        else:
+            self.distances = [d + moved if d < UNREACHABLE else d for d in self.distances]
+            self.repairs += 1
+        self.source = cell
+        self.distances[cell] = 0
+        self.relax(cell)
+        self.build_steps()
+
+    def set_source_at(self, x, y):
+        self.set_source(int(x // TILE_SIZE), int(y // TILE_SIZE))
+
+    def relax(self, start):
+        """Lower distances outward from start until nothing improves"""
+        distances = self.distances
+        open_cells = self.open
+        offsets = (-self.cols, 1, self.cols, -1)
+        queue = [start]
+        for cell in queue:  # The queue grows while it is walked
+            next_distance = distances[cell] + 1
+            for offset in offsets:
+                neighbour = cell + offset
+                if open_cells[neighbour] and distances[neighbour] > next_distance:
+                    distances[neighbour] = next_distance
+                    queue.append(neighbour)
+
+    def build_steps(self):
+        """Per tile, the unit step to the neighbour with the smallest distance"""
+        distance = np.array(self.distances, dtype=np.int64).reshape(self.rows, self.cols)
+        padded = np.pad(distance, 1, constant_values=UNREACHABLE)
+        # Up, right, down, left; argmin keeps the first on ties
+        around = np.stack((padded[:-2, 1:-1], padded[1:-1, 2:], padded[2:, 1:-1], padded[1:-1, :-2]))
+        best = around.argmin(axis=0)
+        downhill = around.min(axis=0) < distance
+        self.distance = distance
+        self.step_x = np.where(downhill, np.array((0, 1, 0, -1))[best], 0)
+        self.step_y = np.where(downhill, np.array((-1, 0, 1, 0))[best], 0)
+
+    def targets(self, x, y, width, height, fallback_x, fallback_y):
+        """Top-left positions for a batch of rects to move toward.
+
+        Each rect heads for the centre of the next tile downhill from the tile
+        under its own centre. Rects already on the source tile, or on tiles the
+        field does not reach, head straight for the fallback position.
+        """
+        col = np.clip(((x + width / 2) // TILE_SIZE).astype(np.int64), 0, self.cols - 1)
+        row = np.clip(((y + height / 2) // TILE_SIZE).astype(np.int64), 0, self.rows - 1)
+        step_x = self.step_x[row, col]
+        step_y = self.step_y[row, col]
+        follow = (step_x != 0) | (step_y != 0)
+        target_x = np.where(follow, (col + step_x) * TILE_SIZE + TILE_SIZE / 2 - width / 2, fallback_x)
+        target_y = np.where(follow, (row + step_y) * TILE_SIZE + TILE_SIZE / 2 - height / 2, fallback_y)
+        return target_x, target_y
@@ -0,0 +1,122 @@
+"""AI level of detail: distant entities update less often, idle ones sleep.
+
+Each awake row of an archetype is placed in a tier by its distance to the
+player and accumulates ticks until its tier's period comes round; systems
+then simulate the whole accumulated span at once (dt ticks). Rows are
+staggered by index so a tier's updates spread over its period.
+
+Rows a system finds idle (out of every trigger range) go to sleep: they are
+skipped entirely and registered in a coarse WakeGrid with the rect the
+player has to enter to wake them, so sleepers cost nothing until the
+player comes near.
+"""
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import *
+
+LOD_NEAR = 480  # Closer than this (px) updates every tick
+LOD_FAR = 960  # Closer than this updates every LOD_PERIODS[1] ticks, beyond every LOD_PERIODS[2]
+LOD_PERIODS = (1, 2, 4)
+LOD_SLEEP_MARGIN = 96  # Idle this far beyond a trigger range before sleeping
+LOD_WAKE_MARGIN = 32  # Wake this far before the trigger range is reached
+WAKE_CELL = 128
+
+
+class WakeGrid:
+    """Sleeping entities indexed by the coarse cells their wake rects cover, clipped to the world"""
+
+    def __init__(self, world_width, world_height, cell_size=WAKE_CELL):
+        self.world_width = world_width
+        self.world_height = world_height
+        self.cell_size = cell_size
+        self.cells = {}  # (col, row) -> {entity: (left, top, right, bottom)}
+        self.entity_cells = {}  # entity -> cells it is registered in
+
+    def __len__(self):
+        return len(self.entity_cells)
+
+    def add(self, entity, left, top, right, bottom):
+        size = self.cell_size
+        left, right = max(left, 0), min(right, self.world_width)
+        top, bottom = max(top, 0), min(bottom, self.world_height)
+        cells = [(col, row)
+                 for row in range(int(top // size), int(bottom // size) + 1)
+                 for col in range(int(left // size), int(right // size) + 1)]
+        rect = (left, top, right, bottom)
+        for cell in cells:
+            self.cells.setdefault(cell, {})[entity] = rect
+        self.entity_cells[entity] = cells
+
+    def remove(self, entity):
+        for cell in self.entity_cells.pop(entity, ()):
+            self.cells[cell].pop(entity, None)
+
+    def triggered(self, x, y):
+        """Entities whose wake rect contains (x, y)"""
+        entries = self.cells.get((int(x // self.cell_size), int(y // self.cell_size)))
+        if not entries:
+            return []
+        return [entity for entity, (left, top, right, bottom) in entries.items()
+                if left <= x <= right and top <= y <= bottom]
+
+
+class AiLod:
+    """Per-room tick counter, LOD tiers and sleep bookkeeping"""
+
+    def __init__(self, world_width=CAVE_WIDTH * TILE_SIZE, world_height=CAVE_HEIGHT * TILE_SIZE):
+        self.tick = 0
+        self.world_width = world_width
+        self.world_height = world_height
+        self.wake_grid = WakeGrid(world_width, world_height)
+        self.woken = 0
+        self.slept = 0
+
+    def begin_tick(self, player):
+        """Advance the tick and wake sleepers whose trigger the player stands in"""
+        self.tick += 1
+        for entity in self.wake_grid.triggered(player.x, player.y):
+            self.wake(entity)
+
+    def wake(self, entity):
+        self.wake_grid.remove(entity)
+        if entity.alive:
+            entity.sleeping = False
+            entity.lod_ticks = 0
+            self.woken += 1
+
+    def ticks(self, archetype, player):
+        """Per row, the ticks to simulate now: 0 while waiting for its tier or asleep"""
+        x = archetype.view("x")
+        y = archetype.view("y")
+        pending = archetype.view("lod_ticks")
+        awake = ~archetype.view("sleeping")
+        distance_sq = (player.x - x) ** 2 + (player.y - y) ** 2
+        period = np.where(distance_sq < LOD_NEAR ** 2, LOD_PERIODS[0],
+                          np.where(distance_sq < LOD_FAR ** 2, LOD_PERIODS[1], LOD_PERIODS[2]))
+        pending += awake
+        due = awake & (((self.tick + np.arange(archetype.count)) % period == 0) | (pending >= period))
+        dt = np.where(due, pending, 0)
+        pending[due] = 0
+        return dt
+
+    def sleep(self, archetype, idle, reach_x, reach_y):
+        """Put idle rows to sleep; each wakes when the player is within reach of it.
+
+        reach_x/reach_y: per-row half sizes of the wake rect around the entity
+        (scalars or arrays), widened by LOD_WAKE_MARGIN.
+        """
+        rows = np.flatnonzero(idle)
+        if not len(rows):
+            return
+        x = archetype.view("x")
+        y = archetype.view("y")
+        reach_x = np.broadcast_to(reach_x, x.shape) + LOD_WAKE_MARGIN
+        reach_y = np.broadcast_to(reach_y, y.shape) + LOD_WAKE_MARGIN
+        archetype.view("sleeping")[rows] = True
+        archetype.view("lod_ticks")[rows] = 0
+        for row in rows.tolist():
+            self.wake_grid.add(archetype.entities[row], x[row] - reach_x[row], y[row] - reach_y[row],
+                               x[row] + reach_x[row], y[row] + reach_y[row])
+        self.slept += len(rows)
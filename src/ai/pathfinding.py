@@ -0,0 +1,221 @@
+"""A* over a room's tile grid, spread across ticks under an expansion budget.
+
+Callers ask PathService.request(start, goal) for a path between two
+(col, row) cells and get a PathRequest back. Queued requests are expanded a
+fixed number of nodes per tick by update() and resume where they stopped,
+so a long search never lands on a single tick. Finished results are cached
+by (start, goal, map version); set_grid() bumps the version when the cave
+changes, which drops the cache and restarts in-flight searches.
+"""
+import heapq
+from collections import OrderedDict, deque
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import *
+
+PATH_BUDGET_NODES = 300  # A* node expansions per tick across all requests
+PATH_CACHE_SIZE = 128
+
+
+class PathRequest:
+    """One resumable A* search; path is a list of (col, row) cells once done"""
+
+    def __init__(self, start, goal, version):
+        self.start = start
+        self.goal = goal
+        self.version = version
+        self.done = False
+        self.path = None
+        self.expansions = 0
+        self.open = []
+        self.cost = {}
+        self.came_from = {}
+        self.closed = set()
+
+    @property
+    def found(self):
+        return self.path is not None
+
+    def restart(self, version, cols):
+        self.version = version
+        self.done = False
+        self.path = None
+        start = self.start[1] * cols + self.start[0]
+        self.open = [(self.heuristic(start, cols), 0, start)]
+        self.cost = {start: 0}
+        self.came_from = {start: None}
+        self.closed = set()
+
+    def heuristic(self, cell, cols):
+        return abs(cell % cols - self.goal[0]) + abs(cell // cols - self.goal[1])
+
+    def expand(self, open_cells, cols, budget):
+        """Run up to budget expansions (None for no limit); returns how many ran"""
+        goal = self.goal[1] * cols + self.goal[0]
+        if not open_cells[goal]:
+            self.finish(None, cols)
+            return 0
+        heap = self.open
+        cost = self.cost
+        came_from = self.came_from
+        closed = self.closed
+        offsets = (-cols, 1, cols, -1)
+        used = 0
+        while heap and (budget is None or used < budget):
+            _, _, cell = heapq.heappop(heap)
+            if cell in closed:
+                continue
+            closed.add(cell)
+            used += 1
+            if cell == goal:
+                self.finish(cell, cols)
+                break
+            next_cost = cost[cell] + 1
+            for offset in offsets:
+                neighbour = cell + offset
+                if open_cells[neighbour] and neighbour not in closed and next_cost < cost.get(neighbour, next_cost + 1):
+                    cost[neighbour] = next_cost
+                    came_from[neighbour] = cell
+                    h = self.heuristic(neighbour, cols)
+                    heapq.heappush(heap, (next_cost + h, h, neighbour))
+        else:
+            if not heap:
+                self.finish(None, cols)
+        self.expansions += used
+        return used
+
+    def finish(self, goal_cell, cols):
+        if goal_cell is not None:
+            path = []
+            cell = goal_cell
+            while cell is not None:
+                path.append((cell % cols, cell // cols))
+                cell = self.came_from[cell]
+            path.reverse()
+            self.path = path
+        self.done = True
+        # Search state is no longer needed once the result is cached
+        self.open = []
+        self.cost = {}
+        self.came_from = {}
+        self.closed = set()
+
+
+class PathService:
+    """Budgeted, cached A* requests for one room"""
+
+    def __init__(self, grid=None, budget=PATH_BUDGET_NODES, cache_size=PATH_CACHE_SIZE):
+        self.budget = budget
+        self.cache_size = cache_size
+        self.version = 0
+        self.cache = OrderedDict()  # (start, goal, version) -> finished PathRequest
+        self.pending = {}  # (start, goal, version) -> queued PathRequest
+        self.queue = deque()
+        self.expansions = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.completed = 0
+        self.failed = 0
+        self.grid = None
+        if grid is not None:
+            self.set_grid(grid)
+
+    def set_grid(self, grid):
+        """Use a new tile grid: cached paths are dropped and queued searches restart"""
+        self.grid = grid
+        self.rows, self.cols = grid.shape
+        self.open = (~grid).ravel().tolist()
+        self.version += 1
+        self.cache.clear()
+        self.pending = {}
+        for request in self.queue:
+            request.restart(self.version, self.cols)
+            self.pending[(request.start, request.goal, self.version)] = request
+
+    def inside(self, cell):
+        """Inside the solid border, so every neighbour index is on the grid"""
+        return 0 < cell[0] < self.cols - 1 and 0 < cell[1] < self.rows - 1
+
+    def request(self, start, goal):
+        """A PathRequest from start to goal cell; check .done before reading .path"""
+        key = (start, goal, self.version)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.move_to_end(key)
+            self.cache_hits += 1
+            return cached
+        queued = self.pending.get(key)
+        if queued is not None:
+            return queued
+        self.cache_misses += 1
+        request = PathRequest(start, goal, self.version)
+        if not (self.inside(start) and self.inside(goal)):
+            request.done = True
+            self.store(key, request)
+            return request
+        request.restart(self.version, self.cols)
+        self.pending[key] = request
+        self.queue.append(request)
+        return request
+
+    def find_path(self, start, goal):
+        """Search to completion now (level generation); returns the path or None"""
+        request = self.request(start, goal)
+        if not request.done:
+            self.queue.remove(request)
+            self.expansions += request.expand(self.open, self.cols, None)
+            self.complete(request)
+        return request.path
+
+    def update(self, budget=None):
+        """Spend this tick's expansion budget on queued requests, oldest first"""
+        remaining = self.budget if budget is None else budget
+        while self.queue and remaining > 0:
+            request = self.queue[0]
+            used = request.expand(self.open, self.cols, remaining)
+            remaining -= used
+            self.expansions += used
+            if not request.done:
+                break
+            self.queue.popleft()
+            self.complete(request)
+
+    def complete(self, request):
+        key = (request.start, request.goal, request.version)
+        self.pending.pop(key, None)
+        self.store(key, request)
+
+    def store(self, key, request):
+        if request.found:
+            self.completed += 1
+        else:
+            self.failed += 1
+        self.cache[key] = request
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def stats(self):
+        return {
+            'expansions': self.expansions,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'queued': len(self.queue),
+            'completed': self.completed,
+            'failed': self.failed
+        }
+
+
+def nearest_open_cell(grid, col, row, radius=3):
+    """Closest open cell to (col, row) within radius tiles, or None"""
+    rows, cols = grid.shape
+    best = None
+    best_distance = None
+    for y in range(max(0, row - radius), min(rows, row + radius + 1)):
+        for x in range(max(0, col - radius), min(cols, col + radius + 1)):
+            if grid[y, x]:
+                continue
+            distance = (x - col) ** 2 + (y - row) ** 2
+            if best_distance is None or distance < best_distance:
+                best, best_distance = (x, y), distance
+    return best
@@ -0,0 +1,77 @@
+"""Per-tick budget for AI decisions ("think" tasks).
+
+The batched systems keep integrating movement every tick, but decisions
+that do real work for one entity (a glitch teleport, a boss volley, a boss
+route replan) are submitted here instead of run inline. run() executes the
+pending tasks nearest-to-the-player first until the tick's budget is spent
+and leaves the rest for later ticks; every tick a task waits moves it up
+the queue, so distant entities are delayed but never starved.
+
+Budgets are charged with a fixed estimated cost per task kind rather than
+measured time, so which tasks run on which tick is the same on every
+machine and recordings replay exactly. Measured time is still reported.
+"""
+import time
+from collections import deque
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import *
+from core.log import get_logger
+
+log = get_logger("enemies")
+
+AI_TASK_COSTS_MS = {"teleport": 0.05, "fire": 0.05, "replan": 0.2}  # Estimated cost per kind
+AI_DEFAULT_TASK_COST_MS = 0.1
+AI_AGING_PX = 64  # Each tick waited counts as this much closer to the player
+
+
+class AiScheduler:
+    """Pending think tasks for one room, run nearest-first within AI_THINK_BUDGET_MS"""
+
+    def __init__(self, budget_ms=AI_THINK_BUDGET_MS, window=120):
+        self.budget_ms = budget_ms
+        self.tasks = {}  # (kind, entity) -> [distance, ticks waited, action]
+        self.ran = 0
+        self.deferred = deque(maxlen=window)  # Tasks left over at the end of each tick
+        self.last_ms = 0.0  # Measured time of the last run()
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def submit(self, kind, entity, distance, action):
+        """Queue action() for entity; resubmitting a pending task only updates its distance"""
+        task = self.tasks.get((kind, entity))
+        if task is None:
+            self.tasks[(kind, entity)] = [distance, 0, action]
+        else:
+            task[0] = distance
+
+    def run(self):
+        """Run tasks by priority until the budget is spent; at least one always runs"""
+        start = time.perf_counter()
+        order = sorted(self.tasks.items(), key=lambda item: item[1][0] - item[1][1] * AI_AGING_PX)
+        spent = 0.0
+        for key, task in order:
+            cost = AI_TASK_COSTS_MS.get(key[0], AI_DEFAULT_TASK_COST_MS)
+            if spent and spent + cost > self.budget_ms:
+                break
+            spent += cost
+            del self.tasks[key]
+            task[2]()
+            self.ran += 1
+        for task in self.tasks.values():
+            task[1] += 1
+        if self.tasks:
+            log.debug("Deferred %d AI tasks", len(self.tasks))
+        self.deferred.append(len(self.tasks))
+        self.last_ms = (time.perf_counter() - start) * 1000.0
+
+    def stats(self):
+        deferred = self.deferred
+        return {
+            'ran': self.ran,
+            'pending': len(self.tasks),
+            'deferred_avg': round(sum(deferred) / len(deferred), 2) if deferred else 0.0,
+            'deferred_max': max(deferred) if deferred else 0
+        }
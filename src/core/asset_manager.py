@@ -0,0 +1,111 @@
+import os
+import threading
+import pygame
+from core.log import get_logger
+from core.profiler import profiler
+
+# Project root is three levels up from src/core/asset_manager.py
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Checker size of the placeholder drawn for missing images
+PLACEHOLDER_TILE = 16
+
+log = get_logger("assets")
+
+
+class AssetManager:
+    """Resolves asset paths and hands out cached, display-converted images"""
+
+    def __init__(self, root=PROJECT_ROOT):
+        self.root = root
+        self.images = {}  # (name, size, alpha) -> Surface
+        self.pending = set()  # Cache keys loaded before the display existed
+        self.missing = set()  # Paths that already produced a warning
+        self.lock = threading.RLock()  # Loader threads share the cache
+
+    def path(self, *parts):
+        """Absolute path of a file under assets/"""
+        return os.path.join(self.root, "assets", *parts)
+
+    def image_path(self, *parts):
+        return self.path("images", *parts)
+
+    def audio_path(self, *parts):
+        return self.path("audio", *parts)
+
+    def load_image(self, name, size=None, alpha=True, placeholder=False):
+        """Load assets/images/<name>, converted and scaled once, then cached.
+
+        Returns None (or a placeholder Surface when placeholder=True) if the
+        file cannot be loaded, so callers can fall back to drawing shapes.
+        """
+        key = (name, size, alpha)
+        image = self.images.get(key)
+        if image is not None:
+            return image
+        with self.lock:
+            return self.load_image_locked(key, placeholder)
+
+    def load_image_locked(self, key, placeholder):
+        name, size, alpha = key
+        image = self.images.get(key)
+        if image is not None:
+            return image
+
+        path = self.image_path(*name.split("/"))
+        if path in self.missing:
+            return self.make_placeholder(size) if placeholder else None
+
+        with profiler.span("asset.load", file=name):
+            try:
+                image = pygame.image.load(path)
+            except (pygame.error, FileNotFoundError) as e:
+                self.warn_missing(path, e)
+                return self.make_placeholder(size) if placeholder else None
+
+            # Convert before scaling so the scaled copy is already in display format
+            image = self.convert(image, alpha)
+            if size and image.get_size() != size:
+                image = pygame.transform.scale(image, size)
+        if pygame.display.get_surface() is None:
+            self.pending.add(key)
+        self.images[key] = image
+        return image
+
+    def convert(self, surface, alpha=True):
+        """Convert a surface to the display pixel format if a display exists"""
+        if pygame.display.get_surface() is None:
+            return surface
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    def convert_all(self):
+        """Convert images that were cached before the display was created.
+
+        Call once right after pygame.display.set_mode().
+        """
+        with self.lock:
+            for key in list(self.pending):
+                self.images[key] = self.convert(self.images[key], key[2])
+            self.pending.clear()
+
+    def warn_missing(self, path, error):
+        """Print a single warning per missing asset"""
+        if path in self.missing:
+            return
+        self.missing.add(path)
+        log.warning("Could not load asset %s (%s), using fallback", os.path.relpath(path, self.root), error)
+
+    def make_placeholder(self, size=None):
+        """Magenta checkerboard surface that makes missing art obvious"""
+        width, height = size or (PLACEHOLDER_TILE, PLACEHOLDER_TILE)
+        surface = pygame.Surface((width, height))
+        surface.fill((255, 0, 255))
+        half = PLACEHOLDER_TILE // 2
+        for y in range(0, height, half):
+            for x in range((y // half) % 2 * half, width, PLACEHOLDER_TILE):
+                surface.fill((0, 0, 0), (x, y, half, half))
+        return surface
+
+
+# Global asset manager instance
+asset_manager = AssetManager()
@@ -0,0 +1,144 @@
+import os
+import json
+import pygame
+from core.asset_manager import asset_manager
+from core.log import get_logger
+from core.profiler import profiler
+
+# Bump when the sheet layout or table format changes to invalidate old caches
+ATLAS_VERSION = 1
+ATLAS_MAX_WIDTH = 1024
+ATLAS_PADDING = 1
+
+log = get_logger("assets")
+
+
+class AnimationSpec:
+    """Describes one animation strip that goes into an atlas"""
+
+    def __init__(self, name, folder, frame_count, size, anchor=(0, 0)):
+        self.name = name
+        self.folder = folder  # Relative to assets/images
+        self.frame_count = frame_count
+        self.size = size  # Scaled frame size in the sheet
+        self.anchor = anchor  # Offset from the entity position to the frame's top-left
+
+    def frame_files(self):
+        return [f"{self.folder}/sprite_{i:02d}.png" for i in range(self.frame_count)]
+
+
+class TextureAtlas:
+    """One sheet surface plus a frame table; frames are pre-built subsurfaces.
+
+    frames[name][i] is the subsurface for frame i of an animation and
+    table[name][i] holds its {'rect': [x, y, w, h], 'anchor': [ax, ay]} entry,
+    so lookups are plain list indexing with no per-frame allocation.
+    """
+
+    def __init__(self, sheet, table):
+        self.sheet = sheet
+        self.table = table
+        self.frames = {}
+        for name, entries in table.items():
+            self.frames[name] = [sheet.subsurface(pygame.Rect(entry['rect'])) for entry in entries]
+
+    def frame(self, name, index):
+        return self.frames[name][index]
+
+    def anchor(self, name, index):
+        return self.table[name][index]['anchor']
+
+
+def source_signature(specs):
+    """Layout parameters plus size/mtime of every source file"""
+    signature = {'version': ATLAS_VERSION, 'animations': []}
+    for spec in specs:
+        files = []
+        for name in spec.frame_files():
+            stat = os.stat(asset_manager.image_path(*name.split("/")))
+            files.append([name, stat.st_size, stat.st_mtime_ns])
+        signature['animations'].append({
+            'name': spec.name,
+            'size': list(spec.size),
+            'anchor': list(spec.anchor),
+            'files': files
+        })
+    return signature
+
+
+def pack_frames(specs, max_width=ATLAS_MAX_WIDTH, padding=ATLAS_PADDING):
+    """Shelf-pack every frame; returns (table, sheet_width, sheet_height)"""
+    # Place tallest frames first so each shelf wastes as little height as possible
+    order = sorted(specs, key=lambda spec: spec.size[1], reverse=True)
+    table = {spec.name: [] for spec in specs}
+    x = y = shelf_height = sheet_width = 0
+    for spec in order:
+        width, height = spec.size
+        for _ in range(spec.frame_count):
+            if x + width > max_width:
+                x = 0
+                y += shelf_height + padding
+                shelf_height = 0
+            table[spec.name].append({'rect': [x, y, width, height], 'anchor': list(spec.anchor)})
+            x += width + padding
+            shelf_height = max(shelf_height, height)
+            sheet_width = max(sheet_width, x)
+    return table, sheet_width, y + shelf_height
+
+
+def build_sheet(specs, table, width, height):
+    """Decode and scale every source frame into a new sheet surface"""
+    sheet = pygame.Surface((width, height), pygame.SRCALPHA)
+    for spec in specs:
+        for name, entry in zip(spec.frame_files(), table[spec.name]):
+            frame = pygame.image.load(asset_manager.image_path(*name.split("/")))
+            frame = pygame.transform.scale(frame, spec.size)
+            sheet.blit(frame, entry['rect'][:2])
+    return sheet
+
+
+def load_atlas(cache_name, specs):
+    """Load an atlas from assets/cache, rebuilding it when the sources change.
+
+    A warm start decodes a single PNG. Returns None if the sources are missing.
+    """
+    with profiler.span("atlas.load", atlas=cache_name):
+        return load_atlas_uncached(cache_name, specs)
+
+
+def load_atlas_uncached(cache_name, specs):
+    sheet_path = asset_manager.path("cache", f"{cache_name}.png")
+    table_path = asset_manager.path("cache", f"{cache_name}.json")
+
+    try:
+        signature = source_signature(specs)
+    except OSError as e:
+        asset_manager.warn_missing(asset_manager.image_path(specs[0].folder), e)
+        return None
+
+    # Warm start: one decode of the cached sheet
+    try:
+        with open(table_path) as f:
+            cached = json.load(f)
+        if cached['signature'] == signature:
+            sheet = asset_manager.convert(pygame.image.load(sheet_path))
+            return TextureAtlas(sheet, cached['frames'])
+    except (OSError, ValueError, KeyError, pygame.error):
+        pass
+
+    # Cold start: pack and build the sheet, then write the cache for next time
+    table, width, height = pack_frames(specs)
+    try:
+        sheet = build_sheet(specs, table, width, height)
+    except (pygame.error, FileNotFoundError) as e:
+        asset_manager.warn_missing(asset_manager.image_path(specs[0].folder), e)
+        return None
+    try:
+        os.makedirs(os.path.dirname(sheet_path), exist_ok=True)
+        pygame.image.save(sheet, sheet_path)
+        with open(table_path, "w") as f:
+            json.dump({'signature': signature, 'frames': table}, f)
+        log.info("Built texture atlas %s (%dx%d)", cache_name, width, height)
+    except (OSError, pygame.error) as e:
+        log.warning("Could not write atlas cache %s: %s", cache_name, e)
+    return TextureAtlas(asset_manager.convert(sheet), table)
@@ -0,0 +1,153 @@
+"""Measure how tick time scales with the number of objects in a room.
+
+Usage: python src/core/benchmark.py [--kinds enemies,bullets,...] [--counts 10,100,1000,10000]
+                                    [--ticks N] [--seed S] [--room-scale N] [--json PATH]
+
+For each kind and count a stress room (see generators.stress_room) holding
+only that many objects replaces the current room of a headless game, and
+the update and collision phases are timed over a run of ticks. The report
+lists avg ms per tick for every phase at each count plus the scaling
+exponent over the largest step (the two biggest counts), where fixed
+per-tick costs no longer dominate: about 1 is linear, noticeably above 1
+is worse than linear. --room-scale makes the rooms that many screens a
+side, so the camera scrolls and drawing culls.
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from config import *
+from core.input import InjectedInput
+from core.log import log_system
+from core.metrics import summarize
+from core.profiler import profiler
+from generators.stress_room import StressParameters, build_stress_room
+from main import Game
+
+STRESS_KINDS = ("enemies", "bosses", "rocks", "platforms", "crystals", "bullets")
+BENCHMARK_PHASES = ("player.update", "update.pickups", "update.enemies", "update.hazards",
+                    "collision.broadphase", "collision.dispatch", "check_doors")
+WARMUP_TICKS = 5
+SUPERLINEAR_EXPONENT = 1.3
+
+
+class CollectingSink:
+    """Profiler sink that keeps every frame's phase totals for one run"""
+
+    def __init__(self):
+        self.frame_times = []
+        self.phase_times = {}
+
+    def frame(self, profiler, totals, frame_ms, spans):
+        self.frame_times.append(frame_ms)
+        for name, ms in totals.items():
+            self.phase_times.setdefault(name, []).append(ms)
+
+    def close(self, spans):
+        pass
+
+    def averages(self):
+        result = {name: summarize(self.phase_times.get(name, []) or [0.0])['avg'] for name in BENCHMARK_PHASES}
+        result['tick'] = summarize(self.frame_times or [0.0])['avg']
+        return result
+
+
+def install_room(game, room):
+    """Swap room in as the current room and put a player that cannot die into it"""
+    game.rooms[game.current_room_id] = room
+    game.current_room = room
+    game.game_over = False
+    game.find_safe_spawn_point()
+    player = game.player
+    player.health = 10 ** 9
+    player.vel_x = player.vel_y = 0
+
+
+def run_scenario(game, kind, count, ticks, seed, room_scale=1):
+    """Average ms per tick of each phase with count objects of one kind"""
+    random.seed(seed)
+    size = (CAVE_WIDTH * room_scale, CAVE_HEIGHT * room_scale)
+    install_room(game, build_stress_room(StressParameters(**{kind: count}, size=size), seed))
+    game.step(WARMUP_TICKS)
+    sink = CollectingSink()
+    profiler.add_sink(sink)
+    try:
+        game.step(ticks)
+    finally:
+        profiler.close_sinks()
+    return sink.averages()
+
+
+def scaling_exponent(counts, times):
+    """Slope of log(time) against log(count) across the two largest counts"""
+    if len(counts) < 2 or times[-2] <= 0 or times[-1] <= 0:
+        return None
+    return math.log(times[-1] / times[-2]) / math.log(counts[-1] / counts[-2])
+
+
+def run_benchmark(kinds, counts, ticks, seed=0, room_scale=1):
+    """{kind: {count: {phase: avg ms}}} for every kind and count"""
+    game = Game(headless=True, input_source=InjectedInput(), seed=seed)
+    game.step()  # Finish loading
+    results = {}
+    for kind in kinds:
+        results[kind] = {}
+        for count in counts:
+            results[kind][count] = run_scenario(game, kind, count, ticks, seed, room_scale)
+    return results
+
+
+def format_report(results, counts):
+    lines = []
+    columns = BENCHMARK_PHASES + ("tick",)
+    for kind, by_count in results.items():
+        lines.append(f"\n{kind}")
+        lines.append(f"  {'phase':<22}" + "".join(f"{count:>10}" for count in counts) + f"{'exponent':>10}")
+        for name in columns:
+            times = [by_count[count][name] for count in counts]
+            exponent = scaling_exponent(counts, times)
+            flag = " !" if exponent is not None and exponent > SUPERLINEAR_EXPONENT else ""
+            exponent_text = f"{exponent:.2f}" if exponent is not None else "-"
+            lines.append(f"  {name:<22}" + "".join(f"{ms:>10.3f}" for ms in times) + f"{exponent_text:>10}{flag}")
+    lines.append(f"\nms per tick (avg); exponent ~1 is linear, '!' marks > {SUPERLINEAR_EXPONENT}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tick time against object counts")
+    parser.add_argument("--kinds", default=",".join(STRESS_KINDS),
+                        help=f"Comma-separated subset of {','.join(STRESS_KINDS)}")
+    parser.add_argument("--counts", default="10,100,1000,10000")
+    parser.add_argument("--ticks", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--room-scale", type=int, default=1, help="Stress room size in screens per side")
+    parser.add_argument("--json", metavar="PATH", help="Also write the results as JSON")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+
+    kinds = [kind for kind in args.kinds.split(",") if kind]
+    unknown = set(kinds) - set(STRESS_KINDS)
+    if unknown:
+        parser.error(f"unknown kinds: {', '.join(sorted(unknown))}")
+    counts = sorted(int(count) for count in args.counts.split(","))
+
+    log_system.setup(args.log_level, capacity=LOG_BUFFER_SIZE)
+    try:
+        results = run_benchmark(kinds, counts, args.ticks, args.seed, args.room_scale)
+    finally:
+        log_system.shutdown()
+    print(format_report(results, counts))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({'ticks': args.ticks, 'counts': counts, 'results': results}, f, indent=2)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import math
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import *
+
+
+class Camera:
+    """Viewport onto the world; x, y is the world position of the screen's top-left.
+
+    follow() scrolls only when the target leaves a dead zone around the
+    screen centre, and the view never leaves the world bounds (a world
+    smaller than the screen stays pinned at 0, 0). Drawing converts world
+    coordinates with to_screen/apply and skips anything sees() rejects.
+    The game moves it once per tick, so mouse-to-world conversion is part
+    of the deterministic simulation, and the position interpolator smooths
+    it between ticks like any other moving object.
+    """
+
+    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT,
+                 dead_zone_width=CAMERA_DEAD_ZONE_WIDTH, dead_zone_height=CAMERA_DEAD_ZONE_HEIGHT):
+        self.x = 0
+        self.y = 0
+        self.width = width
+        self.height = height
+        self.dead_zone_width = dead_zone_width
+        self.dead_zone_height = dead_zone_height
+        self.world_width = width
+        self.world_height = height
+
+    def set_world(self, width, height):
+        self.world_width = width
+        self.world_height = height
+        self.clamp()
+
+    def clamp(self):
+        self.x = max(0, min(self.x, self.world_width - self.width))
+        self.y = max(0, min(self.y, self.world_height - self.height))
+
+    def center_on(self, x, y, width=0, height=0):
+        """Jump straight to the target (room entry, respawn)"""
+        self.x = x + width / 2 - self.width / 2
+        self.y = y + height / 2 - self.height / 2
+        self.clamp()
+
+    def follow(self, x, y, width=0, height=0):
+        """Scroll just enough to keep the target's centre inside the dead zone"""
+        center_x = x + width / 2 - self.x
+        center_y = y + height / 2 - self.y
+        left = (self.width - self.dead_zone_width) / 2
+        top = (self.height - self.dead_zone_height) / 2
+        if center_x < left:
+            self.x += center_x - left
+        elif center_x > left + self.dead_zone_width:
+            self.x += center_x - left - self.dead_zone_width
+        if center_y < top:
+            self.y += center_y - top
+        elif center_y > top + self.dead_zone_height:
+            self.y += center_y - top - self.dead_zone_height
+        self.clamp()
+
+    def to_screen(self, x, y):
+        return x - int(self.x), y - int(self.y)
+
+    def to_world(self, x, y):
+        return x + int(self.x), y + int(self.y)
+
+    def apply(self, rect):
+        """A world rect moved into screen space"""
+        return rect.move(-int(self.x), -int(self.y))
+
+    def sees(self, x, y, width, height, margin=CAMERA_CULL_MARGIN):
+        """True where a world rect (plus margin) overlaps the view; works on arrays too"""
+        return ((x + width + margin > self.x) & (x - margin < self.x + self.width) &
+                (y + height + margin > self.y) & (y - margin < self.y + self.height))
+
+    def tile_range(self, cols, rows, tile_size=TILE_SIZE):
+        """Visible (first_col, first_row, end_col, end_row) of a tile grid, ends exclusive"""
+        first_col = max(int(self.x // tile_size), 0)
+        first_row = max(int(self.y // tile_size), 0)
+        end_col = min(math.ceil((self.x + self.width) / tile_size), cols)
+        end_row = min(math.ceil((self.y + self.height) / tile_size), rows)
+        return first_col, first_row, end_col, end_row
@@ -1,10 +1,12 @@
 # Game configuration constants
 SCREEN_WIDTH = 900
 SCREEN_HEIGHT = 700
-FPS = 60
+FPS = 60  # Render frame cap
 TILE_SIZE = 16
-CAVE_WIDTH = SCREEN_WIDTH // TILE_SIZE
+CAVE_WIDTH = SCREEN_WIDTH // TILE_SIZE  # Default room size in tiles (one screen)
 CAVE_HEIGHT = SCREEN_HEIGHT // TILE_SIZE
+LARGE_ROOM_INTERVAL = 4  # Every 4th room (ids 3, 7, ...) is large and scrolls
+LARGE_ROOM_SCALE = 2  # Screens per side of a large room
 
 # Colors
 BLACK = (0, 0, 0)
@@ -26,4 +28,29 @@ CAVE_ACCENT = (100, 80, 60)
 GRAVITY = 0.8
 JUMP_STRENGTH = -15
 MAX_FALL_SPEED = 12
-FRICTION = 0.85
\ No newline at end of file
+FRICTION = 0.85
+# Simulation timing
+SIM_HZ = 60  # Fixed simulation ticks per second; timers count these ticks
+SIM_DT = 1.0 / SIM_HZ
+MAX_CATCHUP_STEPS = 5  # Most ticks simulated in one rendered frame
+INTERPOLATION_SNAP_DISTANCE = 48  # Pixels moved in one tick that count as a teleport
+
+# Logging
+LOG_LEVEL = "INFO"  # Hot-path messages (combat, audio, AI) log at DEBUG
+LOG_BUFFER_SIZE = 1024  # Records held for the writer thread before the oldest drop
+
+# Bullets
+BULLET_POOL_SIZE = 8192  # Preallocated bullets per room; extra spawns are dropped
+BULLET_RADIUS = 6
+
+# AI
+AI_THINK_BUDGET_MS = 0.5  # Estimated ms of AI decisions (teleports, volleys, replans) per tick
+
+# Teleport crystals
+TELEPORT_SEARCH_RADIUS = 6  # Tiles searched around a blocked target for room to land
+TELEPORT_LINE_OF_SIGHT = False  # Also require the landing spot to be visible from the player
+
+# Camera
+CAMERA_DEAD_ZONE_WIDTH = 160  # Box around the screen centre the player moves in without scrolling
+CAMERA_DEAD_ZONE_HEIGHT = 120
+CAMERA_CULL_MARGIN = 64  # Pixels past an object's hitbox its drawing may reach (sprites, health bars)
@@ -0,0 +1,91 @@
+"""Run the simulation without a window or audio as fast as possible.
+
+Usage: python src/core/headless.py [--ticks N] [--seed S] [--bot idle|random]
+                                   [--metrics PATH] [--trace PATH]
+"""
+import argparse
+import random
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from config import *
+from core.input import InjectedInput
+from core.log import log_system
+from core.metrics import attach_sinks
+from core.profiler import profiler
+from main import Game
+
+
+class RandomBot:
+    """Holds random movement keys, jumps and clicks toward random points.
+
+    Uses its own RNG so the bot does not perturb the game's random stream.
+    """
+
+    MOVE_KEYS = [(), (pygame.K_a,), (pygame.K_d,), (pygame.K_a, pygame.K_SPACE), (pygame.K_d, pygame.K_SPACE)]
+
+    def __init__(self, input_source, seed=0):
+        self.input = input_source
+        self.rng = random.Random(seed)
+        self.hold_ticks = 0
+
+    def tick(self, game):
+        if self.hold_ticks <= 0:
+            self.input.set_keys(self.rng.choice(self.MOVE_KEYS))
+            self.hold_ticks = self.rng.randint(10, 60)
+        self.hold_ticks -= 1
+
+        roll = self.rng.random()
+        target = (self.rng.randint(0, SCREEN_WIDTH), self.rng.randint(0, SCREEN_HEIGHT))
+        if roll < 0.05:
+            self.input.click(1, target)  # Attack
+        elif roll < 0.06:
+            self.input.click(3, target)  # Teleport
+        elif roll < 0.065:
+            self.input.tap(pygame.K_r)  # Advance room / restart
+
+
+def run_headless(ticks, seed=None, bot="random"):
+    """Step a headless game for a number of ticks; returns (game, seconds)"""
+    input_source = InjectedInput()
+    game = Game(headless=True, input_source=input_source, seed=seed)
+    driver = RandomBot(input_source, seed or 0) if bot == "random" else None
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        if driver:
+            driver.tick(game)
+        game.step()
+    return game, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Crystal Caverns headless")
+    parser.add_argument("--ticks", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--bot", choices=["idle", "random"], default="random")
+    parser.add_argument("--metrics", metavar="PATH", help="Write per-tick aggregates as JSONL")
+    parser.add_argument("--trace", metavar="PATH", help="Write a Chrome trace of every tick")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+
+    log_system.setup(args.log_level, capacity=LOG_BUFFER_SIZE)
+    attach_sinks(profiler, args.metrics, args.trace)
+    try:
+        game, elapsed = run_headless(args.ticks, args.seed, args.bot)
+    finally:
+        profiler.close_sinks()
+        log_system.shutdown()
+    print(f"{args.ticks} ticks in {elapsed:.2f}s ({args.ticks / elapsed:.0f} ticks/s), "
+          f"room {game.current_room_id + 1}, score {game.score}, health {game.player.health}")
+    print("paths:", ", ".join(f"{name} {value}" for name, value in game.current_room.paths.stats().items()))
+    print("ai tasks:", ", ".join(f"{name} {value}" for name, value in game.current_room.ai.stats().items()))
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
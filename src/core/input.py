@@ -0,0 +1,81 @@
+import pygame
+
+
+class HardwareInput:
+    """Reads the real keyboard, mouse and event queue"""
+
+    finished = False  # Input sources that run out (replays) set this
+
+    def get_events(self):
+        return pygame.event.get()
+
+    def get_pressed(self):
+        return pygame.key.get_pressed()
+
+    def get_mouse_pos(self):
+        return pygame.mouse.get_pos()
+
+    def end_tick(self):
+        """Called by the game after every simulation tick"""
+
+
+class KeyState:
+    """Stand-in for pygame.key.get_pressed(): keys[pygame.K_a] -> bool"""
+
+    def __init__(self, pressed=()):
+        self.pressed = set(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+class InjectedInput:
+    """Input supplied by code (bots, soak tests, replays) instead of hardware.
+
+    Key state and mouse position persist until changed; queued events are
+    delivered once by the next get_events() call.
+    """
+
+    finished = False
+
+    def __init__(self):
+        self.keys = KeyState()
+        self.mouse_pos = (0, 0)
+        self.events = []
+
+    def press(self, key):
+        self.keys.pressed.add(key)
+
+    def release(self, key):
+        self.keys.pressed.discard(key)
+
+    def set_keys(self, keys):
+        self.keys.pressed = set(keys)
+
+    def set_mouse_pos(self, pos):
+        self.mouse_pos = tuple(pos)
+
+    def post(self, event_type, **attributes):
+        self.events.append(pygame.event.Event(event_type, attributes))
+
+    def click(self, button, pos):
+        """Queue a mouse click at a position (moves the mouse there)"""
+        self.set_mouse_pos(pos)
+        self.post(pygame.MOUSEBUTTONDOWN, button=button, pos=tuple(pos))
+
+    def tap(self, key):
+        """Queue a KEYDOWN event without changing the held key state"""
+        self.post(pygame.KEYDOWN, key=key)
+
+    def get_events(self):
+        events, self.events = self.events, []
+        return events
+
+    def get_pressed(self):
+        return self.keys
+
+    def get_mouse_pos(self):
+        return self.mouse_pos
+
+    def end_tick(self):
+        pass
@@ -0,0 +1,87 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from core.profiler import profiler
+
+
+class LoadTask:
+    """A named unit of loading work and the future that will hold its result"""
+
+    def __init__(self, name, label, future, required):
+        self.name = name
+        self.label = label  # Shown on the progress screen
+        self.future = future
+        self.required = required  # Gameplay waits for required tasks only
+
+    def done(self):
+        return self.future.done()
+
+
+class Preloader:
+    """Runs asset decoding and room generation on worker threads.
+
+    Tasks start in submission order, so submit whatever gameplay needs first
+    (the first room, player sprites) before the rest. The main loop polls
+    ready() while drawing a progress screen and keeps pumping events.
+    With workers=0 every task runs inline in submit(), which keeps headless
+    runs and replays deterministic.
+    """
+
+    def __init__(self, workers=2):
+        self.executor = None
+        if workers > 0:
+            self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="loader")
+        self.tasks = {}
+        self.order = []
+        self.lock = threading.Lock()
+
+    def submit(self, name, label, fn, *args, required=False):
+        if self.executor:
+            future = self.executor.submit(self.run_task, name, fn, args)
+        else:
+            future = Future()
+            try:
+                future.set_result(self.run_task(name, fn, args))
+            except Exception as e:
+                future.set_exception(e)
+        with self.lock:
+            self.tasks[name] = LoadTask(name, label, future, required)
+            self.order.append(name)
+        return future
+
+    def run_task(self, name, fn, args):
+        with profiler.span("load.task", task=name):
+            return fn(*args)
+
+    def ready(self):
+        """True once every required task has finished; re-raises task errors"""
+        for task in self.tasks.values():
+            if task.required:
+                if not task.done():
+                    return False
+                task.future.result()
+        return True
+
+    def progress(self):
+        """Fraction of all submitted tasks that have finished"""
+        if not self.tasks:
+            return 1.0
+        return sum(1 for task in self.tasks.values() if task.done()) / len(self.tasks)
+
+    def current_label(self):
+        """Label of the first task that is still running"""
+        for name in self.order:
+            task = self.tasks[name]
+            if not task.done():
+                return task.label
+        return "Done"
+
+    def result(self, name):
+        """Block until the named task finishes and return its result"""
+        return self.tasks[name].future.result()
+
+    def is_done(self, name):
+        return self.tasks[name].done()
+
+    def shutdown(self, wait=False):
+        if self.executor:
+            self.executor.shutdown(wait=wait, cancel_futures=not wait)
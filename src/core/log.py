@@ -0,0 +1,88 @@
+"""Non-blocking logging for the game thread.
+
+Modules log through get_logger("combat"), get_logger("audio"), ... using
+%-style arguments, so a record below the active level costs one level check
+and is never formatted. Records that pass go into a bounded ring buffer;
+a background thread formats and writes them. When the buffer is full the
+oldest records are dropped rather than stalling a frame.
+"""
+import logging
+import logging.handlers
+import sys
+import threading
+from collections import deque
+
+LOGGER_ROOT = "caverns"
+LOG_FORMAT = "%(relativeCreated)8.0f %(levelname)-7s %(name)s: %(message)s"
+
+
+def get_logger(category):
+    return logging.getLogger(f"{LOGGER_ROOT}.{category}")
+
+
+class RingBuffer:
+    """Queue with a fixed capacity that overwrites its oldest entry"""
+
+    def __init__(self, capacity):
+        self.records = deque(maxlen=capacity)
+        self.ready = threading.Condition()
+        self.dropped = 0
+
+    def put_nowait(self, record):
+        with self.ready:
+            if len(self.records) == self.records.maxlen:
+                self.dropped += 1
+            self.records.append(record)
+            self.ready.notify()
+
+    put = put_nowait
+
+    def get(self, block=True):
+        with self.ready:
+            while not self.records:
+                self.ready.wait()
+            return self.records.popleft()
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Enqueues records as-is so formatting happens on the writer thread"""
+
+    def prepare(self, record):
+        return record
+
+
+class LogSystem:
+    def __init__(self):
+        self.buffer = None
+        self.listener = None
+
+    def setup(self, level="INFO", categories=(), capacity=1024, stream=None):
+        """Route caverns.* loggers through the ring buffer.
+
+        categories: names logged at DEBUG regardless of the global level.
+        """
+        self.shutdown()
+        root = logging.getLogger(LOGGER_ROOT)
+        root.setLevel(level.upper() if isinstance(level, str) else level)
+        root.propagate = False
+        for category in categories:
+            get_logger(category).setLevel(logging.DEBUG)
+
+        writer = logging.StreamHandler(stream or sys.stderr)
+        writer.setFormatter(logging.Formatter(LOG_FORMAT))
+        self.buffer = RingBuffer(capacity)
+        self.listener = logging.handlers.QueueListener(self.buffer, writer)
+        root.handlers = [DeferredQueueHandler(self.buffer)]
+        self.listener.start()
+
+    def shutdown(self):
+        """Write out everything still buffered and stop the writer thread"""
+        if self.listener:
+            self.listener.stop()
+            if self.buffer.dropped:
+                sys.stderr.write(f"Log buffer overflowed; dropped {self.buffer.dropped} records\n")
+            self.listener = None
+
+
+# Global logging instance
+log_system = LogSystem()
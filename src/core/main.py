@@ -7,62 +7,143 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import *
-from entities.entities import Player
+from core.asset_manager import asset_manager
+from core.camera import Camera
+from core.input import HardwareInput
+from core.loader import Preloader
+from core.log import get_logger, log_system
+from core.profiler import profiler
+from core.timestep import FixedTimestep, PositionInterpolator
+from entities.entities import Key, Player
 from entities.room import Room
+from entities.systems import update_enemies, update_rocks
+from physics.collision import BodyGroup, CollisionWorld, PLAYER, ATTACK, ENEMY, BOSS, PICKUP, HAZARD, PROJECTILE
 from ui.audio import audio_manager
+from ui.profiler_overlay import ProfilerOverlay
+from ui.text import Hud, text_renderer
+
+log = get_logger("game")
+combat_log = get_logger("combat")
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False, input_source=None, seed=None):
+        # Headless runs use SDL's dummy drivers: no window, no sound device
+        self.headless = headless
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+        self.input = input_source or HardwareInput()
+        
+        # Seed the simulation RNG; recordings store the seed to replay a session
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        random.seed(self.seed)
+        
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Crystal Caverns - Glitch Adventure")
         self.clock = pygame.time.Clock()
         self.running = True
         
-        # Load background image
-        try:
-            import os
-            # Get path relative to project root
-            project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            bg_path = os.path.join(project_root, "assets", "images", "bg.png")
-            self.background = pygame.image.load(bg_path)
-            self.background = pygame.transform.scale(self.background, (SCREEN_WIDTH, SCREEN_HEIGHT))
-            print("Background image loaded successfully")
-        except:
-            print("Could not load bg.png, using default background")
-            self.background = None
-        
-        # Game objects
-        self.player = Player(0, 0)
+        # Images loaded from here on are converted to the display format
+        asset_manager.convert_all()
+        
+        # Decode assets and generate rooms in the background
+        self.player = None
+        self.current_room = None
         self.current_room_id = 0
         self.rooms = {}
         self.score = 0
         self.glitch_effects = []
         self.game_over = False
+        self.loading = True
+        self.hud = self.create_hud()
+        self.timestep = FixedTimestep()
+        self.interpolator = PositionInterpolator()
+        self.camera = Camera()
+        self.collisions = self.create_collision_world()
+        self.profiler_overlay = ProfilerOverlay(profiler)
+        self.start_loading()
         
-        # Generate rooms
-        room_count = 5 + random.randint(0, 3)
-        for i in range(room_count):
-            self.rooms[i] = Room(i)
+    def start_loading(self):
+        """Queue loading work; the first room and the player come first"""
+        # Headless runs load inline so they start deterministically
+        self.preloader = Preloader(workers=0 if self.headless else 2)
+        self.room_count = 5 + random.randint(0, 3)
+        self.preloader.submit("room_0", "Generating room 1", Room, 0, self.room_seed(0), required=True)
+        self.preloader.submit("player", "Loading player sprites", Player, 0, 0, required=True)
+        self.preloader.submit("background", "Loading background", asset_manager.load_image,
+                              "bg.png", (SCREEN_WIDTH, SCREEN_HEIGHT), False, required=True)
+        if not self.headless:
+            self.preloader.submit("audio", "Initializing audio", audio_manager.init)
+        for i in range(1, self.room_count):
+            self.preloader.submit(f"room_{i}", f"Generating room {i + 1}", Room, i, self.room_seed(i))
             
-        self.current_room = self.rooms[self.current_room_id]
+    def room_seed(self, room_id):
+        """Per-room seed so generation order across threads doesn't matter"""
+        return f"{self.seed}-{room_id}"
+        
+    def finish_loading(self):
+        """Start gameplay; rooms after the first keep generating in the background"""
+        self.loading = False
+        self.background = self.preloader.result("background")  # None falls back to black
+        self.player = self.preloader.result("player")
+        self.current_room = self.get_room(self.current_room_id)
         self.find_safe_spawn_point()
         self.player.glitch_energy = 100  # Start with full energy
+        self.timestep.reset()
+        
+    def get_room(self, room_id):
+        """Return a generated room, waiting for its loader task if needed"""
+        if room_id not in self.rooms:
+            self.rooms[room_id] = self.preloader.result(f"room_{room_id}")
+        return self.rooms[room_id]
+        
+    def handle_loading_events(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+                
+    def draw_loading(self):
+        """Progress screen shown while the preloader works"""
+        self.screen.fill(BLACK)
+        bar_width, bar_height = 400, 20
+        bar_x = SCREEN_WIDTH // 2 - bar_width // 2
+        bar_y = SCREEN_HEIGHT // 2
+        
+        title = text_renderer.render("Crystal Caverns", 36, GLITCH_PINK)
+        self.screen.blit(title, title.get_rect(center=(SCREEN_WIDTH // 2, bar_y - 60)))
+        
+        pygame.draw.rect(self.screen, (40, 40, 40), (bar_x, bar_y, bar_width, bar_height))
+        filled = int(self.preloader.progress() * bar_width)
+        pygame.draw.rect(self.screen, CRYSTAL_BLUE, (bar_x, bar_y, filled, bar_height))
+        pygame.draw.rect(self.screen, WHITE, (bar_x, bar_y, bar_width, bar_height), 2)
+        
+        label = text_renderer.render(self.preloader.current_label(), 36, WHITE)
+        self.screen.blit(label, label.get_rect(center=(SCREEN_WIDTH // 2, bar_y + 50)))
+        pygame.display.flip()
     
+    def restart(self):
+        """Start over with the same seed, so a recording still describes the rooms"""
+        self.preloader.shutdown()
+        self.__init__(self.headless, self.input, self.seed)
+        
     def handle_events(self):
-        for event in pygame.event.get():
+        for event in self.input.get_events():
             if event.type == pygame.QUIT:
                 self.running = False
             elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_r and not self.game_over:
+                if event.key == pygame.K_F3:
+                    profiler.toggle()
+                elif event.key == pygame.K_r and not self.game_over:
                     self.try_advance_room()
                 elif event.key == pygame.K_r and self.game_over:
-                    self.__init__()
+                    self.restart()
+                    return
             # Mouse controls
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if not self.player.inventory_open and not self.game_over:
                     # Get mouse position
-                    mouse_x, mouse_y = pygame.mouse.get_pos()
+                    mouse_x, mouse_y = self.camera.to_world(*self.input.get_mouse_pos())
                     player_center_x = self.player.x + self.player.width/2
                     player_center_y = self.player.y + self.player.height/2
                     
@@ -84,73 +165,54 @@ class Game:
                             self.player.use_teleport_crystal_directed(dx, dy)
     
     def update(self):
+        self.update_glitch_effects()
         if self.game_over:
             return
             
-        keys = pygame.key.get_pressed()
+        keys = self.input.get_pressed()
         
         # We now handle facing direction in the attack method
             
-        self.player.update(keys, self.current_room.get_all_walls())
+        with profiler.phase("player.update"):
+            self.player.update(keys, self.current_room.colliders)
+        self.camera.follow(self.player.x, self.player.y, self.player.width, self.player.height)
         
         # If inventory is open, pause game world updates
         if self.player.inventory_open:
             return
         
         # Update room objects
-        for crystal in self.current_room.crystals:
-            crystal.update()
-        for key in self.current_room.keys:
-            key.update()
-        for enemy in self.current_room.enemies:
-            enemy.update(self.current_room.walls, self.player)
-        for boss in self.current_room.bosses:
-            boss.update(self.current_room.walls, self.player)
-        for rock in self.current_room.falling_rocks:
-            rock.update(self.current_room.walls, self.player)
-        for platform in self.current_room.moving_platforms:
-            platform.update()
+        with profiler.phase("update.pickups"):
+            for crystal in self.current_room.crystals:
+                crystal.update()
+            for key in self.current_room.keys:
+                key.update()
+        with profiler.phase("update.enemies"):
+            update_enemies(self.current_room, self.player)
+        with profiler.phase("update.hazards"):
+            update_rocks(self.current_room.store.get("rock"), self.current_room.tile_grid, self.player,
+                         self.current_room.lod)
+            for platform in self.current_room.moving_platforms:
+                platform.update()
             
-        # Check collisions
-        self.check_crystal_collection()
-        self.check_key_collection()
-        self.check_door_unlocking()
-        self.check_door_interaction()
-        self.check_enemy_collisions()
-        self.check_falling_rock_collisions()
-        self.check_combat()
-        self.check_boss_combat()
-        self.check_projectile_collisions()
+        # Collisions: one broadphase, then typed contact handlers
+        self.update_facing()
+        with profiler.phase("collision.broadphase"):
+            self.build_colliders()
+            self.collisions.find_contacts()
+        with profiler.phase("collision.dispatch"):
+            self.collisions.dispatch()
+            self.check_bullet_hits()
+        with profiler.phase("check_doors"):
+            self.check_door_unlocking()
+            self.check_door_interaction()
                         
-    def check_crystal_collection(self):
-        player_rect = pygame.Rect(self.player.x, self.player.y, self.player.width, self.player.height)
-        for crystal in self.current_room.crystals:
-            if not crystal.collected:
-                crystal_rect = pygame.Rect(crystal.x - crystal.size, crystal.y - crystal.size, 
-                                         crystal.size * 2, crystal.size * 2)
-                if player_rect.colliderect(crystal_rect):
-                    crystal.collected = True
-                    self.score += 1
-                    if crystal.is_glitch:
-                        self.player.activate_glitch()
-                        self.add_glitch_effect()
-                    audio_manager.play_sound("crystal")
-                        
-    def check_key_collection(self):
-        player_rect = pygame.Rect(self.player.x, self.player.y, self.player.width, self.player.height)
-        for key in self.current_room.keys:
-            if not key.collected:
-                key_rect = pygame.Rect(key.x - key.size, key.y - key.size, key.size * 2, key.size * 2)
-                if player_rect.colliderect(key_rect):
-                    key.collected = True
-                    self.player.keys += 1
-                    
     def check_door_unlocking(self):
         for door in self.current_room.doors:
             if door.locked and self.player.keys >= door.keys_required:
-                door.locked = False
+                self.current_room.unlock_door(door)
                 self.player.keys -= door.keys_required
-                print(f"Door unlocked! Keys remaining: {self.player.keys}")
+                log.info("Door unlocked! Keys remaining: %d", self.player.keys)
                 
     def check_door_interaction(self):
         """Check if player is near an unlocked door"""
@@ -178,45 +240,35 @@ class Game:
                 break
                 
         if can_advance:
-            if self.current_room_id < len(self.rooms) - 1:
+            if self.current_room_id < self.room_count - 1:
                 self.current_room_id += 1
-                self.current_room = self.rooms[self.current_room_id]
+                self.current_room = self.get_room(self.current_room_id)
                 self.find_safe_spawn_point()
-                print(f"Advanced to Room {self.current_room_id + 1}!")
+                log.info("Advanced to Room %d!", self.current_room_id + 1)
             else:
-                print("You've reached the final room!")
+                log.info("You've reached the final room!")
         else:
             # Check if there are any unlocked doors at all
             unlocked_doors = [door for door in self.current_room.doors if not door.locked]
             if unlocked_doors:
-                print("Move closer to an unlocked door to advance!")
+                log.info("Move closer to an unlocked door to advance!")
             else:
-                print("Find a key to unlock the door first!")
+                log.info("Find a key to unlock the door first!")
                 
-    def check_enemy_collisions(self):
-        player_rect = pygame.Rect(self.player.x, self.player.y, self.player.width, self.player.height)
-        for enemy in self.current_room.enemies:
-            enemy_rect = pygame.Rect(enemy.x, enemy.y, enemy.width, enemy.height)
-            if player_rect.colliderect(enemy_rect):
-                if self.player.take_damage():
-                    audio_manager.play_sound("damage")
-                    if self.player.health <= 0:
-                        self.game_over = True
-                        
-    def check_falling_rock_collisions(self):
-        player_rect = pygame.Rect(self.player.x, self.player.y, self.player.width, self.player.height)
-        for rock in self.current_room.falling_rocks:
-            if rock.active and player_rect.colliderect(rock.get_rect()):
-                if self.player.take_damage():
-                    audio_manager.play_sound("damage")
-                    if self.player.health <= 0:
-                        self.game_over = True
-                        
-    def check_combat(self):
-        """Check for player attacks hitting enemies"""
-        # Update player facing direction based on mouse position when not attacking
+    def create_collision_world(self):
+        """Register contact handlers; dispatch runs them in this order"""
+        world = CollisionWorld()
+        world.on(PLAYER, PICKUP, self.on_pickup)
+        world.on(PLAYER, ENEMY, self.on_damage)
+        world.on(PLAYER, HAZARD, self.on_damage)
+        world.on(ATTACK, ENEMY, self.on_enemy_hit)
+        world.on(ATTACK, BOSS, self.on_boss_hit)
+        return world
+        
+    def update_facing(self):
+        """Face the mouse when not mid-attack"""
         if self.player.attack_timer <= 0:
-            mouse_x, mouse_y = pygame.mouse.get_pos()
+            mouse_x, mouse_y = self.camera.to_world(*self.input.get_mouse_pos())
             player_center_x = self.player.x + self.player.width/2
             
             # Set facing direction based on mouse
@@ -224,54 +276,105 @@ class Game:
                 self.player.facing_direction = 1  # Face right
             else:
                 self.player.facing_direction = -1  # Face left
-        
-        # Normal attack processing
-        attack_rect = self.player.get_attack_rect()
-        if attack_rect:
-            for enemy in self.current_room.enemies[:]:
-                enemy_rect = pygame.Rect(enemy.x, enemy.y, enemy.width, enemy.height)
-                if attack_rect.colliderect(enemy_rect):
-                    weapon_stats = self.player.get_weapon_stats()
-                    print(f"Hit enemy! Damage: {weapon_stats['damage']}, Enemy health: {enemy.health}")
-                    if enemy.take_damage(weapon_stats["damage"]):
-                        print("Enemy killed!")
-                        audio_manager.play_sound("beat")  # Enemy death sound
-                        self.drop_loot(enemy.x, enemy.y, "enemy")
-                        self.current_room.enemies.remove(enemy)
-                        self.score += 5  # Bonus points for killing enemies
-                        
-    def check_boss_combat(self):
-        """Check for player attacks hitting bosses"""
-        attack_rect = self.player.get_attack_rect()
+                
+    def build_colliders(self):
+        """Register this tick's colliders; attack rect and weapon stats are computed once.
+
+        Everything but the player and the attack goes in as column arrays,
+        so no per-entity work is done here.
+        """
+        world = self.collisions
+        room = self.current_room
+        player = self.player
+        world.begin()
+        add = world.add
+        add(player, player.x, player.y, player.width, player.height, PLAYER, player.collision_mask)
+        attack_rect = player.get_attack_rect()
         if attack_rect:
-            for boss in self.current_room.bosses[:]:
-                boss_rect = pygame.Rect(boss.x, boss.y, boss.width, boss.height)
-                if attack_rect.colliderect(boss_rect):
-                    weapon_stats = self.player.get_weapon_stats()
-                    print(f"Hit boss! Damage: {weapon_stats['damage']}, Boss health: {boss.health}")
-                    if boss.take_damage(weapon_stats["damage"]):
-                        print("Boss defeated!")
-                        audio_manager.play_sound("glitch")  # Special boss death sound
-                        self.drop_loot(boss.x, boss.y, "boss")
-                        self.current_room.bosses.remove(boss)
-                        self.score += 50  # Big bonus for boss kill
-                        
-    def check_projectile_collisions(self):
-        """Check boss projectiles hitting player"""
+            add(player, attack_rect.x, attack_rect.y, attack_rect.width, attack_rect.height,
+                ATTACK, data=player.get_weapon_stats())
+
+        world.add_group(room.pickup_bodies())
+        # Sleeping AI is out of reach of the player and the attack, so it is left out
+        for name, archetype in room.store.archetypes.items():
+            if not archetype.count:
+                continue
+            if name == "rock":
+                category, live, parent = HAZARD, archetype.view("active"), None
+            elif name == "boss":
+                category, live, parent = BOSS, ~archetype.view("sleeping"), room.bosses
+            else:
+                category, live, parent = ENEMY, ~archetype.view("sleeping"), room.enemies
+            world.add_group(BodyGroup(category, archetype.entities, archetype.view("x"), archetype.view("y"),
+                                      archetype.view("width"), archetype.view("height"), live, parent))
+                
+    def on_pickup(self, player, pickup):
+        item = pickup.owner
+        if item.collected:
+            return
+        item.collected = True
+        pickup.group.live[pickup.row] = False
+        if isinstance(item, Key):
+            self.player.keys += 1
+            return
+        self.score += 1
+        if item.is_glitch:
+            self.player.activate_glitch()
+            self.add_glitch_effect()
+        audio_manager.play_sound("crystal")
+        
+    def damage_player(self):
+        """Apply one hit to the player; False while invulnerable or shielded"""
+        if not self.player.take_damage():
+            return False
+        audio_manager.play_sound("damage")
+        if self.player.health <= 0:
+            self.game_over = True
+        return True
+        
+    def on_damage(self, player, source):
+        self.damage_player()
+        
+    def check_bullet_hits(self):
+        """Bullets are tested against the player in bulk instead of as colliders"""
+        if not self.player.collision_mask & PROJECTILE:
+            return
+        bullets = self.current_room.bullets
         player_rect = pygame.Rect(self.player.x, self.player.y, self.player.width, self.player.height)
-        for boss in self.current_room.bosses:
-            for projectile in boss.projectiles[:]:
-                if player_rect.colliderect(projectile.get_rect()):
-                    if self.player.take_damage():
-                        audio_manager.play_sound("damage")
-                        boss.projectiles.remove(projectile)
-                        if self.player.health <= 0:
-                            self.game_over = True
+        hit = bullets.first_hit(player_rect)
+        if hit >= 0 and self.damage_player():
+            bullets.remove(hit)
+            
+    def on_enemy_hit(self, attack, target):
+        enemy = target.owner
+        damage = attack.data["damage"]
+        combat_log.debug("Hit enemy! Damage: %s, Enemy health: %s", damage, enemy.health)
+        if enemy.take_damage(damage):
+            combat_log.debug("Enemy killed!")
+            audio_manager.play_sound("beat")  # Enemy death sound
+            self.drop_loot(enemy.x, enemy.y, "enemy")
+            target.parent.remove(enemy)
+            enemy.despawn()
+            self.score += 5  # Bonus points for killing enemies
+            
+    def on_boss_hit(self, attack, target):
+        boss = target.owner
+        damage = attack.data["damage"]
+        combat_log.debug("Hit boss! Damage: %s, Boss health: %s", damage, boss.health)
+        if boss.take_damage(damage):
+            combat_log.info("Boss defeated!")
+            audio_manager.play_sound("glitch")  # Special boss death sound
+            self.drop_loot(boss.x, boss.y, "boss")
+            target.parent.remove(boss)
+            self.current_room.bullets.clear_owner(boss.bullet_owner)
+            boss.despawn()
+            self.score += 50  # Big bonus for boss kill
                         
     def find_safe_spawn_point(self):
+        self.player.enter_room(self.current_room)
         open_spaces = []
-        for y in range(3, CAVE_HEIGHT - 3):
-            for x in range(3, CAVE_WIDTH - 3):
+        for y in range(3, self.current_room.rows - 3):
+            for x in range(3, self.current_room.cols - 3):
                 if not self.current_room.cave_map[y][x]:
                     clear = True
                     for dy in range(-1, 2):
@@ -296,7 +399,16 @@ class Game:
             self.current_room.rebuild_walls()
             self.player.x = 3 * TILE_SIZE + TILE_SIZE // 2
             self.player.y = 3 * TILE_SIZE + TILE_SIZE // 2
+        self.camera.set_world(*self.current_room.world_size())
+        self.camera.center_on(self.player.x, self.player.y, self.player.width, self.player.height)
                         
+    def update_glitch_effects(self):
+        """Count down screen shake effects once per simulation tick"""
+        for effect in self.glitch_effects[:]:
+            effect['timer'] -= 1
+            if effect['timer'] <= 0:
+                self.glitch_effects.remove(effect)
+                
     def add_glitch_effect(self):
         effect = {
             'timer': 30,
@@ -312,11 +424,11 @@ class Game:
             if random.randint(0, 1) == 0:
                 weapon = self.generate_weapon("rare")
                 self.player.add_item(weapon)
-                print(f"Boss dropped: {weapon['name']}!")
+                log.info("Boss dropped: %s!", weapon['name'])
             else:
                 armor = self.generate_armor("rare")
                 self.player.add_item(armor)
-                print(f"Boss dropped: {armor['name']}!")
+                log.info("Boss dropped: %s!", armor['name'])
         else:
             # Regular enemies have chance to drop items
             if random.randint(0, 4) == 0:  # 20% chance
@@ -324,15 +436,15 @@ class Game:
                 if loot_type == "weapon":
                     weapon = self.generate_weapon("common")
                     self.player.add_item(weapon)
-                    print(f"Found: {weapon['name']}!")
+                    log.info("Found: %s!", weapon['name'])
                 elif loot_type == "armor":
                     armor = self.generate_armor("common")
                     self.player.add_item(armor)
-                    print(f"Found: {armor['name']}!")
+                    log.info("Found: %s!", armor['name'])
                 else:
                     crystal = {'type': 'crystal', 'subtype': 'glitch', 'count': 1, 'name': 'Glitch Crystal'}
                     self.player.add_item(crystal)
-                    print("Found: Glitch Crystal!")
+                    log.info("Found: Glitch Crystal!")
                     
     def generate_weapon(self, rarity):
         """Generate random weapon based on rarity"""
@@ -371,13 +483,9 @@ class Game:
         
         # Apply glitch effects
         screen_offset_x, screen_offset_y = 0, 0
-        for effect in self.glitch_effects[:]:
-            effect['timer'] -= 1
-            if effect['timer'] <= 0:
-                self.glitch_effects.remove(effect)
-            else:
-                screen_offset_x += effect['offset_x'] // 3
-                screen_offset_y += effect['offset_y'] // 3
+        for effect in self.glitch_effects:
+            screen_offset_x += effect['offset_x'] // 3
+            screen_offset_y += effect['offset_y'] // 3
         
         # Create temporary surface for glitch effects
         temp_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
@@ -389,89 +497,169 @@ class Game:
             temp_surface.fill(BLACK)
         
         # Draw room walls on top of background
-        self.current_room.draw_walls(temp_surface)
-        
-        # Draw crystals
-        for crystal in self.current_room.crystals:
-            crystal.draw(temp_surface)
-            
-        # Draw room objects
-        self.current_room.draw_objects(temp_surface)
+        with profiler.phase("draw.walls"):
+            self.current_room.draw_walls(temp_surface, self.camera)
         
-        # Draw bosses
-        for boss in self.current_room.bosses:
-            boss.draw(temp_surface)
+        with profiler.phase("draw.entities"):
+            # Draw room objects (crystals, doors, enemies, bosses...) inside the view
+            self.current_room.draw_objects(temp_surface, self.camera)
+            self.current_room.bullets.draw(temp_surface, self.camera, self.timestep.alpha)
             
         # Draw player
-        self.player.draw(temp_surface)
+        with profiler.phase("draw.player"):
+            self.player.draw(temp_surface, self.camera)
         
         # Apply screen offset for glitch effect
         self.screen.blit(temp_surface, (screen_offset_x, screen_offset_y))
         
         # Draw inventory overlay (not affected by glitch effects)
-        self.player.draw_inventory(self.screen)
+        with profiler.phase("draw_ui"):
+            self.player.draw_inventory(self.screen)
+            
+            # Draw UI
+            self.draw_ui()
         
-        # Draw UI
-        self.draw_ui()
+        # Profiler overlay (F3)
+        self.profiler_overlay.draw(self.screen)
         
-        pygame.display.flip()
+        with profiler.phase("display.flip"):
+            pygame.display.flip()
         
-    def draw_ui(self):
-        font = pygame.font.Font(None, 36)
-        small_font = pygame.font.Font(None, 24)
+    def create_hud(self):
+        """Retained HUD labels; each re-renders only when its value changes"""
+        hud = Hud(text_renderer)
+        hud.add("score", 36, WHITE, "Crystals: {}")
+        hud.add("room", 36, WHITE, "Room: {}")
+        hud.add("health", 36, WHITE, "Health: {}")
+        hud.add("keys", 36, WHITE, "Keys: {}")
+        hud.add("help", 24, WHITE)
+        hud.add("glitch", 24, GLITCH_PINK, "Glitch Energy: {}/100 | Cave: {}")
+        return hud
         
+    def draw_ui(self):
         # Draw door interaction indicators
         if not self.game_over and not self.player.inventory_open:
             for door in self.current_room.doors:
                 if not door.locked and hasattr(door, 'can_use') and door.can_use:
                     # Draw "Press R" indicator near door
-                    indicator_text = small_font.render("Press R to Enter", True, GREEN)
-                    text_rect = indicator_text.get_rect(center=(door.rect.centerx, door.rect.centery - 30))
+                    indicator_text = text_renderer.render("Press R to Enter", 24, GREEN)
+                    door_x, door_y = self.camera.to_screen(door.rect.centerx, door.rect.centery)
+                    text_rect = indicator_text.get_rect(center=(door_x, door_y - 30))
                     self.screen.blit(indicator_text, text_rect)
         
         if self.game_over:
-            game_over_text = font.render("GAME OVER - Press R to Restart", True, RED)
+            game_over_text = text_renderer.render("GAME OVER - Press R to Restart", 36, RED)
             text_rect = game_over_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
             self.screen.blit(game_over_text, text_rect)
         else:
-            score_text = font.render(f"Crystals: {self.score}", True, WHITE)
-            room_text = font.render(f"Room: {self.current_room_id + 1}", True, WHITE)
-            health_text = font.render(f"Health: {self.player.health}", True, WHITE)
-            keys_text = font.render(f"Keys: {self.player.keys}", True, WHITE)
             cave_type = ["Cellular", "Perlin", "Maze", "Cavern", "Mixed"][self.current_room_id % 5]
             glitch_energy = int(self.player.glitch_energy)
             if self.player.inventory_open:
-                help_text = small_font.render(f"INVENTORY OPEN - Game Paused", True, GLITCH_PINK)
+                help_text, help_color = "INVENTORY OPEN - Game Paused", GLITCH_PINK
             else:
                 # Check door status for help text
                 near_door = any(hasattr(door, 'can_use') and door.can_use for door in self.current_room.doors if not door.locked)
                 if near_door:
-                    help_text = small_font.render(f"R: Enter Door | AD: Move | W/SPACE: Jump | Q: Phase | LEFT CLICK: Attack in any direction | RIGHT CLICK: Teleport to cursor | I: Inventory", True, GREEN)
+                    help_text, help_color = "R: Enter Door | AD: Move | W/SPACE: Jump | Q: Phase | LEFT CLICK: Attack in any direction | RIGHT CLICK: Teleport to cursor | I: Inventory", GREEN
                 else:
                     unlocked_doors = any(not door.locked for door in self.current_room.doors)
                     if unlocked_doors:
-                        help_text = small_font.render(f"Move near unlocked door, then R: Enter | Keys: {self.player.keys}", True, YELLOW)
+                        help_text, help_color = f"Move near unlocked door, then R: Enter | Keys: {self.player.keys}", YELLOW
                     else:
-                        help_text = small_font.render(f"Find key to unlock door | Keys: {self.player.keys} | Need: {self.current_room.doors[0].keys_required if self.current_room.doors else 0}", True, RED)
-            glitch_text = small_font.render(f"Glitch Energy: {glitch_energy}/100 | Cave: {cave_type}", True, GLITCH_PINK)
+                        help_text, help_color = f"Find key to unlock door | Keys: {self.player.keys} | Need: {self.current_room.doors[0].keys_required if self.current_room.doors else 0}", RED
             
-            self.screen.blit(score_text, (10, 10))
-            self.screen.blit(room_text, (10, 50))
-            self.screen.blit(health_text, (10, 90))
-            self.screen.blit(keys_text, (10, 130))
-            self.screen.blit(help_text, (10, SCREEN_HEIGHT - 50))
-            self.screen.blit(glitch_text, (10, SCREEN_HEIGHT - 30))
+            self.hud.draw(self.screen, "score", self.score, (10, 10))
+            self.hud.draw(self.screen, "room", self.current_room_id + 1, (10, 50))
+            self.hud.draw(self.screen, "health", self.player.health, (10, 90))
+            self.hud.draw(self.screen, "keys", self.player.keys, (10, 130))
+            self.hud.draw(self.screen, "help", help_text, (10, SCREEN_HEIGHT - 50), help_color)
+            self.hud.draw(self.screen, "glitch", (glitch_energy, cave_type), (10, SCREEN_HEIGHT - 30))
     
-    def run(self):
-        while self.running:
-            self.handle_events()
+    def interpolated_objects(self):
+        """Everything that moves and is drawn between simulation ticks"""
+        room = self.current_room
+        objects = [self.player, self.camera]
+        objects.extend(room.enemies)
+        objects.extend(room.falling_rocks)
+        objects.extend(room.moving_platforms)
+        objects.extend(room.bosses)
+        return objects
+        
+    def run_frame(self, frame_time):
+        """Simulate fixed ticks for the elapsed time, then draw once"""
+        profiler.begin_frame()
+        self.handle_events()
+        if self.loading:  # Restarted from the game over screen
+            self.input.end_tick()
+            return
+        for _ in range(self.timestep.advance(frame_time)):
+            if self.input.finished:
+                break
+            self.interpolator.capture(self.interpolated_objects())
+            self.current_room.bullets.capture()
             self.update()
-            self.draw()
+            self.input.end_tick()
+        self.interpolator.apply(self.timestep.alpha)
+        self.draw()
+        self.interpolator.restore()
+        profiler.end_frame()
+        
+    def step(self, ticks=1):
+        """Advance the simulation without drawing (headless runs and replays)"""
+        for _ in range(ticks):
+            if self.loading:
+                self.finish_loading()
+            profiler.begin_frame()
+            self.handle_events()
+            if not self.loading:  # Not restarted by this tick's events
+                self.update()
+            self.input.end_tick()
+            profiler.end_frame()
+            
+    def run_loop(self):
+        """Main loop; returns when the window closes or the input runs out"""
+        while self.running and not self.input.finished:
+            if self.loading:
+                self.handle_loading_events()
+                if self.preloader.ready():
+                    self.finish_loading()
+                else:
+                    self.draw_loading()
+            else:
+                self.run_frame(self.clock.get_time() / 1000.0)
             self.clock.tick(FPS)
+        self.preloader.shutdown()
         
+    def run(self):
+        self.run_loop()
         pygame.quit()
         sys.exit()
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
\ No newline at end of file
+    import argparse
+    from core.metrics import attach_sinks
+    from core.replay import InputRecorder
+    
+    parser = argparse.ArgumentParser(description="Crystal Caverns - Glitch Adventure")
+    parser.add_argument("--record", metavar="PATH", help="Record input and seed for replay.py")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--metrics", metavar="PATH", help="Write periodic frame-time aggregates as JSONL")
+    parser.add_argument("--trace", metavar="PATH", help="Write a Chrome trace (chrome://tracing, Perfetto)")
+    parser.add_argument("--log-level", default=LOG_LEVEL)
+    parser.add_argument("--debug", metavar="CATEGORY", action="append", default=[],
+                        help="Log a category (combat, audio, player, enemies, rooms, assets, game) at DEBUG")
+    args = parser.parse_args()
+    
+    log_system.setup(args.log_level, args.debug, LOG_BUFFER_SIZE)
+    attach_sinks(profiler, args.metrics, args.trace)
+    recorder = InputRecorder(HardwareInput(), args.record) if args.record else None
+    game = Game(input_source=recorder, seed=args.seed)
+    if recorder:
+        recorder.seed = game.seed
+    try:
+        game.run()
+    finally:
+        if recorder:
+            recorder.save(game)
+        profiler.close_sinks()
+        log_system.shutdown()
\ No newline at end of file
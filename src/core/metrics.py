@@ -0,0 +1,186 @@
+"""Export profiler data from real sessions.
+
+JsonlAggregateSink  - one JSON line of per-phase min/avg/p95/max every N frames
+ChromeTraceSink     - every span as Chrome trace events (chrome://tracing, Perfetto)
+
+The game thread only appends to a queue; formatting and file writes happen
+on a background writer thread.
+"""
+import json
+import queue
+import threading
+import time
+
+METRICS_INTERVAL_FRAMES = 120
+WRITER_FLUSH_SECONDS = 1.0
+
+
+def summarize(samples):
+    """min/avg/p95/max of a list of millisecond samples"""
+    ordered = sorted(samples)
+    count = len(ordered)
+    if not count:
+        return None
+    return {
+        'min': round(ordered[0], 3),
+        'avg': round(sum(ordered) / count, 3),
+        'p95': round(ordered[min(count - 1, int(count * 0.95))], 3),
+        'max': round(ordered[-1], 3)
+    }
+
+
+class BackgroundWriter:
+    """Writes to a file from a daemon thread.
+
+    put() hands an item to the thread; format_item turns it into text there.
+    The file is flushed at most once per WRITER_FLUSH_SECONDS and on close().
+    """
+
+    def __init__(self, path, format_item, header="", footer=""):
+        self.path = path
+        self.format_item = format_item
+        self.footer = footer
+        self.queue = queue.Queue()
+        self.file = open(path, "w")
+        self.file.write(header)
+        self.thread = threading.Thread(target=self.run, name=f"writer:{path}", daemon=True)
+        self.thread.start()
+
+    def put(self, item):
+        self.queue.put(item)
+
+    def run(self):
+        last_flush = time.monotonic()
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            text = self.format_item(item)
+            if text:
+                self.file.write(text)
+            if time.monotonic() - last_flush > WRITER_FLUSH_SECONDS:
+                self.file.flush()
+                last_flush = time.monotonic()
+        self.file.write(self.footer)
+        self.file.close()
+
+    def close(self):
+        """Drain the queue, write the footer and wait for the file to close"""
+        self.queue.put(None)
+        self.thread.join()
+
+
+class JsonlAggregateSink:
+    """Writes periodic aggregates: frame time, per-phase stats and load spans"""
+
+    def __init__(self, path, interval_frames=METRICS_INTERVAL_FRAMES):
+        self.interval = interval_frames
+        self.frame_times = []
+        self.phase_times = {}  # name -> [ms per frame]
+        self.loads = {}  # span name -> [count, total ms]
+        self.writer = BackgroundWriter(path, self.format_record)
+
+    def frame(self, profiler, totals, frame_ms, spans):
+        self.frame_times.append(frame_ms)
+        for name, ms in totals.items():
+            self.phase_times.setdefault(name, []).append(ms)
+        self.count_loads(spans)
+        if len(self.frame_times) >= self.interval:
+            self.emit(profiler.frame_index)
+
+    def count_loads(self, spans):
+        for name, category, start, end, thread, args in spans:
+            if category != "frame":
+                entry = self.loads.setdefault(name, [0, 0.0])
+                entry[0] += 1
+                entry[1] += (end - start) * 1000.0
+
+    def emit(self, frame_index):
+        """Hand the raw interval to the writer thread and start a new one"""
+        self.writer.put((frame_index, time.time(), self.frame_times, self.phase_times, self.loads))
+        self.frame_times = []
+        self.phase_times = {}
+        self.loads = {}
+
+    def format_record(self, item):
+        frame_index, timestamp, frame_times, phase_times, loads = item
+        record = {
+            'frame': frame_index,
+            'time': round(timestamp, 3),
+            'frames': len(frame_times),
+            'frame_ms': summarize(frame_times),
+            'phases': {name: summarize(samples) for name, samples in phase_times.items()},
+            'loads': {name: {'count': count, 'total_ms': round(total, 3)}
+                      for name, (count, total) in loads.items()}
+        }
+        return json.dumps(record, separators=(",", ":")) + "\n"
+
+    def close(self, spans=()):
+        self.count_loads(spans)
+        if self.frame_times or self.loads:
+            self.emit(-1)
+        self.writer.close()
+
+
+class ChromeTraceSink:
+    """Records spans as complete ("X") trace events in a JSON array.
+
+    Timestamps are microseconds since the profiler was created; each thread
+    gets a name so loader work shows on its own track.
+    """
+
+    def __init__(self, path, origin):
+        self.origin = origin
+        self.thread_names = {}
+        self.first = True
+        self.writer = BackgroundWriter(path, self.format_spans, header="[\n", footer="\n]\n")
+
+    def frame(self, profiler, totals, frame_ms, spans):
+        if spans:
+            self.writer.put(spans)
+
+    def format_spans(self, spans):
+        events = []
+        for name, category, start, end, thread, args in spans:
+            if thread not in self.thread_names:
+                self.thread_names[thread] = self.thread_name(thread)
+                events.append({'name': "thread_name", 'ph': "M", 'pid': 1, 'tid': thread,
+                               'args': {'name': self.thread_names[thread]}})
+            event = {
+                'name': name,
+                'cat': category,
+                'ph': "X",
+                'ts': round((start - self.origin) * 1e6, 1),
+                'dur': round((end - start) * 1e6, 1),
+                'pid': 1,
+                'tid': thread
+            }
+            if args:
+                event['args'] = args
+            events.append(event)
+        if not events:
+            return ""
+        text = ",\n".join(json.dumps(event, separators=(",", ":")) for event in events)
+        if self.first:
+            self.first = False
+            return text
+        return ",\n" + text
+
+    def thread_name(self, ident):
+        for thread in threading.enumerate():
+            if thread.ident == ident:
+                return thread.name
+        return f"thread-{ident}"
+
+    def close(self, spans=()):
+        if spans:
+            self.writer.put(list(spans))
+        self.writer.close()
+
+
+def attach_sinks(profiler, metrics_path=None, trace_path=None):
+    """Attach the sinks requested on the command line to a profiler"""
+    if metrics_path:
+        profiler.add_sink(JsonlAggregateSink(metrics_path))
+    if trace_path:
+        profiler.add_sink(ChromeTraceSink(trace_path, profiler.origin))
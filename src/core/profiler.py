@@ -0,0 +1,164 @@
+import threading
+import time
+from collections import deque
+
+
+class Phase:
+    """Timer for one named phase; reused every frame so timing never allocates"""
+
+    def __init__(self, name, profiler):
+        self.name = name
+        self.profiler = profiler
+        self.start = 0.0
+        self.total = 0.0  # Seconds spent in this phase during the current frame
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        self.total += end - self.start
+        if self.profiler.sinks:
+            self.profiler.spans.append((self.name, "frame", self.start, end, self.profiler.main_thread, None))
+        return False
+
+
+class Span:
+    """One-off timed span for work outside the frame (loading, room generation).
+
+    Safe to use from loader threads; only recorded when a sink is attached.
+    """
+
+    def __init__(self, profiler, name, category, args):
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.spans.append((self.name, self.category, self.start, time.perf_counter(),
+                                    threading.get_ident(), self.args))
+        return False
+
+
+class NullPhase:
+    """Shared no-op phase returned while profiling is disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_PHASE = NullPhase()
+
+
+class PhaseStats:
+    def __init__(self, samples):
+        ordered = sorted(samples)
+        count = len(ordered)
+        self.min = ordered[0] if count else 0.0
+        self.max = ordered[-1] if count else 0.0
+        self.avg = sum(ordered) / count if count else 0.0
+        self.p95 = ordered[min(count - 1, int(count * 0.95))] if count else 0.0
+
+
+class FrameProfiler:
+    """Per-phase frame timing with rolling min/avg/p95/max in milliseconds.
+
+    Wrap work in `with profiler.phase("name"):`. Phases hit several times in
+    a frame (once per simulation tick) are summed, and end_frame() pushes the
+    totals into fixed-size windows. Timing runs while the overlay is enabled
+    or a sink (see core.metrics) is attached; otherwise phase() returns a
+    shared no-op.
+    """
+
+    def __init__(self, window=120):
+        self.enabled = False  # Overlay toggle
+        self.active = False  # Timing on: overlay enabled or sinks attached
+        self.window = window
+        self.phases = {}  # name -> Phase
+        self.samples = {}  # name -> deque of ms per frame
+        self.frame_times = deque(maxlen=window)
+        self.frame_start = time.perf_counter()
+        self.frame_index = 0
+        self.origin = time.perf_counter()  # Trace timestamps are relative to this
+        self.main_thread = threading.get_ident()
+        self.sinks = []
+        self.spans = []  # (name, category, start, end, thread id, args) since last end_frame
+
+    def phase(self, name):
+        if not self.active:
+            return NULL_PHASE
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = Phase(name, self)
+            self.samples[name] = deque(maxlen=self.window)
+        return phase
+
+    def span(self, name, category="load", **args):
+        """Time work outside the frame loop; a no-op unless a sink is attached"""
+        if not self.sinks:
+            return NULL_PHASE
+        return Span(self, name, category, args or None)
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.active = self.enabled or bool(self.sinks)
+        self.frame_start = time.perf_counter()
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+        self.active = True
+
+    def close_sinks(self):
+        """Hand any remaining spans to the sinks and close them"""
+        spans = self.take_spans()
+        for sink in self.sinks:
+            sink.close(spans)
+        self.sinks = []
+        self.active = self.enabled
+
+    def take_spans(self):
+        spans, self.spans = self.spans, []
+        return spans
+
+    def begin_frame(self):
+        if self.active:
+            self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """Close the frame: record phase totals and the frame's work time"""
+        if not self.active:
+            return
+        end = time.perf_counter()
+        frame_ms = (end - self.frame_start) * 1000.0
+        self.frame_times.append(frame_ms)
+        totals = {}
+        for name, phase in self.phases.items():
+            totals[name] = phase.total * 1000.0
+            self.samples[name].append(totals[name])
+            phase.total = 0.0
+        if self.sinks:
+            self.spans.append(("frame", "frame", self.frame_start, end, self.main_thread, None))
+            spans = self.take_spans()
+            for sink in self.sinks:
+                sink.frame(self, totals, frame_ms, spans)
+        self.frame_index += 1
+
+    def stats(self, name):
+        return PhaseStats(self.samples[name])
+
+    def frame_stats(self):
+        return PhaseStats(self.frame_times)
+
+
+# Global profiler instance
+profiler = FrameProfiler()
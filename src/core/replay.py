@@ -0,0 +1,218 @@
+"""Record play sessions and replay them tick for tick.
+
+Record:  python src/core/main.py --record session.replay
+Replay:  python src/core/replay.py session.replay [--max-speed]
+"""
+import argparse
+import gzip
+import json
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from config import *
+from core.input import KeyState
+from core.log import log_system
+
+REPLAY_VERSION = 1
+
+# Every key the game polls through get_pressed()
+RECORDED_KEYS = [
+    pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
+    pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_SPACE,
+    pygame.K_q, pygame.K_e, pygame.K_i, pygame.K_c, pygame.K_x,
+    pygame.K_RETURN, pygame.K_1, pygame.K_2
+]
+
+
+def encode_event(event):
+    """Compact list form of the events the game reacts to, else None"""
+    if event.type == pygame.QUIT:
+        return ["quit"]
+    if event.type == pygame.KEYDOWN:
+        return ["key", event.key]
+    if event.type == pygame.MOUSEBUTTONDOWN:
+        return ["click", event.button, list(event.pos)]
+    return None
+
+
+def decode_event(data):
+    if data[0] == "quit":
+        return pygame.event.Event(pygame.QUIT, {})
+    if data[0] == "key":
+        return pygame.event.Event(pygame.KEYDOWN, {'key': data[1]})
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, {'button': data[1], 'pos': tuple(data[2])})
+
+
+def state_digest(game):
+    """Small summary of simulation state used to check a replay matches"""
+    if game.player is None:
+        return None
+    return {
+        'room': game.current_room_id,
+        'score': game.score,
+        'health': game.player.health,
+        'player': [round(game.player.x, 3), round(game.player.y, 3)],
+        'enemies': len(game.current_room.enemies)
+    }
+
+
+class InputRecorder:
+    """Wraps an input source and logs everything the game read from it.
+
+    Each tick stores only what changed: the held keys when they differ from
+    the previous tick, the mouse reads when the mouse moved, and the events
+    handled before the tick. With the game seed this reproduces the session.
+    """
+
+    finished = False
+
+    def __init__(self, source, path):
+        self.source = source
+        self.path = path
+        self.seed = None
+        self.tick = 0
+        self.frames = []  # [tick, {'k': keys, 'm': mouse reads, 'e': events}]
+        self.current = {}
+        self.mouse_reads = []
+        self.last_keys = []
+        self.last_mouse = [0, 0]
+
+    def get_events(self):
+        events = self.source.get_events()
+        for event in events:
+            data = encode_event(event)
+            if data:
+                self.current.setdefault('e', []).append(data)
+        return events
+
+    def get_pressed(self):
+        keys = self.source.get_pressed()
+        pressed = [key for key in RECORDED_KEYS if keys[key]]
+        if pressed != self.last_keys:
+            self.current['k'] = pressed
+            self.last_keys = pressed
+        return keys
+
+    def get_mouse_pos(self):
+        pos = self.source.get_mouse_pos()
+        self.mouse_reads.append(list(pos))
+        return pos
+
+    def end_tick(self):
+        if any(pos != self.last_mouse for pos in self.mouse_reads):
+            self.current['m'] = self.mouse_reads
+            self.last_mouse = self.mouse_reads[-1]
+        self.mouse_reads = []
+        if self.current:
+            self.frames.append([self.tick, self.current])
+            self.current = {}
+        self.tick += 1
+        self.source.end_tick()
+
+    def save(self, game=None):
+        recording = {
+            'version': REPLAY_VERSION,
+            'seed': self.seed,
+            'sim_hz': SIM_HZ,
+            'ticks': self.tick,
+            'frames': self.frames,
+            'final': state_digest(game) if game else None
+        }
+        with gzip.open(self.path, "wt") as f:
+            json.dump(recording, f, separators=(",", ":"))
+        print(f"Recorded {self.tick} ticks to {self.path}")
+
+
+class ReplayInput:
+    """Feeds a recording back to the game in the order it was read"""
+
+    def __init__(self, recording, allow_quit=False):
+        self.frames = {tick: data for tick, data in recording['frames']}
+        self.total_ticks = recording['ticks']
+        self.allow_quit = allow_quit  # Let a real window close a real-time replay
+        self.tick = 0
+        self.keys = KeyState()
+        self.mouse = (0, 0)
+        self.mouse_reads = None
+
+    @property
+    def finished(self):
+        return self.tick >= self.total_ticks
+
+    def get_events(self):
+        events = []
+        if self.allow_quit:
+            events = [event for event in pygame.event.get() if event.type == pygame.QUIT]
+        events.extend(decode_event(data) for data in self.frames.get(self.tick, {}).get('e', []))
+        return events
+
+    def get_pressed(self):
+        keys = self.frames.get(self.tick, {}).get('k')
+        if keys is not None:
+            self.keys.pressed = set(keys)
+        return self.keys
+
+    def get_mouse_pos(self):
+        if self.mouse_reads is None:
+            self.mouse_reads = list(self.frames.get(self.tick, {}).get('m', []))
+        if self.mouse_reads:
+            self.mouse = tuple(self.mouse_reads.pop(0))
+        return self.mouse
+
+    def end_tick(self):
+        self.tick += 1
+        self.mouse_reads = None
+
+
+def load_recording(path):
+    with gzip.open(path, "rt") as f:
+        recording = json.load(f)
+    if recording.get('version') != REPLAY_VERSION:
+        raise ValueError(f"Unsupported replay version {recording.get('version')}")
+    return recording
+
+
+def replay(path, max_speed=False):
+    """Replay a recording; returns (game, seconds, matched_final_state)"""
+    from main import Game
+
+    recording = load_recording(path)
+    replay_input = ReplayInput(recording, allow_quit=not max_speed)
+    game = Game(headless=max_speed, input_source=replay_input, seed=recording['seed'])
+
+    start = time.perf_counter()
+    if max_speed:
+        while not replay_input.finished and game.running:
+            game.step()
+    else:
+        game.run_loop()
+    elapsed = time.perf_counter() - start
+
+    final = recording.get('final')
+    matched = final is None or state_digest(game) == final
+    return game, elapsed, matched
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded session")
+    parser.add_argument("path")
+    parser.add_argument("--max-speed", action="store_true", help="Run headless as fast as possible")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+
+    log_system.setup(args.log_level, capacity=LOG_BUFFER_SIZE)
+
+    game, elapsed, matched = replay(args.path, args.max_speed)
+    ticks = game.input.tick
+    print(f"Replayed {ticks} ticks in {elapsed:.2f}s ({ticks / max(elapsed, 1e-9):.0f} ticks/s)")
+    print("Final state matches recording" if matched else f"Final state DIVERGED: {state_digest(game)}")
+    log_system.shutdown()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
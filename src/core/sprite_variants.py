@@ -0,0 +1,58 @@
+import pygame
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import *
+
+# Effect indices into a SpriteVariants table
+NORMAL = 0
+PHASED = 1  # Semi-transparent while phasing
+GLITCH = 2  # Green glitch tint
+FLASH = 3  # White damage / invulnerability flash
+ALL_EFFECTS = (NORMAL, PHASED, GLITCH, FLASH)
+
+
+def make_phased(surface):
+    variant = surface.copy()
+    variant.set_alpha(128)
+    return variant
+
+
+def make_glitch(surface):
+    variant = surface.copy()
+    variant.fill(GLITCH_GREEN, special_flags=pygame.BLEND_MULT)
+    return variant
+
+
+def make_flash(surface):
+    variant = surface.copy()
+    variant.fill((255, 255, 255, 128), special_flags=pygame.BLEND_RGBA_MULT)
+    return variant
+
+
+EFFECT_BUILDERS = {
+    NORMAL: lambda surface: surface,
+    PHASED: make_phased,
+    GLITCH: make_glitch,
+    FLASH: make_flash
+}
+
+
+class SpriteVariants:
+    """Flipped and effect-tinted copies of a frame list, built once at load.
+
+    table[effect][flipped][frame] is a ready-to-blit Surface, so drawing a
+    frame with any effect is a lookup and a blit with no per-frame copies.
+    """
+
+    def __init__(self, frames, effects=ALL_EFFECTS, flip=True):
+        self.table = [None] * len(ALL_EFFECTS)
+        facings = [list(frames)]
+        if flip:
+            facings.append([pygame.transform.flip(frame, True, False) for frame in frames])
+        for effect in effects:
+            build = EFFECT_BUILDERS[effect]
+            self.table[effect] = [[build(frame) for frame in facing] for facing in facings]
+
+    def get(self, frame, effect=NORMAL, flipped=False):
+        return self.table[effect][flipped][frame]
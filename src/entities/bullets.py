@@ -0,0 +1,161 @@
+import itertools
+import math
+import numpy as np
+import pygame
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import *
+from physics.tiles import rects_hit_tiles
+
+# Owner ids let a boss's bullets be cleared when it dies
+bullet_owner_ids = itertools.count(1)
+
+
+class BulletPool:
+    """Fixed-capacity bullet storage updated with whole-array operations.
+
+    Live bullets occupy rows 0..count-1. Every tick integrates all of them
+    at once, then compacts away those that left the screen or entered a
+    solid tile. Single removals (a bullet hitting the player) swap the last
+    row into the hole. Spawns beyond capacity are dropped and counted.
+    """
+
+    COLUMNS = ("x", "y", "vel_x", "vel_y", "prev_x", "prev_y")
+
+    def __init__(self, capacity=BULLET_POOL_SIZE, radius=BULLET_RADIUS):
+        self.capacity = capacity
+        self.radius = radius
+        self.count = 0
+        self.dropped = 0
+        for name in self.COLUMNS:
+            setattr(self, name, np.zeros(capacity))
+        self.owner = np.zeros(capacity, dtype=np.int64)
+        self.sprite = None
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, x, y, vel_x, vel_y, owner=0):
+        """Add bullets from scalars or equal-length arrays; returns how many fit"""
+        x, y, vel_x, vel_y = np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=float))
+                                                   for v in (x, y, vel_x, vel_y)))
+        start = self.count
+        room = min(len(x), self.capacity - start)
+        self.dropped += len(x) - room
+        end = start + room
+        self.x[start:end] = self.prev_x[start:end] = x[:room]
+        self.y[start:end] = self.prev_y[start:end] = y[:room]
+        self.vel_x[start:end] = vel_x[:room]
+        self.vel_y[start:end] = vel_y[:room]
+        self.owner[start:end] = owner
+        self.count = end
+        return room
+
+    def capture(self):
+        """Remember positions before a tick for render interpolation"""
+        n = self.count
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+
+    def update(self, grid=None, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+        """Integrate every bullet, then cull bullets outside the world or in a wall"""
+        n = self.count
+        if not n:
+            return
+        x = self.x[:n]
+        y = self.y[:n]
+        x += self.vel_x[:n]
+        y += self.vel_y[:n]
+        gone = (x < 0) | (x > width) | (y < 0) | (y > height)
+        if grid is not None:
+            gone |= rects_hit_tiles(grid, x, y, 1, 1)  # Bullet centre inside a solid tile
+        if gone.any():
+            self.keep(~gone)
+
+    def keep(self, mask):
+        """Compact live rows to those where mask is True, preserving order"""
+        n = self.count
+        kept = int(mask.sum())
+        for name in self.COLUMNS + ("owner",):
+            array = getattr(self, name)
+            array[:kept] = array[:n][mask]
+        self.count = kept
+
+    def remove(self, index):
+        last = self.count - 1
+        if index != last:
+            for name in self.COLUMNS + ("owner",):
+                array = getattr(self, name)
+                array[index] = array[last]
+        self.count = last
+
+    def clear_owner(self, owner):
+        if self.count:
+            self.keep(self.owner[:self.count] != owner)
+
+    def first_hit(self, rect):
+        """Lowest row whose bullet hitbox overlaps rect, or -1.
+
+        Rows are not in spawn order once remove() has swapped a bullet into
+        a hole. Hitboxes match pygame.Rect(x - r, y - r, 2r, 2r) for each bullet.
+        """
+        n = self.count
+        if not n:
+            return -1
+        size = self.radius * 2
+        left = np.trunc(self.x[:n] - self.radius)
+        top = np.trunc(self.y[:n] - self.radius)
+        overlap = ((left < rect.right) & (left + size > rect.left) &
+                   (top < rect.bottom) & (top + size > rect.top))
+        hits = np.flatnonzero(overlap)
+        return int(hits[0]) if len(hits) else -1
+
+    def make_sprite(self):
+        size = self.radius * 2
+        sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, YELLOW, (self.radius, self.radius), self.radius)
+        pygame.draw.circle(sprite, RED, (self.radius, self.radius), self.radius - 2)
+        return sprite.convert_alpha() if pygame.display.get_surface() else sprite
+
+    def draw(self, screen, camera, alpha=1.0):
+        """Blit one shared sprite per on-screen bullet at its interpolated position"""
+        n = self.count
+        if not n:
+            return
+        if self.sprite is None:
+            self.sprite = self.make_sprite()
+        x = self.prev_x[:n] + (self.x[:n] - self.prev_x[:n]) * alpha - self.radius
+        y = self.prev_y[:n] + (self.y[:n] - self.prev_y[:n]) * alpha - self.radius
+        size = self.radius * 2
+        visible = camera.sees(x, y, size, size, margin=0)
+        x, y = camera.to_screen(x[visible], y[visible])
+        sprite = self.sprite
+        screen.blits([(sprite, pos) for pos in zip(x.astype(int).tolist(), y.astype(int).tolist())],
+                     doreturn=False)
+
+
+# Emitter patterns: each spawns a whole volley with one array write
+
+def aimed(pool, x, y, target_x, target_y, speed, count=1, spread=0.0, owner=0):
+    """count bullets toward a target, fanned over spread radians"""
+    dx = target_x - x
+    dy = target_y - y
+    distance = math.sqrt(dx*dx + dy*dy)
+    if distance <= 0:
+        return 0
+    if count == 1:
+        return pool.spawn(x, y, dx / distance * speed, dy / distance * speed, owner)
+    return fan(pool, x, y, math.atan2(dy, dx), count, spread, speed, owner)
+
+
+def fan(pool, x, y, angle, count, arc, speed, owner=0):
+    """count bullets spread evenly across arc radians centred on angle"""
+    angles = angle + np.linspace(-arc / 2, arc / 2, count)
+    return pool.spawn(x, y, np.cos(angles) * speed, np.sin(angles) * speed, owner)
+
+
+def ring(pool, x, y, count, speed, phase=0.0, owner=0):
+    """count bullets evenly around a full circle"""
+    angles = phase + np.arange(count) * (2 * math.pi / count)
+    return pool.spawn(x, y, np.cos(angles) * speed, np.sin(angles) * speed, owner)
@@ -1,3 +1,4 @@
+import numpy as np
 import pygame
 import random
 import math
@@ -5,9 +6,26 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import *
+from core.asset_manager import asset_manager
+from core.atlas import AnimationSpec, load_atlas
+from ui.text import text_renderer
+from core.sprite_variants import SpriteVariants, NORMAL, PHASED, GLITCH, FLASH
+from core.log import get_logger
+from entities.bullets import bullet_owner_ids
+from entities.store import Column, StoredEntity, default_store
+from physics.collision import COLLISION_MASKS, PHASE_MASK, PLAYER, TERRAIN
+
+log = get_logger("player")
+enemy_log = get_logger("enemies")
+
+# Cosmetic randomness for drawing; keeps the simulation's random stream
+# independent of how many frames get rendered (needed for replays)
+fx_random = random.Random()
 
 class Player:
     # Class variables for shared sprite images
+    atlas = None
+    sprite_variants = {}
     stand_sprites = []
     move_sprites = []
     sprites_loaded = False
@@ -38,10 +56,16 @@ class Player:
         self.can_jump = True
         self.wall_jump_timer = 0
         self.against_wall = False
+        self.on_ceiling = False
         self.jump_count = 0
         self.max_jumps = 2  # Double jump
         self.phase_timer = 0
+        self.collision_mask = COLLISION_MASKS[PLAYER]  # Phasing clears PHASE_MASK until phase_timer runs out
         self.teleport_cooldown = 0
+        self.clearance = None  # Current room's clearance field and sight, for teleport landing
+        self.sight = None
+        self.world_width = SCREEN_WIDTH  # Current room's size in pixels
+        self.world_height = SCREEN_HEIGHT
         
         # Enhanced inventory system
         self.inventory_slots = [None] * 12  # 12 item slots
@@ -74,36 +98,27 @@ class Player:
         self.add_item({'type': 'crystal', 'subtype': 'teleport', 'count': 2, 'name': 'Teleport Crystal'})
             
     def load_sprites(self):
-        """Load all player sprite animations"""
-        try:
-            project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            
-            # Load stand up sprites
-            stand_path = os.path.join(project_root, "assets", "images", "Kalthira", "Stand_up")
-            for i in range(12):
-                sprite_file = f"sprite_{i:02d}.png"
-                sprite_path = os.path.join(stand_path, sprite_file)
-                sprite = pygame.image.load(sprite_path)
-                sprite = pygame.transform.scale(sprite, (120, 120))
-                Player.stand_sprites.append(sprite)
-            
-            # Load move sprites
-            move_path = os.path.join(project_root, "assets", "images", "Kalthira", "Move")
-            for i in range(12):
-                sprite_file = f"sprite_{i:02d}.png"
-                sprite_path = os.path.join(move_path, sprite_file)
-                sprite = pygame.image.load(sprite_path)
-                sprite = pygame.transform.scale(sprite, (self.width, self.height))
-                Player.move_sprites.append(sprite)
-            
-            Player.sprites_loaded = True
-            print(f"Loaded {len(Player.stand_sprites)} stand sprites and {len(Player.move_sprites)} move sprites")
-            
-        except Exception as e:
-            print(f"Failed to load player sprites: {e}")
+        """Load all player sprite animations from the Kalthira texture atlas"""
+        atlas = load_atlas("kalthira", [
+            AnimationSpec("stand", "Kalthira/Stand_up", 12, (120, 120), anchor=(50, 70)),
+            AnimationSpec("move", "Kalthira/Move", 12, (self.width, self.height), anchor=(50, 70))
+        ])
+        if atlas is None:
             Player.sprites_loaded = False
+            return
         
-    def update(self, keys, walls):
+        Player.atlas = atlas
+        Player.stand_sprites = atlas.frames["stand"]
+        Player.move_sprites = atlas.frames["move"]
+        Player.sprite_variants = {
+            "stand": SpriteVariants(Player.stand_sprites),
+            "move": SpriteVariants(Player.move_sprites)
+        }
+        Player.sprites_loaded = True
+        get_logger("assets").info("Loaded %d stand sprites and %d move sprites",
+                                  len(Player.stand_sprites), len(Player.move_sprites))
+        
+    def update(self, keys, colliders):
         # Inventory toggle (always available)
         if keys[pygame.K_i]:
             if not hasattr(self, '_i_pressed') or not self._i_pressed:
@@ -131,9 +146,9 @@ class Player:
             if not hasattr(self, '_q_pressed') or not self._q_pressed:
                 if self.count_crystals('phase') > 0:
                     self.use_phase_crystal()
-                    print(f"Phase crystal used! {self.count_crystals('phase')} remaining")
+                    log.info("Phase crystal used! %d remaining", self.count_crystals('phase'))
                 else:
-                    print("No phase crystals! Collect glitch crystals first.")
+                    log.info("No phase crystals! Collect glitch crystals first.")
                 self._q_pressed = True
         else:
             self._q_pressed = False
@@ -141,10 +156,10 @@ class Player:
         if keys[pygame.K_e]:
             if not hasattr(self, '_e_pressed') or not self._e_pressed:
                 if self.count_crystals('teleport') > 0:
-                    self.use_teleport_crystal()
-                    print(f"Teleport crystal used! {self.count_crystals('teleport')} remaining")
+                    if self.use_teleport_crystal():
+                        log.info("Teleport crystal used! %d remaining", self.count_crystals('teleport'))
                 else:
-                    print("No teleport crystals! Collect glitch crystals first.")
+                    log.info("No teleport crystals! Collect glitch crystals first.")
                 self._e_pressed = True
         else:
             self._e_pressed = False
@@ -236,53 +251,50 @@ class Player:
             self.vel_y += GRAVITY
             self.vel_y = min(self.vel_y, MAX_FALL_SPEED)
         
-        # Move horizontally
-        old_x = self.x
-        self.x += self.vel_x
-        
-        # Check horizontal collisions (skip if phasing)
-        player_rect = pygame.Rect(self.x, self.y, self.width, self.height)
+        # Get out of any platform that moved into us, without being pushed into rock
+        push_x, push_y = colliders.push_out(self.x, self.y, self.width, self.height, self.collision_mask)
+        if push_x:
+            self.x += colliders.sweep(self.x, self.y, self.width, self.height, push_x, 0,
+                                      self.collision_mask & TERRAIN).distance
+        if push_y:
+            self.y += colliders.sweep(self.x, self.y, self.width, self.height, 0, push_y,
+                                      self.collision_mask & TERRAIN).distance
+
+        # Move horizontally, stopping exactly at the first solid in the mask (phasing clears solids from it)
         self.against_wall = False
-        
-        if self.phase_timer <= 0:  # Normal collision
-            for wall in walls:
-                if player_rect.colliderect(wall):
-                    self.x = old_x
-                    self.against_wall = True
-                    
-                    # Wall sliding (slower fall when against wall)
-                    if not self.on_ground and self.vel_y > 0:
-                        self.vel_y *= 0.7
-                        self.jump_count = 1  # Reset double jump when wall sliding
-                        
-                    self.vel_x = 0
-                    break
-                
+        move = colliders.sweep(self.x, self.y, self.width, self.height, self.vel_x, 0, self.collision_mask)
+        self.x += move.distance
+        if move.hit:
+            self.against_wall = True
+
+            # Wall sliding (slower fall when against wall)
+            if not self.on_ground and self.vel_y > 0:
+                self.vel_y *= 0.7
+                self.jump_count = 1  # Reset double jump when wall sliding
+
+            self.vel_x = 0
+
         # Move vertically
-        old_y = self.y
-        self.y += self.vel_y
-        
-        # Check vertical collisions (skip if phasing)
-        player_rect = pygame.Rect(self.x, self.y, self.width, self.height)
         self.on_ground = False
-        
-        if self.phase_timer <= 0:  # Normal collision
-            for wall in walls:
-                if player_rect.colliderect(wall):
-                    if self.vel_y > 0:  # Falling down
-                        self.y = wall.top - self.height
-                        self.on_ground = True
-                        self.jump_count = 0  # Reset jumps when landing
-                    else:  # Moving up
-                        self.y = wall.bottom
-                    self.vel_y = 0
-                    break
-                
-        # Keep player on screen
-        self.x = max(0, min(SCREEN_WIDTH - self.width, self.x))
-        if self.y > SCREEN_HEIGHT:
+        self.on_ceiling = False
+        move = colliders.sweep(self.x, self.y, self.width, self.height, 0, self.vel_y, self.collision_mask)
+        self.y += move.distance
+        if move.hit:
+            if self.vel_y > 0:  # Landed
+                self.on_ground = True
+                self.jump_count = 0  # Reset jumps when landing
+            else:  # Bumped the ceiling
+                self.on_ceiling = True
+            self.vel_y = 0
+        elif self.vel_y >= 0:
+            # Standing still on a floor counts as grounded without falling into it first
+            self.on_ground = colliders.touching(self.x, self.y, self.width, self.height, 0, 1, self.collision_mask)
+
+        # Keep player inside the room
+        self.x = max(0, min(self.world_width - self.width, self.x))
+        if self.y > self.world_height:
             self.take_damage()  # Fall damage
-            self.y = SCREEN_HEIGHT - self.height
+            self.y = self.world_height - self.height
             self.vel_y = 0
             self.on_ground = True
         
@@ -295,6 +307,8 @@ class Player:
             self.wall_jump_timer -= 1
         if self.phase_timer > 0:
             self.phase_timer -= 1
+            if self.phase_timer == 0:
+                self.collision_mask |= COLLISION_MASKS[PLAYER] & PHASE_MASK
         if self.teleport_cooldown > 0:
             self.teleport_cooldown -= 1
         if self.attack_timer > 0:
@@ -403,40 +417,34 @@ class Player:
             # Advance to next frame
             self.current_frame = (self.current_frame + 1) % sprite_count
     
-    def draw(self, screen):
+    def draw(self, screen, camera):
+        x, y = camera.to_screen(self.x, self.y)
         # Draw sprite if loaded, otherwise fallback to colored rectangle
         if Player.sprites_loaded:
             # Choose sprite set based on movement
-            if self.is_moving:
-                current_sprite = Player.move_sprites[self.current_frame]
-            else:
-                current_sprite = Player.stand_sprites[self.current_frame]
-            
-            # Flip sprite if facing left
-            if not self.facing_right:
-                current_sprite = pygame.transform.flip(current_sprite, True, False)
-            
-            # Apply effects
-            sprite_to_draw = current_sprite
+            animation = "move" if self.is_moving else "stand"
             
+            # Pick the precomputed effect variant
+            effect = NORMAL
             if self.phase_timer > 0:
                 # Semi-transparent when phasing
-                sprite_to_draw = current_sprite.copy()
-                sprite_to_draw.set_alpha(128)
+                effect = PHASED
                 # Add phase effect border
-                pygame.draw.rect(screen, GLITCH_PINK, (self.x - 2, self.y - 2, self.width + 4, self.height + 4), 2)
+                pygame.draw.rect(screen, GLITCH_PINK, (x - 2, y - 2, self.width + 4, self.height + 4), 2)
             elif self.glitch_timer > 0:
                 # Glitch effect - randomly tint sprite
-                if random.randint(0, 3) == 0:
-                    sprite_to_draw = current_sprite.copy()
-                    sprite_to_draw.fill(GLITCH_GREEN, special_flags=pygame.BLEND_MULT)
+                if fx_random.randint(0, 3) == 0:
+                    effect = GLITCH
             elif self.invulnerable_timer > 0 and self.invulnerable_timer % 10 < 5:
                 # Flash white when invulnerable
-                sprite_to_draw = current_sprite.copy()
-                sprite_to_draw.fill((255, 255, 255, 128), special_flags=pygame.BLEND_RGBA_MULT)
+                effect = FLASH
+            
+            # Flipped variant when facing left
+            sprite_to_draw = Player.sprite_variants[animation].get(self.current_frame, effect, not self.facing_right)
             
-            # Draw the sprite
-            screen.blit(sprite_to_draw, (self.x-50, self.y-70))
+            # Draw the sprite at its atlas anchor
+            anchor_x, anchor_y = Player.atlas.anchor(animation, self.current_frame)
+            screen.blit(sprite_to_draw, (x - anchor_x, y - anchor_y))
             
         else:
             # Fallback to colored rectangle
@@ -447,7 +455,7 @@ class Player:
                 color = GLITCH_PINK
                 alpha = 128  # Semi-transparent when phasing
             elif self.glitch_timer > 0:
-                color = GLITCH_GREEN if random.randint(0, 3) == 0 else self.color
+                color = GLITCH_GREEN if fx_random.randint(0, 3) == 0 else self.color
             elif self.invulnerable_timer > 0 and self.invulnerable_timer % 10 < 5:
                 color = WHITE
             elif self.against_wall and not self.on_ground:
@@ -458,11 +466,11 @@ class Player:
                 temp_surface = pygame.Surface((self.width, self.height))
                 temp_surface.set_alpha(alpha)
                 temp_surface.fill(color)
-                screen.blit(temp_surface, (self.x, self.y))
+                screen.blit(temp_surface, (x, y))
                 # Add phase effect border
-                pygame.draw.rect(screen, GLITCH_PINK, (self.x - 2, self.y - 2, self.width + 4, self.height + 4), 2)
+                pygame.draw.rect(screen, GLITCH_PINK, (x - 2, y - 2, self.width + 4, self.height + 4), 2)
             else:
-                pygame.draw.rect(screen, color, (self.x, self.y, self.width, self.height))
+                pygame.draw.rect(screen, color, (x, y, self.width, self.height))
             
         # Draw attack effect when attacking
         if self.attack_timer > 15:  # Only during attack frames
@@ -470,13 +478,13 @@ class Player:
             attack_rect = self.get_attack_rect()
             if attack_rect:
                 # Draw attack effect rectangle
-                pygame.draw.rect(screen, attack_color, attack_rect, 2)
+                pygame.draw.rect(screen, attack_color, camera.apply(attack_rect), 2)
                 
                 # Draw direction indicator based on attack direction
                 if hasattr(self, 'attack_direction'):
                     dx, dy = self.attack_direction
-                    center_x = self.x + self.width/2
-                    center_y = self.y + self.height/2
+                    center_x = x + self.width/2
+                    center_y = y + self.height/2
                     
                     # Normalize for drawing
                     length = max(0.1, (dx**2 + dy**2)**0.5)
@@ -496,8 +504,8 @@ class Player:
         if self.phase_timer > 0:
             timer_width = 40
             timer_height = 3
-            timer_x = self.x - 8
-            timer_y = self.y - 18
+            timer_x = x - 8
+            timer_y = y - 18
             
             # Background
             pygame.draw.rect(screen, (30, 30, 30), (timer_x, timer_y, timer_width, timer_height))
@@ -508,7 +516,7 @@ class Player:
         # Draw jump indicator
         if self.jump_count > 0 and not self.on_ground:
             for i in range(self.jump_count):
-                pygame.draw.circle(screen, YELLOW, (int(self.x + 5 + i * 8), int(self.y - 5)), 3)
+                pygame.draw.circle(screen, YELLOW, (int(x + 5 + i * 8), int(y - 5)), 3)
                 
         # Draw crystal count indicators
         teleport_count = self.count_crystals('teleport')
@@ -517,23 +525,23 @@ class Player:
             # Teleport crystals (pink dots)
             if teleport_count > 0:
                 for i in range(min(teleport_count, 5)):
-                    pygame.draw.circle(screen, GLITCH_PINK, (int(self.x + 5 + i * 8), int(self.y - 8)), 3)
+                    pygame.draw.circle(screen, GLITCH_PINK, (int(x + 5 + i * 8), int(y - 8)), 3)
             
             # Phase crystals (blue dots)
             if phase_count > 0:
                 for i in range(min(phase_count, 5)):
-                    pygame.draw.circle(screen, BLUE, (int(self.x + 5 + i * 8), int(self.y - 18)), 3)
+                    pygame.draw.circle(screen, BLUE, (int(x + 5 + i * 8), int(y - 18)), 3)
                     
         # Power-up indicators
         if self.power_timer > 0:
             # Power crystal effect - red glow
-            pygame.draw.circle(screen, RED, (int(self.x + self.width + 15), int(self.y + 5)), 6)
-            pygame.draw.circle(screen, YELLOW, (int(self.x + self.width + 15), int(self.y + 5)), 3)
+            pygame.draw.circle(screen, RED, (int(x + self.width + 15), int(y + 5)), 6)
+            pygame.draw.circle(screen, YELLOW, (int(x + self.width + 15), int(y + 5)), 3)
             
         if self.shield_timer > 0:
             # Shield crystal effect - blue glow
-            pygame.draw.circle(screen, BLUE, (int(self.x + self.width + 15), int(self.y + 15)), 6)
-            pygame.draw.circle(screen, WHITE, (int(self.x + self.width + 15), int(self.y + 15)), 3)
+            pygame.draw.circle(screen, BLUE, (int(x + self.width + 15), int(y + 15)), 6)
+            pygame.draw.circle(screen, WHITE, (int(x + self.width + 15), int(y + 15)), 3)
         
     def activate_glitch(self):
         self.glitch_timer = 60
@@ -545,79 +553,91 @@ class Player:
         if random.randint(0, 1) == 0:
             teleport_crystal = {'type': 'crystal', 'subtype': 'teleport', 'count': 1, 'name': 'Teleport Crystal'}
             self.add_item(teleport_crystal)
-            print("Gained teleport crystal!")
+            log.debug("Gained teleport crystal!")
         else:
             phase_crystal = {'type': 'crystal', 'subtype': 'phase', 'count': 1, 'name': 'Phase Crystal'}
             self.add_item(phase_crystal)
-            print("Gained phase crystal!")
+            log.debug("Gained phase crystal!")
             
         # Glitch jump boost
         if not self.on_ground:
             self.vel_y = JUMP_STRENGTH * 0.7
             self.jump_count = 0  # Reset jumps
             
+    def enter_room(self, room):
+        """Land teleports using the new room's tile layout and keep to its bounds"""
+        self.clearance = room.clearance
+        self.sight = room.sight
+        self.world_width, self.world_height = room.world_size()
+
     def use_teleport_crystal(self):
         """Use teleport crystal from inventory"""
-        if self.consume_crystal('teleport') and self.teleport_cooldown <= 0:
-            from ui.audio import audio_manager
-            audio_manager.play_sound("teleport")
-            teleport_distance = 80
-            
-            # Determine direction based on velocity or default to right
-            if abs(self.vel_x) > 1:  # Moving horizontally
-                if self.vel_x > 0:  # Moving right
-                    target_x = self.x + teleport_distance
-                    target_y = self.y
-                else:  # Moving left
-                    target_x = self.x - teleport_distance
-                    target_y = self.y
-            elif abs(self.vel_y) > 1:  # Moving vertically
-                if self.vel_y > 0:  # Moving down
-                    target_x = self.x
-                    target_y = self.y + teleport_distance
-                else:  # Moving up
-                    target_x = self.x
-                    target_y = self.y - teleport_distance
-            else:  # Not moving, teleport right
+        teleport_distance = 80
+
+        # Determine direction based on velocity or default to right
+        if abs(self.vel_x) > 1:  # Moving horizontally
+            if self.vel_x > 0:  # Moving right
                 target_x = self.x + teleport_distance
                 target_y = self.y
-            
-            # Keep within bounds
-            target_x = max(self.width, min(SCREEN_WIDTH - self.width, target_x))
-            target_y = max(self.height, min(SCREEN_HEIGHT - self.height, target_y))
-            
-            # Teleport to target position
-            self.x = target_x
-            self.y = target_y
-            self.teleport_cooldown = 30
-            self.glitch_timer = 45
-            
+            else:  # Moving left
+                target_x = self.x - teleport_distance
+                target_y = self.y
+        elif abs(self.vel_y) > 1:  # Moving vertically
+            if self.vel_y > 0:  # Moving down
+                target_x = self.x
+                target_y = self.y + teleport_distance
+            else:  # Moving up
+                target_x = self.x
+                target_y = self.y - teleport_distance
+        else:  # Not moving, teleport right
+            target_x = self.x + teleport_distance
+            target_y = self.y
+        return self.teleport_to(target_x, target_y)
+
     def use_teleport_crystal_directed(self, dx, dy):
         """Use teleport crystal in a specific direction (for mouse control)"""
-        if self.consume_crystal('teleport') and self.teleport_cooldown <= 0:
-            from ui.audio import audio_manager
-            audio_manager.play_sound("teleport")
-            
-            # Calculate target position
-            target_x = self.x + dx
-            target_y = self.y + dy
-            
-            # Keep within bounds
-            target_x = max(self.width, min(SCREEN_WIDTH - self.width, target_x))
-            target_y = max(self.height, min(SCREEN_HEIGHT - self.height, target_y))
-            
-            # Teleport to target position
-            self.x = target_x
-            self.y = target_y
-            self.teleport_cooldown = 30
-            self.glitch_timer = 45
-                    
+        return self.teleport_to(self.x + dx, self.y + dy)
+
+    def teleport_to(self, target_x, target_y):
+        """Teleport to the nearest clear spot around the target.
+
+        The crystal is only spent if the room has somewhere to land.
+        """
+        if self.teleport_cooldown > 0 or self.count_crystals('teleport') <= 0:
+            return False
+
+        # Keep within bounds
+        target_x = max(self.width, min(self.world_width - self.width, target_x))
+        target_y = max(self.height, min(self.world_height - self.height, target_y))
+
+        # Snap out of rock to the nearest spot with room for the player
+        if self.clearance is not None:
+            sight = self.sight if TELEPORT_LINE_OF_SIGHT else None
+            origin = (self.x + self.width / 2, self.y + self.height / 2)
+            spot = self.clearance.resolve(target_x, target_y, self.width, self.height, sight=sight, origin=origin)
+            if spot is None:
+                log.info("Nowhere to teleport to there!")
+                return False
+            target_x, target_y = spot
+
+        self.consume_crystal('teleport')
+        from ui.audio import audio_manager
+        audio_manager.play_sound("teleport")
+
+        # Teleport to target position
+        self.x = target_x
+        self.y = target_y
+        self.teleport_cooldown = 30
+        self.glitch_timer = 45
+        return True
+
     def use_phase_crystal(self):
         """Use phase crystal from inventory"""
         if self.consume_crystal('phase'):
             from ui.audio import audio_manager
             audio_manager.play_sound("phase")
             self.phase_timer = 120  # 2 seconds
+            self.collision_mask &= ~PHASE_MASK
             self.glitch_timer = 30
             
     def craft_power_crystal(self):
@@ -628,11 +648,11 @@ class Player:
             self.consume_crystal('teleport')
             power_crystal = {'type': 'crystal', 'subtype': 'power', 'count': 1, 'name': 'Power Crystal'}
             self.add_item(power_crystal)
-            print("Crafted Power Crystal! (Double damage for 10 seconds)")
+            log.info("Crafted Power Crystal! (Double damage for 10 seconds)")
             from ui.audio import audio_manager
             audio_manager.play_sound("crystal")
         else:
-            print("Need: 2 Glitch + 1 Teleport crystals")
+            log.info("Need: 2 Glitch + 1 Teleport crystals")
             
     def craft_shield_crystal(self):
         """Craft shield crystal: 2 glitch + 1 phase = 1 shield"""
@@ -642,17 +662,17 @@ class Player:
             self.consume_crystal('phase')
             shield_crystal = {'type': 'crystal', 'subtype': 'shield', 'count': 1, 'name': 'Shield Crystal'}
             self.add_item(shield_crystal)
-            print("Crafted Shield Crystal! (Invulnerability for 5 seconds)")
+            log.info("Crafted Shield Crystal! (Invulnerability for 5 seconds)")
             from ui.audio import audio_manager
             audio_manager.play_sound("crystal")
         else:
-            print("Need: 2 Glitch + 1 Phase crystals")
+            log.info("Need: 2 Glitch + 1 Phase crystals")
             
     def use_power_crystal(self):
         """Use power crystal for double damage"""
         if self.consume_crystal('power'):
             self.power_timer = 600  # 10 seconds
-            print("Power Crystal activated! Double damage for 10 seconds!")
+            log.info("Power Crystal activated! Double damage for 10 seconds!")
             from ui.audio import audio_manager
             audio_manager.play_sound("glitch")
             
@@ -660,7 +680,7 @@ class Player:
         """Use shield crystal for invulnerability"""
         if self.consume_crystal('shield'):
             self.shield_timer = 300  # 5 seconds
-            print("Shield Crystal activated! Invulnerable for 5 seconds!")
+            log.info("Shield Crystal activated! Invulnerable for 5 seconds!")
             from ui.audio import audio_manager
             audio_manager.play_sound("glitch")
             
@@ -692,18 +712,14 @@ class Player:
         pygame.draw.rect(screen, GLITCH_PINK, (inv_x, inv_y, inv_width, inv_height), 3)
         
         # Title
-        font = pygame.font.Font(None, 32)
-        title = font.render("INVENTORY", True, WHITE)
+        title = text_renderer.render("INVENTORY", 32, WHITE)
         screen.blit(title, (inv_x + 20, inv_y + 10))
         
-        small_font = pygame.font.Font(None, 18)
-        
         # Equipment slots (left side)
         eq_x, eq_y = inv_x + 20, inv_y + 50
-        eq_font = pygame.font.Font(None, 20)
         
         # Equipment title
-        eq_title = eq_font.render("EQUIPMENT", True, YELLOW)
+        eq_title = text_renderer.render("EQUIPMENT", 20, YELLOW)
         screen.blit(eq_title, (eq_x, eq_y))
         
         # Draw equipment slots
@@ -729,11 +745,11 @@ class Player:
                 # Draw item (simplified as colored square)
                 pygame.draw.rect(screen, color, (slot_x + 5, slot_y + 5, slot_size - 10, slot_size - 10))
                 # Item name
-                name_text = small_font.render(item['name'][:8], True, WHITE)
+                name_text = text_renderer.render(item['name'][:8], 18, WHITE)
                 screen.blit(name_text, (slot_x + slot_size + 5, slot_y + 5))
             else:
                 # Empty slot label
-                label_text = small_font.render(label, True, (100, 100, 100))
+                label_text = text_renderer.render(label, 18, (100, 100, 100))
                 screen.blit(label_text, (slot_x + slot_size + 5, slot_y + 15))
         
         # Inventory grid (right side)
@@ -741,7 +757,7 @@ class Player:
         grid_y = inv_y + 50
         
         # Inventory title
-        inv_title = eq_font.render("ITEMS (12 slots)", True, WHITE)
+        inv_title = text_renderer.render("ITEMS (12 slots)", 20, WHITE)
         screen.blit(inv_title, (grid_x, grid_y))
         
         # Draw inventory grid (3x4)
@@ -775,7 +791,7 @@ class Player:
                     
                     # Count
                     if item['count'] > 1:
-                        count_text = small_font.render(str(item['count']), True, WHITE)
+                        count_text = text_renderer.render(str(item['count']), 18, WHITE)
                         screen.blit(count_text, (slot_x + slot_size - 15, slot_y + slot_size - 15))
                         
                 elif item['type'] in ['weapon', 'armor']:
@@ -790,30 +806,30 @@ class Player:
         ]
         
         for i, instruction in enumerate(instructions):
-            inst_text = small_font.render(instruction, True, WHITE)
+            inst_text = text_renderer.render(instruction, 18, WHITE)
             screen.blit(inst_text, (inv_x + 20, inst_y + i * 20))
             
         # Selected item info
         if self.inventory_slots[self.selected_slot]:
             item = self.inventory_slots[self.selected_slot]
-            info_text = small_font.render(f"Selected: {item['name']}", True, YELLOW)
+            info_text = text_renderer.render(f"Selected: {item['name']}", 18, YELLOW)
             screen.blit(info_text, (inv_x + 20, inst_y + 40))
             
         # Crafting recipes (if in crafting mode)
         if self.crafting_mode:
             craft_y = inv_y + 250
-            craft_title = eq_font.render("CRAFTING RECIPES:", True, GLITCH_PINK)
+            craft_title = text_renderer.render("CRAFTING RECIPES:", 20, GLITCH_PINK)
             screen.blit(craft_title, (inv_x + 20, craft_y))
             
-            recipe1 = small_font.render("1. Power Crystal: 2 Glitch + 1 Teleport", True, YELLOW)
+            recipe1 = text_renderer.render("1. Power Crystal: 2 Glitch + 1 Teleport", 18, YELLOW)
             screen.blit(recipe1, (inv_x + 20, craft_y + 25))
             
-            recipe2 = small_font.render("2. Shield Crystal: 2 Glitch + 1 Phase", True, WHITE)
+            recipe2 = text_renderer.render("2. Shield Crystal: 2 Glitch + 1 Phase", 18, WHITE)
             screen.blit(recipe2, (inv_x + 20, craft_y + 45))
         
     def take_damage(self):
         if self.shield_timer > 0:
-            print("Shield blocked damage!")
+            log.debug("Shield blocked damage!")
             return False  # Shield blocks damage
         if self.invulnerable_timer <= 0:
             self.health -= 1
@@ -834,7 +850,7 @@ class Player:
                 self.attack_direction = (self.facing_direction, 0)
                 
             weapon_name = self.equipment['weapon']['name'] if self.equipment['weapon'] else 'Fists'
-            print(f"Player attacks with {weapon_name}!")
+            log.debug("Player attacks with %s!", weapon_name)
             from ui.audio import audio_manager
             audio_manager.play_sound("attack")
             return True
@@ -937,14 +953,14 @@ class Player:
         old_weapon = self.equipment['weapon']
         self.equipment['weapon'] = weapon
         self.inventory_slots[self.selected_slot] = old_weapon
-        print(f"Equipped {weapon['name']}!")
+        log.info("Equipped %s!", weapon['name'])
         
     def equip_armor(self, armor):
         """Equip armor"""
         old_armor = self.equipment['armor']
         self.equipment['armor'] = armor
         self.inventory_slots[self.selected_slot] = old_armor
-        print(f"Equipped {armor['name']}!")
+        log.info("Equipped %s!", armor['name'])
 
 class Crystal:
     # Class variables for shared images
@@ -959,58 +975,59 @@ class Crystal:
         self.collected = False
         self.is_glitch = is_glitch
         
-        # Load images if not already loaded
+        # Load images if not already loaded (False marks a missing image)
         if Crystal.crystal_image is None:
-            try:
-                # Get path relative to project root
-                project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                crystal_path = os.path.join(project_root, "assets", "images", "crystal.png")
-                Crystal.crystal_image = pygame.image.load(crystal_path)
-                Crystal.crystal_image = pygame.transform.scale(Crystal.crystal_image, (80, 80))
-                print("Crystal image loaded")
-            except:
-                print("Could not load crystal.png")
-                Crystal.crystal_image = False
-                
+            Crystal.crystal_image = asset_manager.load_image("crystal.png", (80, 80)) or False
         if Crystal.glitch_crystal_image is None:
-            try:
-                glitch_crystal_path = os.path.join(project_root, "assets", "images", "gllitch_crystal.png")
-                Crystal.glitch_crystal_image = pygame.image.load(glitch_crystal_path)
-                Crystal.glitch_crystal_image = pygame.transform.scale(Crystal.glitch_crystal_image, (80, 80))
-                print("Glitch crystal image loaded")
-            except:
-                print("Could not load gllitch_crystal.png")
-                Crystal.glitch_crystal_image = False
+            Crystal.glitch_crystal_image = asset_manager.load_image("gllitch_crystal.png", (80, 80)) or False
         
     def update(self):
         self.glow = (math.sin(pygame.time.get_ticks() * 0.01) + 1) * 50
         
-    def draw(self, screen):
+    def draw(self, screen, camera):
+        x, y = camera.to_screen(self.x, self.y)
         if not self.collected:
             if self.is_glitch and Crystal.glitch_crystal_image:
                 # Draw glitch crystal image
-                rect = Crystal.glitch_crystal_image.get_rect(center=(int(self.x), int(self.y)))
+                rect = Crystal.glitch_crystal_image.get_rect(center=(int(x), int(y)))
                 screen.blit(Crystal.glitch_crystal_image, rect)
             elif not self.is_glitch and Crystal.crystal_image:
                 # Draw normal crystal image
-                rect = Crystal.crystal_image.get_rect(center=(int(self.x), int(self.y)))
+                rect = Crystal.crystal_image.get_rect(center=(int(x), int(y)))
                 screen.blit(Crystal.crystal_image, rect)
             else:
                 # Fallback to colored circles if images failed to load
                 if self.is_glitch:
                     colors = [GLITCH_PINK, GLITCH_GREEN, CRYSTAL_BLUE]
-                    color = random.choice(colors)
-                    pygame.draw.circle(screen, color, (int(self.x), int(self.y)), self.size)
+                    color = fx_random.choice(colors)
+                    pygame.draw.circle(screen, color, (int(x), int(y)), self.size)
                 else:
                     glow_color = (100 + self.glow, 150 + self.glow, 255)
-                    pygame.draw.circle(screen, glow_color, (int(self.x), int(self.y)), self.size)
-                    pygame.draw.circle(screen, CRYSTAL_BLUE, (int(self.x), int(self.y)), self.size - 4)
+                    pygame.draw.circle(screen, glow_color, (int(x), int(y)), self.size)
+                    pygame.draw.circle(screen, CRYSTAL_BLUE, (int(x), int(y)), self.size - 4)
 
-class Enemy:
-    # Class variable for shared image
+class Enemy(StoredEntity):
+    # Class variables for shared image and its damage flash variant
     enemy_image = None
+    enemy_variants = None
+    ARCHETYPE = None  # Store archetype; plain enemies use their type (patrol, chaser)
+    
+    # Per-tick state lives in the room's EntityStore (see entities.systems)
+    x = Column()
+    y = Column()
+    width = Column(np.int64)
+    height = Column(np.int64)
+    speed = Column()
+    direction = Column(np.int64)
+    move_timer = Column(np.int64)
+    health = Column(np.int64)
+    damage_timer = Column(np.int64)
+    lod_ticks = Column(np.int64)  # Ticks waiting to be simulated (see ai.lod)
+    sleeping = Column(np.bool_, False)
+    aggro = Column(np.bool_, False)  # Has seen the player while in range
     
-    def __init__(self, x, y, enemy_type="patrol"):
+    def __init__(self, x, y, enemy_type="patrol", rng=random, store=default_store):
+        self.spawn(store, self.ARCHETYPE or enemy_type)
         self.x = x
         self.y = y
         self.width = 20
@@ -1019,80 +1036,38 @@ class Enemy:
         self.speed = 1.5 if enemy_type == "chaser" else 1
         self.color = RED
         self.type = enemy_type
-        self.direction = random.choice([-1, 1])
+        self.direction = rng.choice([-1, 1])
         self.move_timer = 0
         self.health = 2
         self.max_health = 2
         self.damage_timer = 0
         
-        # Load enemy image if not already loaded
+        # Load enemy image if not already loaded (False marks a missing image)
         if Enemy.enemy_image is None:
-            try:
-                project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                enemy_path = os.path.join(project_root, "assets", "images", "beatle.png")
-                Enemy.enemy_image = pygame.image.load(enemy_path)
-                Enemy.enemy_image = pygame.transform.scale(Enemy.enemy_image, (120, 120))
-                print("Enemy image loaded")
-            except:
-                print("Could not load beatle.png")
-                Enemy.enemy_image = False
+            image = asset_manager.load_image("beatle.png", (120, 120))
+            if image:
+                Enemy.enemy_variants = SpriteVariants([image], effects=(NORMAL, FLASH), flip=False)
+            Enemy.enemy_image = image or False
         
-    def update(self, walls, player):
-        if self.type == "patrol":
-            self.move_timer += 1
-            if self.move_timer > 120:
-                self.direction *= -1
-                self.move_timer = 0
-                
-            old_x = self.x
-            self.x += self.speed * self.direction
-            
-            enemy_rect = pygame.Rect(self.x, self.y, self.width, self.height)
-            for wall in walls:
-                if enemy_rect.colliderect(wall):
-                    self.x = old_x
-                    self.direction *= -1
-                    break
-                    
-        elif self.type == "chaser":
-            if abs(player.x - self.x) < 150 and abs(player.y - self.y) < 150:
-                if player.x > self.x:
-                    self.x += self.speed * 0.7
-                elif player.x < self.x:
-                    self.x -= self.speed * 0.7
-                if player.y > self.y:
-                    self.y += self.speed * 0.7
-                elif player.y < self.y:
-                    self.y -= self.speed * 0.7
-                    
-        # Update damage timer
-        if self.damage_timer > 0:
-            self.damage_timer -= 1
-            
-    def draw(self, screen):
+    def draw(self, screen, camera):
+        x, y = camera.to_screen(self.x, self.y)
         if Enemy.enemy_image:
-            # Draw enemy image
-            image = Enemy.enemy_image
-            if self.damage_timer > 0:
-                # Create white flash effect
-                flash_image = image.copy()
-                flash_image.fill((255, 255, 255, 128), special_flags=pygame.BLEND_RGBA_MULT)
-                image = flash_image
-            
-            rect = image.get_rect(center=(int(self.x + self.width//2), int(self.y + self.height//2)))
+            # Draw enemy image (precomputed white flash when damaged)
+            image = Enemy.enemy_variants.get(0, FLASH if self.damage_timer > 0 else NORMAL)
+            rect = image.get_rect(center=(int(x + self.width//2), int(y + self.height//2)))
             screen.blit(image, rect)
         else:
             # Fallback to colored rectangle if image failed to load
             color = WHITE if self.damage_timer > 0 else self.color
-            pygame.draw.rect(screen, color, (self.x, self.y, self.width, self.height))
-            pygame.draw.circle(screen, WHITE, (int(self.x + 5), int(self.y + 5)), 2)
-            pygame.draw.circle(screen, WHITE, (int(self.x + 15), int(self.y + 5)), 2)
+            pygame.draw.rect(screen, color, (x, y, self.width, self.height))
+            pygame.draw.circle(screen, WHITE, (int(x + 5), int(y + 5)), 2)
+            pygame.draw.circle(screen, WHITE, (int(x + 15), int(y + 5)), 2)
         
         # Always show health bar above enemy
         bar_width = 30
         bar_height = 4
-        bar_x = self.x - 5
-        bar_y = self.y - 15  # Moved up slightly for image
+        bar_x = x - 5
+        bar_y = y - 15  # Moved up slightly for image
         
         # Background (dark gray)
         pygame.draw.rect(screen, (40, 40, 40), (bar_x, bar_y, bar_width, bar_height))
@@ -1104,9 +1079,8 @@ class Enemy:
             health_color = RED
         pygame.draw.rect(screen, health_color, (bar_x, bar_y, health_width, bar_height))
         
-        # Health text
-        font = pygame.font.Font(None, 16)
-        health_text = font.render(f"{self.health}/{self.max_health}", True, WHITE)
+        # Health text (cached per health value)
+        health_text = text_renderer.render(f"{self.health}/{self.max_health}", 16, WHITE)
         screen.blit(health_text, (bar_x, bar_y - 15))
         
     def take_damage(self, damage):
@@ -1116,64 +1090,44 @@ class Enemy:
         return self.health <= 0
         
 class GlitchEnemy(Enemy):
-    def __init__(self, x, y):
-        super().__init__(x, y, "glitch")
+    ARCHETYPE = "glitch"
+    teleport_timer = Column(np.int64)
+    
+    def __init__(self, x, y, rng=random, store=default_store):
+        super().__init__(x, y, "glitch", rng, store)
         self.color = GLITCH_PINK
         self.health = 3
         self.max_health = 3
         self.speed = 2
         self.teleport_timer = 0
         
-    def update(self, walls, player):
-        if self.teleport_timer > 0:
-            self.teleport_timer -= 1
-            
-        distance = ((player.x - self.x)**2 + (player.y - self.y)**2)**0.5
-        
-        if distance < 150 and self.teleport_timer <= 0:
-            # Simple teleport near player
-            self.x = player.x + random.randint(-80, 80)
-            self.y = player.y + random.randint(-80, 80)
-            self.teleport_timer = 120
-            from ui.audio import audio_manager
-            audio_manager.play_sound("glitch")
-            print("Glitch enemy teleported!")
-        else:
-            # Normal chase behavior
-            if player.x > self.x:
-                self.x += self.speed
-            elif player.x < self.x:
-                self.x -= self.speed
-            if player.y > self.y:
-                self.y += self.speed
-            elif player.y < self.y:
-                self.y -= self.speed
-                
-        if self.damage_timer > 0:
-            self.damage_timer -= 1
-            
-    def draw(self, screen):
-        color = GLITCH_PINK if random.randint(0, 3) == 0 else self.color
+    def draw(self, screen, camera):
+        x, y = camera.to_screen(self.x, self.y)
+        color = GLITCH_PINK if fx_random.randint(0, 3) == 0 else self.color
         if self.damage_timer > 0:
             color = WHITE
             
-        pygame.draw.rect(screen, color, (self.x, self.y, self.width, self.height))
-        pygame.draw.circle(screen, RED, (int(self.x + 5), int(self.y + 5)), 2)
-        pygame.draw.circle(screen, RED, (int(self.x + 15), int(self.y + 5)), 2)
+        pygame.draw.rect(screen, color, (x, y, self.width, self.height))
+        pygame.draw.circle(screen, RED, (int(x + 5), int(y + 5)), 2)
+        pygame.draw.circle(screen, RED, (int(x + 15), int(y + 5)), 2)
         
         # Pink health bar
         bar_width = 30
         bar_height = 4
-        bar_x = self.x - 5
-        bar_y = self.y - 15
+        bar_x = x - 5
+        bar_y = y - 15
         
         pygame.draw.rect(screen, (40, 40, 40), (bar_x, bar_y, bar_width, bar_height))
         health_width = int((self.health / self.max_health) * bar_width)
         pygame.draw.rect(screen, GLITCH_PINK, (bar_x, bar_y, health_width, bar_height))
 
 class Boss(Enemy):
-    def __init__(self, x, y, boss_type="guardian"):
-        super().__init__(x, y, boss_type)
+    ARCHETYPE = "boss"
+    attack_timer = Column(np.int64)
+    special_timer = Column(np.int64)
+    
+    def __init__(self, x, y, boss_type="guardian", rng=random, store=default_store):
+        super().__init__(x, y, boss_type, rng, store)
         self.width = 40
         self.height = 40
         self.health = 8
@@ -1183,82 +1137,25 @@ class Boss(Enemy):
         self.attack_timer = 0
         self.special_timer = 0
         self.phase = 1
-        self.projectiles = []
+        self.bullet_owner = next(bullet_owner_ids)  # Tags this boss's bullets in the room's BulletPool
+        self.route = None  # PathRequest while repositioning between volleys
+        self.route_step = 0
         
-    def update(self, walls, player):
-        # Boss AI phases
-        if self.health > 6:  # Phase 1: Slow chase
-            self.chase_player(player)
-        elif self.health > 3:  # Phase 2: Projectile attacks
-            self.projectile_attack(player)
-        else:  # Phase 3: Aggressive rush
-            self.aggressive_attack(player)
-            
-        # Update projectiles
-        for projectile in self.projectiles[:]:
-            projectile.update()
-            if projectile.x < 0 or projectile.x > SCREEN_WIDTH or projectile.y < 0 or projectile.y > SCREEN_HEIGHT:
-                self.projectiles.remove(projectile)
-                
-        # Update timers
-        if self.attack_timer > 0:
-            self.attack_timer -= 1
-        if self.special_timer > 0:
-            self.special_timer -= 1
-        if self.damage_timer > 0:
-            self.damage_timer -= 1
-            
-    def chase_player(self, player):
-        if abs(player.x - self.x) < 200 and abs(player.y - self.y) < 200:
-            if player.x > self.x:
-                self.x += self.speed
-            elif player.x < self.x:
-                self.x -= self.speed
-            if player.y > self.y:
-                self.y += self.speed
-            elif player.y < self.y:
-                self.y -= self.speed
-                
-    def projectile_attack(self, player):
-        if self.attack_timer <= 0:
-            # Shoot projectile at player
-            dx = player.x - self.x
-            dy = player.y - self.y
-            distance = math.sqrt(dx*dx + dy*dy)
-            if distance > 0:
-                proj_speed = 3
-                proj_dx = (dx / distance) * proj_speed
-                proj_dy = (dy / distance) * proj_speed
-                self.projectiles.append(Projectile(self.x + self.width//2, self.y + self.height//2, proj_dx, proj_dy))
-                self.attack_timer = 60
-                
-    def aggressive_attack(self, player):
-        # Fast chase in final phase
-        if abs(player.x - self.x) < 300 and abs(player.y - self.y) < 300:
-            chase_speed = self.speed * 2
-            if player.x > self.x:
-                self.x += chase_speed
-            elif player.x < self.x:
-                self.x -= chase_speed
-            if player.y > self.y:
-                self.y += chase_speed
-            elif player.y < self.y:
-                self.y -= chase_speed
-                
-    def draw(self, screen):
+    def draw(self, screen, camera):
+        x, y = camera.to_screen(self.x, self.y)
         # Flash when damaged
         color = WHITE if self.damage_timer > 0 else self.color
-        pygame.draw.rect(screen, color, (self.x, self.y, self.width, self.height))
+        pygame.draw.rect(screen, color, (x, y, self.width, self.height))
         
         # Boss eyes
-        pygame.draw.circle(screen, RED, (int(self.x + 10), int(self.y + 10)), 4)
-        pygame.draw.circle(screen, RED, (int(self.x + 30), int(self.y + 10)), 4)
+        pygame.draw.circle(screen, RED, (int(x + 10), int(y + 10)), 4)
+        pygame.draw.circle(screen, RED, (int(x + 30), int(y + 10)), 4)
         
         # Health bar (always visible for boss)
         bar_width = 60
         bar_height = 6
-        bar_x = self.x - 10
-        bar_y = self.y - 15
+        bar_x = x - 10
+        bar_y = y - 15
         
         pygame.draw.rect(screen, (40, 40, 40), (bar_x, bar_y, bar_width, bar_height))
         health_width = int((self.health / self.max_health) * bar_width)
@@ -1269,30 +1166,7 @@ class Boss(Enemy):
         else:
             health_color = RED
         pygame.draw.rect(screen, health_color, (bar_x, bar_y, health_width, bar_height))
-        
-        # Draw projectiles
-        for projectile in self.projectiles:
-            projectile.draw(screen)
             
-class Projectile:
-    def __init__(self, x, y, vel_x, vel_y):
-        self.x = x
-        self.y = y
-        self.vel_x = vel_x
-        self.vel_y = vel_y
-        self.size = 6
-        
-    def update(self):
-        self.x += self.vel_x
-        self.y += self.vel_y
-        
-    def draw(self, screen):
-        pygame.draw.circle(screen, YELLOW, (int(self.x), int(self.y)), self.size)
-        pygame.draw.circle(screen, RED, (int(self.x), int(self.y)), self.size - 2)
-        
-    def get_rect(self):
-        return pygame.Rect(self.x - self.size, self.y - self.size, self.size * 2, self.size * 2)
-
 class Key:
     def __init__(self, x, y):
         self.x = x
@@ -1304,11 +1178,12 @@ class Key:
     def update(self):
         self.glow = (math.sin(pygame.time.get_ticks() * 0.02) + 1) * 30
         
-    def draw(self, screen):
+    def draw(self, screen, camera):
+        x, y = camera.to_screen(self.x, self.y)
         if not self.collected:
             glow_color = (255, 255 - self.glow, 0)
-            pygame.draw.circle(screen, glow_color, (int(self.x), int(self.y)), self.size)
-            pygame.draw.rect(screen, YELLOW, (self.x - 3, self.y - 8, 6, 16))
+            pygame.draw.circle(screen, glow_color, (int(x), int(y)), self.size)
+            pygame.draw.rect(screen, YELLOW, (x - 3, y - 8, 6, 16))
 
 class Door:
     def __init__(self, x, y, width, height, keys_required=1):
@@ -1317,52 +1192,46 @@ class Door:
         self.locked = True
         self.can_use = False
         
-    def draw(self, screen):
+    def draw(self, screen, camera):
+        rect = camera.apply(self.rect)
         if self.locked:
-            pygame.draw.rect(screen, DOOR_COLOR, self.rect)
-            pygame.draw.circle(screen, YELLOW, self.rect.center, 8)
-            pygame.draw.circle(screen, DOOR_COLOR, self.rect.center, 5)
+            pygame.draw.rect(screen, DOOR_COLOR, rect)
+            pygame.draw.circle(screen, YELLOW, rect.center, 8)
+            pygame.draw.circle(screen, DOOR_COLOR, rect.center, 5)
         else:
             # Unlocked door - different color
             color = GREEN if hasattr(self, 'can_use') and self.can_use else BLUE
-            pygame.draw.rect(screen, color, self.rect)
-            pygame.draw.circle(screen, WHITE, self.rect.center, 8)
+            pygame.draw.rect(screen, color, rect)
+            pygame.draw.circle(screen, WHITE, rect.center, 8)
             if hasattr(self, 'can_use') and self.can_use:
                 # Glowing effect when player can use
-                pygame.draw.rect(screen, WHITE, self.rect, 3)
+                pygame.draw.rect(screen, WHITE, rect, 3)
 
-class FallingRock:
-    def __init__(self, x, y):
+class FallingRock(StoredEntity):
+    x = Column()
+    y = Column()
+    width = Column(np.int64)
+    height = Column(np.int64)
+    vel_y = Column()
+    active = Column(np.bool_, False)
+    trigger_distance = Column(default=100)
+    lod_ticks = Column(np.int64)
+    sleeping = Column(np.bool_, False)  # Untriggered and far from the player (see ai.lod)
+    
+    def __init__(self, x, y, store=default_store):
+        self.spawn(store, "rock")
         self.x = x
         self.y = y
         self.width = 20
         self.height = 20
         self.vel_y = 0
         self.active = False
-        self.trigger_distance = 100
         
-    def update(self, walls, player):
-        if not self.active and abs(player.x - self.x) < self.trigger_distance:
-            self.active = True
-            
-        if self.active:
-            self.vel_y += GRAVITY * 0.5
-            self.vel_y = min(self.vel_y, MAX_FALL_SPEED)
-            
-            old_y = self.y
-            self.y += self.vel_y
-            
-            rock_rect = pygame.Rect(self.x, self.y, self.width, self.height)
-            for wall in walls:
-                if rock_rect.colliderect(wall):
-                    self.y = old_y
-                    self.vel_y = 0
-                    break
-                    
-    def draw(self, screen):
+    def draw(self, screen, camera):
+        x, y = camera.to_screen(self.x, self.y)
         color = (100, 80, 60) if not self.active else (120, 100, 80)
-        pygame.draw.rect(screen, color, (self.x, self.y, self.width, self.height))
-        pygame.draw.circle(screen, (80, 60, 40), (int(self.x + 5), int(self.y + 5)), 3)
+        pygame.draw.rect(screen, color, (x, y, self.width, self.height))
+        pygame.draw.circle(screen, (80, 60, 40), (int(x + 5), int(y + 5)), 3)
         
     def get_rect(self):
         return pygame.Rect(self.x, self.y, self.width, self.height)
@@ -1377,18 +1246,21 @@ class MovingPlatform:
         self.move_range = move_range
         self.speed = 1
         self.direction = 1
+        self.rect = pygame.Rect(x, y, width, self.height)  # Registered as a collider; moved in place
         
     def update(self):
         self.x += self.speed * self.direction
+        self.rect.x = self.x
         
         if self.x >= self.start_x + self.move_range or self.x <= self.start_x:
             self.direction *= -1
             
-    def draw(self, screen):
-        pygame.draw.rect(screen, CAVE_ACCENT, (self.x, self.y, self.width, self.height))
+    def draw(self, screen, camera):
+        x, y = camera.to_screen(self.x, self.y)
+        pygame.draw.rect(screen, CAVE_ACCENT, (x, y, self.width, self.height))
         for i in range(0, self.width, 8):
             pygame.draw.line(screen, tuple(min(255, c + 20) for c in CAVE_ACCENT), 
-                           (self.x + i, self.y), (self.x + i, self.y + self.height), 1)
+                           (x + i, y), (x + i, y + self.height), 1)
             
     def get_rect(self):
-        return pygame.Rect(self.x, self.y, self.width, self.height)
\ No newline at end of file
+        return self.rect
\ No newline at end of file
@@ -1,3 +1,4 @@
+import numpy as np
 import pygame
 import random
 import sys
@@ -7,14 +8,50 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import *
-from entities.entities import Crystal, Enemy, Key, Door, FallingRock, MovingPlatform, GlitchEnemy, Boss
+from ai.flow_field import FlowField
+from ai.lod import AiLod
+from ai.pathfinding import PathService, nearest_open_cell
+from ai.scheduler import AiScheduler
+from core.asset_manager import asset_manager
+from core.log import get_logger
+from core.profiler import profiler
+from entities.entities import Crystal, Enemy, Key, Door, FallingRock, MovingPlatform, GlitchEnemy, Boss, fx_random
+from entities.bullets import BulletPool
+from entities.store import EntityStore
 from generators.cave_generator import CaveGenerator, CaveParameters
+from physics.clearance import ClearanceField
+from physics.colliders import ColliderSet
+from physics.collision import BodyGroup, DOOR, PICKUP, PLATFORM
+from physics.raycast import LineOfSight
+from physics.tiles import build_tile_grid
+
+log = get_logger("rooms")
+
+KEY_PATH_ATTEMPTS = 8  # Top-scoring key spots tried for a path to the door
+
+
+def room_dimensions(room_id):
+    """Room size in tiles: one screen, or LARGE_ROOM_SCALE screens a side for large rooms"""
+    if room_id % LARGE_ROOM_INTERVAL == LARGE_ROOM_INTERVAL - 1:
+        return CAVE_WIDTH * LARGE_ROOM_SCALE, CAVE_HEIGHT * LARGE_ROOM_SCALE
+    return CAVE_WIDTH, CAVE_HEIGHT
+
 
 class Room:
-    def __init__(self, room_id):
+    def __init__(self, room_id, seed=None, size=None):
         self.id = room_id
+        self.cols, self.rows = size or room_dimensions(room_id)  # Size in tiles
+        # Private RNG so rooms generate identically on any loader thread
+        self.rng = random.Random(seed)
+        self.store = EntityStore()  # Enemies, bosses and rocks in NumPy columns
+        self.bullets = BulletPool()
+        self.paths = PathService()  # Budgeted A* for bosses and level checks
+        self.lod = AiLod(*self.world_size())  # Update rates and sleep for distant AI
+        self.ai = AiScheduler()  # Budgeted think tasks (teleports, volleys, replans)
+        self.sight = LineOfSight()  # Cached line-of-sight queries over the tile grid
+        self.clearance = ClearanceField()  # Where the player fits, for teleport landing
+        self.colliders = ColliderSet()  # Solid tiles plus locked doors and moving platforms
         self.cave_map = []
-        self.walls = []
         self.crystals = []
         self.enemies = []
         self.keys = []
@@ -22,43 +59,37 @@ class Room:
         self.falling_rocks = []
         self.moving_platforms = []
         self.bosses = []
+        self.pickups = None  # Crystals and keys as a BodyGroup, built on first use
         
-        # Load wall texture
-        try:
-            # Get path relative to project root
-            project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            wall_texture_path = os.path.join(project_root, "assets", "images", "stone.jpg")
-            self.wall_texture = pygame.image.load(wall_texture_path)
-            self.wall_texture = pygame.transform.scale(self.wall_texture, (TILE_SIZE, TILE_SIZE))
-            
-            # Create rotated versions of the texture
+        # Load wall texture and create rotated versions of it
+        self.wall_texture = asset_manager.load_image("stone.jpg", (TILE_SIZE, TILE_SIZE), alpha=False)
+        if self.wall_texture:
             self.wall_textures = [
                 self.wall_texture,  # Original (0 degrees)
                 pygame.transform.rotate(self.wall_texture, 90),  # 90 degrees
                 pygame.transform.rotate(self.wall_texture, 180),  # 180 degrees
                 pygame.transform.rotate(self.wall_texture, 270)   # 270 degrees
             ]
-            
-            # Generate random rotation map for each tile
-            self.wall_rotations = {}
-            print("Wall texture loaded successfully")
-        except Exception as e:
-            self.wall_texture = None
+        else:
             self.wall_textures = None
-            print(f"Could not load stone.jpg: {e}, using default wall colors")
+        
+        # Random rotation index for each wall tile
+        self.wall_rotations = {}
+        self.tile_rect = pygame.Rect(0, 0, TILE_SIZE, TILE_SIZE)  # Reused for every tile drawn
             
-        self.generate_room()
+        with profiler.span("room.generate", room=room_id):
+            self.generate_room()
         
     def generate_room(self):
         # Create different cave parameters based on room ID
         params = self.get_cave_parameters()
         
         # Generate cave using parameters
-        self.cave_map = CaveGenerator.generate_cave(CAVE_WIDTH, CAVE_HEIGHT, params)
+        self.cave_map = CaveGenerator.generate_cave(self.cols, self.rows, params, self.rng)
         
         # Post-process the cave
-        self.cave_map = CaveGenerator.smooth_cave(self.cave_map, CAVE_WIDTH, CAVE_HEIGHT, params)
-        self.cave_map = CaveGenerator.ensure_connectivity(self.cave_map, CAVE_WIDTH, CAVE_HEIGHT, params)
+        self.cave_map = CaveGenerator.smooth_cave(self.cave_map, self.cols, self.rows, params)
+        self.cave_map = CaveGenerator.ensure_connectivity(self.cave_map, self.cols, self.rows, params)
         
         # Convert cave map to wall rectangles
         self.rebuild_walls()
@@ -75,10 +106,10 @@ class Room:
             return
             
         self.wall_rotations = {}
-        for y in range(CAVE_HEIGHT):
-            for x in range(CAVE_WIDTH):
+        for y in range(self.rows):
+            for x in range(self.cols):
                 if self.cave_map[y][x]:
-                    self.wall_rotations[(x, y)] = random.randint(0, 3)
+                    self.wall_rotations[(x, y)] = self.rng.randint(0, 3)
         
     def get_cave_parameters(self):
         """Generate cave parameters based on room ID for variety"""
@@ -136,26 +167,18 @@ class Room:
             ) """
         
     def rebuild_walls(self):
-        self.walls = []
-        for y in range(CAVE_HEIGHT):
-            for x in range(CAVE_WIDTH):
-                if self.cave_map[y][x]:
-                    wall_rect = pygame.Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
-                    self.walls.append(wall_rect)
-        
-        # Ensure borders are always walls
-        for x in range(CAVE_WIDTH):
-            self.walls.append(pygame.Rect(x * TILE_SIZE, 0, TILE_SIZE, TILE_SIZE))
-            self.walls.append(pygame.Rect(x * TILE_SIZE, (CAVE_HEIGHT - 1) * TILE_SIZE, TILE_SIZE, TILE_SIZE))
-        for y in range(CAVE_HEIGHT):
-            self.walls.append(pygame.Rect(0, y * TILE_SIZE, TILE_SIZE, TILE_SIZE))
-            self.walls.append(pygame.Rect((CAVE_WIDTH - 1) * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+        self.tile_grid = build_tile_grid(self.cave_map)
+        self.flow_field = FlowField(self.tile_grid)  # Chaser paths to the player
+        self.paths.set_grid(self.tile_grid)
+        self.sight.set_grid(self.tile_grid)
+        self.clearance.set_grid(self.tile_grid)
+        self.colliders.set_grid(self.tile_grid)
     
     def place_objects(self):
         # Find all open spaces
         open_spaces = []
-        for y in range(2, CAVE_HEIGHT - 2):
-            for x in range(2, CAVE_WIDTH - 2):
+        for y in range(2, self.rows - 2):
+            for x in range(2, self.cols - 2):
                 if not self.cave_map[y][x]:
                     clear = True
                     for dy in range(-1, 2):
@@ -172,10 +195,10 @@ class Room:
             return
         
         # Place crystals
-        crystal_count = min(random.randint(4, 8), len(open_spaces) // 3)
-        crystal_positions = random.sample(open_spaces, crystal_count)
+        crystal_count = min(self.rng.randint(4, 8), len(open_spaces) // 3)
+        crystal_positions = self.rng.sample(open_spaces, crystal_count)
         for x, y in crystal_positions:
-            is_glitch = random.randint(0, 4) == 0
+            is_glitch = self.rng.randint(0, 4) == 0
             self.crystals.append(Crystal(x, y, is_glitch))
             open_spaces.remove((x, y))
         
@@ -185,40 +208,38 @@ class Room:
         if len(open_spaces) >= 2:
             attempts = 0
             while not door_placed and attempts < 20:
-                x = random.randint(2, CAVE_WIDTH - 3) * TILE_SIZE
-                y = random.randint(2, CAVE_HEIGHT - 3) * TILE_SIZE
+                x = self.rng.randint(2, self.cols - 3) * TILE_SIZE
+                y = self.rng.randint(2, self.rows - 3) * TILE_SIZE
                 
                 door_rect = pygame.Rect(x, y, TILE_SIZE * 2, TILE_SIZE)
-                collision = any(wall.colliderect(door_rect) for wall in self.walls)
-                
-                if not collision:
-                    self.doors.append(Door(x, y, TILE_SIZE * 2, TILE_SIZE))
+                if not self.colliders.hits_static(door_rect):
+                    self.add_door(Door(x, y, TILE_SIZE * 2, TILE_SIZE))
                     door_position = (x + TILE_SIZE, y + TILE_SIZE//2)  # Door center
                     door_placed = True
                 attempts += 1
                 
             # If door placement failed, force create space
             if not door_placed:
-                x = CAVE_WIDTH // 2 * TILE_SIZE
-                y = (CAVE_HEIGHT - 2) * TILE_SIZE
-                self.doors.append(Door(x, y, TILE_SIZE * 2, TILE_SIZE))
+                x = self.cols // 2 * TILE_SIZE
+                y = (self.rows - 2) * TILE_SIZE
+                self.add_door(Door(x, y, TILE_SIZE * 2, TILE_SIZE))
                 door_position = (x + TILE_SIZE, y + TILE_SIZE//2)
-                print(f"Forced door placement in room {self.id}")
+                log.debug("Forced door placement in room %d", self.id)
         
         # Place more enemies, especially in early levels
         base_count = 3 if self.id < 3 else 2  # More enemies in early rooms
         enemy_count = min(base_count + (self.id // 2), len(open_spaces) // 3)  # Increased enemy density
         enemy_positions = []
         if enemy_count > 0 and open_spaces:
-            selected_positions = random.sample(open_spaces, min(enemy_count, len(open_spaces)))
+            selected_positions = self.rng.sample(open_spaces, min(enemy_count, len(open_spaces)))
             for i, (x, y) in enumerate(selected_positions):
                 if i == 0 and self.id >= 2:  # First enemy in room 2+ can be glitch
-                    self.enemies.append(GlitchEnemy(x, y))
-                    print(f"Spawned Glitch Enemy in room {self.id}")
+                    self.enemies.append(GlitchEnemy(x, y, rng=self.rng, store=self.store))
+                    log.debug("Spawned Glitch Enemy in room %d", self.id)
                 else:
                     # More chasers in early levels for higher difficulty
                     enemy_type = "chaser" if (i % 2 == 0 or self.id < 3) else "patrol"
-                    self.enemies.append(Enemy(x, y, enemy_type))
+                    self.enemies.append(Enemy(x, y, enemy_type, rng=self.rng, store=self.store))
                 enemy_positions.append((x, y))
                 open_spaces.remove((x, y))
         
@@ -233,41 +254,40 @@ class Room:
             self.add_boss()
             
         # Place falling rocks and moving platforms (near key if possible)
+        world_width, world_height = self.world_size()
         if self.id > 1:
             key_pos = None
             if self.keys:
                 key_pos = (self.keys[0].x, self.keys[0].y)
                 
-            for _ in range(random.randint(1, 3)):
+            for _ in range(self.rng.randint(1, 3)):
                 if open_spaces:
                     # Try to place rocks near key for extra challenge
-                    if key_pos and random.randint(0, 1) == 0:
+                    if key_pos and self.rng.randint(0, 1) == 0:
                         nearby_spaces = [pos for pos in open_spaces 
                                        if ((pos[0] - key_pos[0])**2 + (pos[1] - key_pos[1])**2)**0.5 < 150]
-                        pos = random.choice(nearby_spaces) if nearby_spaces else random.choice(open_spaces)
+                        pos = self.rng.choice(nearby_spaces) if nearby_spaces else self.rng.choice(open_spaces)
                     else:
-                        pos = random.choice(open_spaces)
+                        pos = self.rng.choice(open_spaces)
                         
-                    rock_y = pos[1] - random.randint(100, 200)
+                    rock_y = pos[1] - self.rng.randint(100, 200)
                     if rock_y > 0:
-                        self.falling_rocks.append(FallingRock(pos[0], rock_y))
+                        self.falling_rocks.append(FallingRock(pos[0], rock_y, store=self.store))
                         
-            for _ in range(random.randint(0, 2)):
-                x = random.randint(TILE_SIZE * 3, SCREEN_WIDTH - TILE_SIZE * 6)
-                y = random.randint(TILE_SIZE * 5, SCREEN_HEIGHT - TILE_SIZE * 5)
+            for _ in range(self.rng.randint(0, 2)):
+                x = self.rng.randint(TILE_SIZE * 3, world_width - TILE_SIZE * 6)
+                y = self.rng.randint(TILE_SIZE * 5, world_height - TILE_SIZE * 5)
                 
                 platform_rect = pygame.Rect(x, y, TILE_SIZE * 4, TILE_SIZE)
-                collision = any(wall.colliderect(platform_rect) for wall in self.walls)
-                
-                if not collision:
-                    self.moving_platforms.append(MovingPlatform(x, y, TILE_SIZE * 4))
+                if not self.colliders.hits_static(platform_rect):
+                    self.add_platform(MovingPlatform(x, y, TILE_SIZE * 4))
                     
     def add_boss(self):
         """Add a boss to the room"""
         # Find open area for boss
         for attempt in range(20):
-            x = random.randint(5, CAVE_WIDTH - 10)
-            y = random.randint(5, CAVE_HEIGHT - 10)
+            x = self.rng.randint(5, self.cols - 10)
+            y = self.rng.randint(5, self.rows - 10)
             
             # Check if area is clear (3x3 area)
             clear = True
@@ -282,15 +302,18 @@ class Room:
             if clear:
                 world_x = x * TILE_SIZE
                 world_y = y * TILE_SIZE
-                self.bosses.append(Boss(world_x, world_y))
+                self.bosses.append(Boss(world_x, world_y, rng=self.rng, store=self.store))
                 break
                 
     def find_strategic_key_position(self, open_spaces, door_position, enemy_positions):
-        """Find key position that's far from door and near enemies/traps"""
-        best_pos = None
-        best_score = -1
-        
-        for pos in open_spaces:
+        """Find key position that's far from door and near enemies/traps.
+
+        The best-scoring spots are checked in order for a walkable path to the
+        door, so the key never ends up sealed off from it.
+        """
+        world_width, world_height = self.world_size()
+
+        def score(pos):
             score = 0
             
             # Distance from door (farther = better)
@@ -308,38 +331,67 @@ class Room:
             
             # Prefer corners and edges (more dangerous)
             edge_bonus = 0
-            if pos[0] < TILE_SIZE * 4 or pos[0] > SCREEN_WIDTH - TILE_SIZE * 4:
+            if pos[0] < TILE_SIZE * 4 or pos[0] > world_width - TILE_SIZE * 4:
                 edge_bonus += 1
-            if pos[1] < TILE_SIZE * 4 or pos[1] > SCREEN_HEIGHT - TILE_SIZE * 4:
+            if pos[1] < TILE_SIZE * 4 or pos[1] > world_height - TILE_SIZE * 4:
                 edge_bonus += 1
             score += edge_bonus
+            return score
             
-            if score > best_score:
-                best_score = score
-                best_pos = pos
-                
-        return best_pos if best_pos else random.choice(open_spaces)
+        ranked = sorted(open_spaces, key=score, reverse=True)  # Stable: ties keep scan order
+        door_cell = nearest_open_cell(self.tile_grid, int(door_position[0] // TILE_SIZE),
+                                      int(door_position[1] // TILE_SIZE))
+        if door_cell:
+            for pos in ranked[:KEY_PATH_ATTEMPTS]:
+                if self.paths.find_path((pos[0] // TILE_SIZE, pos[1] // TILE_SIZE), door_cell):
+                    return pos
+        log.debug("No key spot with a path to the door in room %d", self.id)
+        return ranked[0]
                 
-    def get_all_walls(self):
-        all_walls = self.walls[:]
-        for door in self.doors:
-            if door.locked:
-                all_walls.append(door.rect)
-        for platform in self.moving_platforms:
-            all_walls.append(platform.get_rect())
-        return all_walls
-                
-    def draw_walls(self, screen):
-        for y in range(CAVE_HEIGHT):
-            for x in range(CAVE_WIDTH):
-                rect = pygame.Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+    def pickup_bodies(self):
+        """Crystals and keys as one PICKUP BodyGroup; collecting one clears its live row"""
+        if self.pickups is None:
+            items = self.crystals + self.keys
+            self.pickups = BodyGroup(PICKUP, items,
+                                     np.array([item.x - item.size for item in items], dtype=float),
+                                     np.array([item.y - item.size for item in items], dtype=float),
+                                     np.array([item.size * 2 for item in items], dtype=float),
+                                     np.array([item.size * 2 for item in items], dtype=float),
+                                     live=np.array([not item.collected for item in items], dtype=bool))
+        return self.pickups
+
+    def world_size(self):
+        """Room size in pixels"""
+        return self.cols * TILE_SIZE, self.rows * TILE_SIZE
+
+    def add_door(self, door):
+        self.doors.append(door)
+        if door.locked:
+            self.colliders.add(door.rect, DOOR)
+
+    def unlock_door(self, door):
+        door.locked = False
+        self.colliders.remove(door.rect)
+
+    def add_platform(self, platform):
+        self.moving_platforms.append(platform)
+        self.colliders.add(platform.rect, PLATFORM)
                 
+    def draw_walls(self, screen, camera):
+        """Draw the wall tiles inside the camera's view"""
+        first_col, first_row, end_col, end_row = camera.tile_range(self.cols, self.rows)
+        offset_x, offset_y = camera.to_screen(0, 0)
+        rect = self.tile_rect
+        for y in range(first_row, end_row):
+            rect.y = y * TILE_SIZE + offset_y
+            for x in range(first_col, end_col):
                 if self.cave_map[y][x]:
+                    rect.x = x * TILE_SIZE + offset_x
                     if hasattr(self, 'wall_textures') and self.wall_textures:
                         # Get or create random rotation for this tile
                         tile_key = (x, y)
                         if tile_key not in self.wall_rotations:
-                            self.wall_rotations[tile_key] = random.randint(0, 3)  # Random rotation index
+                            self.wall_rotations[tile_key] = fx_random.randint(0, 3)  # Random rotation index
                             
                         # Use randomly rotated wall texture
                         rotation_index = self.wall_rotations[tile_key]
@@ -355,22 +407,43 @@ class Room:
                             color = CAVE_ACCENT
                         pygame.draw.rect(screen, color, rect)
                         
-                        if random.randint(0, 10) == 0:
+                        if fx_random.randint(0, 10) == 0:
                             pygame.draw.line(screen, tuple(min(255, c + 30) for c in color), 
                                            (rect.left, rect.top), (rect.right, rect.bottom), 1)
                 # Don't draw cave floor - let background show through
                 # Only draw walls, leaving open areas transparent
             
-    def draw_objects(self, screen):
+    def draw_objects(self, screen, camera):
+        """Draw room objects the camera can see.
+
+        Pickups and stored entities are culled a whole column set at a
+        time, so off-screen ones cost no per-object work.
+        """
         for door in self.doors:
-            door.draw(screen)
-        for key in self.keys:
-            key.draw(screen)
-        for enemy in self.enemies:
-            enemy.draw(screen)
-        for rock in self.falling_rocks:
-            rock.draw(screen)
+            if camera.sees(door.rect.x, door.rect.y, door.rect.width, door.rect.height):
+                door.draw(screen, camera)
+        pickups = self.pickup_bodies()
+        draw_visible(screen, camera, pickups.owners, pickups.x, pickups.y, pickups.width, pickups.height,
+                     pickups.live)
+        for name, archetype in self.store.archetypes.items():
+            if name != "boss":
+                draw_archetype(screen, camera, archetype)
         for platform in self.moving_platforms:
-            platform.draw(screen)
-        for boss in self.bosses:
-            boss.draw(screen)
\ No newline at end of file
+            if camera.sees(platform.x, platform.y, platform.width, platform.height):
+                platform.draw(screen, camera)
+        draw_archetype(screen, camera, self.store.get("boss"))  # Bosses on top
+
+
+def draw_visible(screen, camera, owners, x, y, width, height, live=None):
+    """Draw owners[i] for each row of the columns the camera sees"""
+    visible = camera.sees(x, y, width, height)
+    if live is not None:
+        visible &= live
+    for row in np.flatnonzero(visible).tolist():
+        owners[row].draw(screen, camera)
+
+
+def draw_archetype(screen, camera, archetype):
+    if archetype is not None and archetype.count:
+        draw_visible(screen, camera, archetype.entities, archetype.view("x"), archetype.view("y"),
+                     archetype.view("width"), archetype.view("height"))
@@ -0,0 +1,143 @@
+import numpy as np
+
+ARCHETYPE_INITIAL_CAPACITY = 16
+
+
+class Column:
+    """Descriptor exposing one archetype column as an attribute of an entity.
+
+    Declared on the entity class (x = Column(float)); the store collects them
+    to build each archetype's arrays, and reads/writes go to that row.
+    """
+
+    def __init__(self, dtype=np.float64, default=0):
+        self.dtype = np.dtype(dtype)
+        self.default = default
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, entity, owner=None):
+        if entity is None:
+            return self
+        return entity.archetype.columns[self.name][entity.index].item()
+
+    def __set__(self, entity, value):
+        entity.archetype.columns[self.name][entity.index] = value
+
+
+def entity_columns(cls):
+    """All Column descriptors of an entity class, base classes first"""
+    columns = {}
+    for klass in reversed(cls.__mro__):
+        for name, value in vars(klass).items():
+            if isinstance(value, Column):
+                columns[name] = value
+    return columns
+
+
+class Archetype:
+    """Struct-of-arrays storage for every entity of one kind.
+
+    Rows 0..count-1 are live. entities[i] is the facade object for row i;
+    removal swaps the last row into the hole so arrays stay dense.
+    """
+
+    def __init__(self, name, columns, capacity=ARCHETYPE_INITIAL_CAPACITY):
+        self.name = name
+        self.specs = columns
+        self.columns = {name: np.full(capacity, spec.default, dtype=spec.dtype)
+                        for name, spec in columns.items()}
+        self.entities = []
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def view(self, name):
+        """Live slice of a column; batched systems update these in place"""
+        return self.columns[name][:self.count]
+
+    def add(self, entity):
+        if self.count == len(next(iter(self.columns.values()))):
+            self.grow()
+        row = self.count
+        for name, spec in self.specs.items():
+            self.columns[name][row] = spec.default
+        self.count += 1
+        self.entities.append(entity)
+        entity.archetype = self
+        entity.index = row
+
+    def grow(self):
+        for name, array in self.columns.items():
+            grown = np.full(len(array) * 2, self.specs[name].default, dtype=array.dtype)
+            grown[:len(array)] = array
+            self.columns[name] = grown
+
+    def remove(self, entity):
+        """Swap-remove the entity's row; the entity keeps a detached copy of its values"""
+        row = entity.index
+        last = self.count - 1
+        entity.archetype = DetachedRow(self, row)
+        entity.index = 0
+        if row != last:
+            for array in self.columns.values():
+                array[row] = array[last]
+            moved = self.entities[last]
+            moved.index = row
+            self.entities[row] = moved
+        self.entities.pop()
+        self.count -= 1
+
+
+class DetachedRow:
+    """Single-row snapshot so a despawned entity's attributes stay readable"""
+
+    def __init__(self, archetype, row):
+        self.name = archetype.name
+        self.columns = {name: array[row:row + 1].copy() for name, array in archetype.columns.items()}
+
+
+class EntityStore:
+    """Archetypes by name; each room owns one store"""
+
+    def __init__(self):
+        self.archetypes = {}
+
+    def archetype(self, name, entity_class=None):
+        archetype = self.archetypes.get(name)
+        if archetype is None:
+            archetype = self.archetypes[name] = Archetype(name, entity_columns(entity_class))
+        return archetype
+
+    def get(self, name):
+        """The named archetype if anything ever spawned into it, else None"""
+        return self.archetypes.get(name)
+
+    def count(self):
+        return sum(archetype.count for archetype in self.archetypes.values())
+
+
+class StoredEntity:
+    """Base for entities whose hot fields live in an EntityStore.
+
+    Call spawn() before assigning any Column attribute.
+    """
+
+    def spawn(self, store, archetype_name):
+        self.store = store
+        store.archetype(archetype_name, type(self)).add(self)
+
+    def despawn(self):
+        if self.alive:
+            self.archetype.remove(self)
+
+    @property
+    def alive(self):
+        return not isinstance(self.archetype, DetachedRow)
+
+
+# Store for entities created outside a room
+default_store = EntityStore()
@@ -0,0 +1,335 @@
+"""Batched per-tick updates over the EntityStore archetypes.
+
+Each function updates every entity of one archetype with NumPy column
+operations, reproducing the behaviour of the old per-object update()
+methods. Rare per-entity events (teleports, firing) loop over just the
+rows that need them. Chasing enemies steer by the room's shared flow field
+(see ai.flow_field) rather than straight at the player, and only take
+aggro on a player they can see (see physics.raycast).
+
+Each system gets dt, the ticks every row should simulate this tick, from
+the room's AI level of detail (see ai.lod): 1 for nearby rows, more for
+distant rows that update every few ticks, 0 for rows that wait or sleep.
+
+Systems only integrate movement and timers. Decisions with per-entity work
+(teleports, volleys, route replans) are submitted to the room's
+AiScheduler (see ai.scheduler) as think tasks, which may run on a later
+tick and so re-check their conditions first.
+"""
+import math
+import random
+from functools import partial
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import *
+from core.log import get_logger
+from ai.lod import LOD_SLEEP_MARGIN
+from ai.pathfinding import nearest_open_cell
+from entities.bullets import aimed, ring
+from physics.tiles import rects_hit_tiles
+
+log = get_logger("enemies")
+
+PATROL_TURN_TICKS = 120
+CHASER_RANGE = 150
+GLITCH_TELEPORT_RANGE = 150
+GLITCH_TELEPORT_COOLDOWN = 120
+GLITCH_TELEPORT_TRIES = 4  # Random spots tried for a clear, visible landing
+GLITCH_TELEPORT_RETRY_TICKS = 15
+BOSS_CHASE_RANGE = 200
+BOSS_RUSH_RANGE = 300
+BOSS_FIRE_COOLDOWN = 60
+BOSS_SIGHT_RETRY_TICKS = 15  # Wait before re-checking a shot with no line of sight
+PROJECTILE_SPEED = 3
+BOSS_STANDOFF = 160  # Distance phase 2 bosses keep from the player while firing
+BOSS_REPOSITION_TICKS = 90
+BOSS_FAN_HEALTH = 5  # Phase 2 volleys widen into an aimed fan at this health...
+BOSS_FAN_COUNT = 3
+BOSS_FAN_SPREAD = 0.5  # Radians
+BOSS_RING_HEALTH = 4  # ...and into a full ring, one bullet aimed, at this health
+BOSS_RING_COUNT = 12
+
+
+def chase_step(position, target, speed, mask):
+    """Move toward target by speed along one axis where mask is set"""
+    position += np.where(mask, speed * np.sign(target - position), 0.0)
+
+
+def chase_path(archetype, flow, player, speed, mask):
+    """Step toward the player along the flow field where mask is set.
+
+    Each axis is resolved against the tile grid like update_patrol: a step
+    that would put a body into rock is undone. Bodies already overlapping
+    rock may still move, so they can work their way out.
+    """
+    x = archetype.view("x")
+    y = archetype.view("y")
+    width = archetype.view("width")
+    height = archetype.view("height")
+    grid = flow.grid
+    target_x, target_y = flow.targets(x, y, width, height, player.x, player.y)
+    embedded = rects_hit_tiles(grid, x, y, width, height)
+    for position, target in ((x, target_x), (y, target_y)):
+        old = position.copy()
+        chase_step(position, target, speed, mask)
+        blocked = mask & ~embedded & rects_hit_tiles(grid, x, y, width, height)
+        position[blocked] = old[blocked]
+
+
+def count_down(timer, dt=1):
+    """Run positive timers down by dt ticks, stopping at 0"""
+    timer -= np.minimum(np.maximum(timer, 0), dt)
+
+
+def update_patrol(archetype, grid, dt):
+    if not archetype.count:
+        return
+    x = archetype.view("x")
+    direction = archetype.view("direction")
+    timer = archetype.view("move_timer")
+
+    timer += dt
+    turn = timer > PATROL_TURN_TICKS
+    direction[turn] *= -1
+    timer[turn] = 0
+
+    old_x = x.copy()
+    x += archetype.view("speed") * direction * dt
+    hit = rects_hit_tiles(grid, x, archetype.view("y"), archetype.view("width"), archetype.view("height"))
+    x[hit] = old_x[hit]
+    direction[hit] *= -1
+
+
+def update_aggro(archetype, player, sight, in_range):
+    """Rows in range take aggro once they see the player and keep it until out of range"""
+    aggro = archetype.view("aggro")
+    check = np.flatnonzero(in_range & ~aggro)
+    if len(check):
+        x = archetype.view("x")[check] + archetype.view("width")[check] / 2
+        y = archetype.view("y")[check] + archetype.view("height")[check] / 2
+        aggro[check] = sight.visible(x, y, player.x + player.width / 2, player.y + player.height / 2)
+    aggro &= in_range
+    return aggro
+
+
+def update_chasers(archetype, player, flow, sight, lod, dt):
+    """Chase a seen player inside CHASER_RANGE; chasers idle well beyond it fall asleep"""
+    if not archetype.count:
+        return
+    x = archetype.view("x")
+    y = archetype.view("y")
+    gap = np.maximum(np.abs(player.x - x), np.abs(player.y - y))
+    chasing = update_aggro(archetype, player, sight, (gap < CHASER_RANGE) & (dt > 0))
+    chase_path(archetype, flow, player, archetype.view("speed") * 0.7 * dt, chasing)
+    idle = (dt > 0) & (gap > CHASER_RANGE + LOD_SLEEP_MARGIN) & (archetype.view("damage_timer") <= 0)
+    lod.sleep(archetype, idle, CHASER_RANGE, CHASER_RANGE)
+
+
+def teleport_glitch(glitch, player, sight):
+    """Think task: jump near the player, onto open ground the player can see.
+
+    A few random offsets are tried; if none is clear the jump is retried shortly.
+    """
+    if not glitch.alive or glitch.teleport_timer > 0:
+        return
+    player_x = player.x + player.width / 2
+    player_y = player.y + player.height / 2
+    for _ in range(GLITCH_TELEPORT_TRIES):
+        # Uses the simulation RNG like the rest of the tick
+        x = player.x + random.randint(-80, 80)
+        y = player.y + random.randint(-80, 80)
+        if (not rects_hit_tiles(sight.grid, np.array([x]), np.array([y]), glitch.width, glitch.height)[0]
+                and sight.can_see(x + glitch.width / 2, y + glitch.height / 2, player_x, player_y)):
+            break
+    else:
+        glitch.teleport_timer = GLITCH_TELEPORT_RETRY_TICKS
+        return
+    glitch.x = x
+    glitch.y = y
+    glitch.teleport_timer = GLITCH_TELEPORT_COOLDOWN
+    from ui.audio import audio_manager
+    audio_manager.play_sound("glitch")
+    log.debug("Glitch enemy teleported!")
+
+
+def update_glitch(archetype, player, flow, sight, scheduler, dt):
+    if not archetype.count:
+        return
+    x = archetype.view("x")
+    y = archetype.view("y")
+    timer = archetype.view("teleport_timer")
+    count_down(timer, dt)
+
+    distance_sq = (player.x - x) ** 2 + (player.y - y) ** 2
+    teleport = (distance_sq < GLITCH_TELEPORT_RANGE ** 2) & (timer <= 0) & (dt > 0)
+    for row in np.flatnonzero(teleport):
+        glitch = archetype.entities[row]
+        scheduler.submit("teleport", glitch, distance_sq[row] ** 0.5, partial(teleport_glitch, glitch, player, sight))
+
+    # A glitch either teleports or chases on a tick, never both
+    chase_path(archetype, flow, player, archetype.view("speed") * dt, (dt > 0) & ~teleport)
+
+
+def standoff_cell(grid, x, y, player_x, player_y):
+    """Open cell about BOSS_STANDOFF from the player, on the player's line to (x, y)"""
+    dx = x - player_x
+    dy = y - player_y
+    distance = (dx * dx + dy * dy) ** 0.5
+    if distance <= 0:
+        return None
+    goal_x = player_x + dx / distance * BOSS_STANDOFF
+    goal_y = player_y + dy / distance * BOSS_STANDOFF
+    return nearest_open_cell(grid, int(goal_x // TILE_SIZE), int(goal_y // TILE_SIZE))
+
+
+def replan_boss(boss, player, paths):
+    """Think task: request an A* route to a fresh stand-off point"""
+    if not boss.alive:
+        return
+    boss.special_timer = BOSS_REPOSITION_TICKS
+    x = boss.x + boss.width / 2
+    y = boss.y + boss.height / 2
+    start = (int(x // TILE_SIZE), int(y // TILE_SIZE))
+    goal = standoff_cell(paths.grid, x, y, player.x + player.width / 2, player.y + player.height / 2)
+    boss.route = paths.request(start, goal) if goal else None
+    boss.route_step = 1  # Cell 0 is where the boss already stands
+
+
+def fire_boss(boss, player, bullets, sight):
+    """Think task: a volley from the centre toward the player, if the line is clear.
+
+    The pattern escalates as the boss is hurt: one aimed shot, then an
+    aimed fan, then a ring.
+    """
+    if not boss.alive or boss.attack_timer > 0:
+        return
+    x, y = boss.x + boss.width//2, boss.y + boss.height//2
+    target_x, target_y = player.x + player.width / 2, player.y + player.height / 2
+    if not sight.can_see(x, y, target_x, target_y):
+        boss.attack_timer = BOSS_SIGHT_RETRY_TICKS
+        return
+    if boss.health <= BOSS_RING_HEALTH:
+        fired = ring(bullets, x, y, BOSS_RING_COUNT, PROJECTILE_SPEED,
+                     phase=math.atan2(target_y - y, target_x - x), owner=boss.bullet_owner)
+    elif boss.health <= BOSS_FAN_HEALTH:
+        fired = aimed(bullets, x, y, target_x, target_y, PROJECTILE_SPEED,
+                      count=BOSS_FAN_COUNT, spread=BOSS_FAN_SPREAD, owner=boss.bullet_owner)
+    else:
+        fired = aimed(bullets, x, y, target_x, target_y, PROJECTILE_SPEED, owner=boss.bullet_owner)
+    if fired:
+        boss.attack_timer = BOSS_FIRE_COOLDOWN
+
+
+def reposition_bosses(archetype, rows, player, paths, scheduler, distance, dt):
+    """Phase 2 bosses walk an A* route to a stand-off point, replanning every BOSS_REPOSITION_TICKS"""
+    x = archetype.view("x")
+    y = archetype.view("y")
+    speed = archetype.view("speed")
+    timer = archetype.view("special_timer")
+    for row in rows:
+        boss = archetype.entities[row]
+        half_width, half_height = boss.width / 2, boss.height / 2
+        if timer[row] <= 0:
+            scheduler.submit("replan", boss, distance[row], partial(replan_boss, boss, player, paths))
+        route = boss.route
+        if route is None or not route.found or boss.route_step >= len(route.path):
+            continue
+        col, cell_row = route.path[boss.route_step]
+        target_x = col * TILE_SIZE + TILE_SIZE / 2 - half_width
+        target_y = cell_row * TILE_SIZE + TILE_SIZE / 2 - half_height
+        step = speed[row] * dt[row]
+        if abs(target_x - x[row]) <= step and abs(target_y - y[row]) <= step:
+            x[row], y[row] = target_x, target_y
+            boss.route_step += 1
+        else:
+            x[row] += step * np.sign(target_x - x[row])
+            y[row] += step * np.sign(target_y - y[row])
+
+
+def update_bosses(archetype, player, bullets, flow, paths, sight, lod, scheduler, dt):
+    """Phase 1 slow chase, phase 2 repositioning volleys, phase 3 fast rush.
+
+    Chasing and rushing bosses far outside their reach fall asleep.
+    """
+    if not archetype.count:
+        return
+    x = archetype.view("x")
+    y = archetype.view("y")
+    health = archetype.view("health")
+    speed = archetype.view("speed")
+    attack_timer = archetype.view("attack_timer")
+
+    chasing = health > 6
+    rushing = health <= 3
+    reach = np.where(chasing, BOSS_CHASE_RANGE, BOSS_RUSH_RANGE)
+    gap = np.maximum(np.abs(player.x - x), np.abs(player.y - y))
+    due = dt > 0
+    move = update_aggro(archetype, player, sight, (chasing | rushing) & (gap < reach) & due)
+    chase_path(archetype, flow, player, np.where(chasing, speed, speed * 2) * dt, move)
+
+    shooting = ~chasing & ~rushing & due
+    distance = np.hypot(player.x - x, player.y - y)
+    reposition_bosses(archetype, np.flatnonzero(shooting), player, paths, scheduler, distance, dt)
+
+    for row in np.flatnonzero(shooting & (attack_timer <= 0)):
+        boss = archetype.entities[row]
+        scheduler.submit("fire", boss, distance[row], partial(fire_boss, boss, player, bullets, sight))
+
+    count_down(attack_timer, dt)
+    count_down(archetype.view("special_timer"), dt)
+    idle = (chasing | rushing) & due & (gap > reach + LOD_SLEEP_MARGIN) & (archetype.view("damage_timer") <= 0)
+    lod.sleep(archetype, idle, reach, reach)
+
+
+def update_rocks(archetype, grid, player, lod):
+    """Rocks fall once the player is below them; untriggered rocks far to the side sleep.
+
+    Falling rocks always update every tick so their arc does not depend on LOD.
+    """
+    if archetype is None or not archetype.count:
+        return
+    x = archetype.view("x")
+    y = archetype.view("y")
+    vel_y = archetype.view("vel_y")
+    active = archetype.view("active")
+    awake = ~archetype.view("sleeping")
+    gap = np.abs(player.x - x)
+    trigger = archetype.view("trigger_distance")
+    active |= awake & (gap < trigger)
+    lod.sleep(archetype, awake & ~active & (gap > trigger + LOD_SLEEP_MARGIN), trigger, lod.world_height)
+
+    vel_y[active] = np.minimum(vel_y[active] + GRAVITY * 0.5, MAX_FALL_SPEED)
+    old_y = y.copy()
+    y[active] += vel_y[active]
+    hit = active & rects_hit_tiles(grid, x, y, archetype.view("width"), archetype.view("height"))
+    y[hit] = old_y[hit]
+    vel_y[hit] = 0
+
+
+def update_enemies(room, player):
+    """Move every enemy, boss and bullet in the room, tick damage flashes, then run think tasks"""
+    store = room.store
+    lod = room.lod
+    lod.begin_tick(player)
+    flow = room.flow_field
+    flow.set_source_at(player.x + player.width / 2, player.y + player.height / 2)
+    room.paths.update()
+    sight = room.sight
+    sight.begin_tick()
+    for name, archetype in list(store.archetypes.items()):
+        if not archetype.count or name == "rock":
+            continue
+        dt = lod.ticks(archetype, player)
+        if name == "patrol":
+            update_patrol(archetype, room.tile_grid, dt)
+        elif name == "chaser":
+            update_chasers(archetype, player, flow, sight, lod, dt)
+        elif name == "glitch":
+            update_glitch(archetype, player, flow, sight, room.ai, dt)
+        elif name == "boss":
+            update_bosses(archetype, player, room.bullets, flow, room.paths, sight, lod, room.ai, dt)
+        count_down(archetype.view("damage_timer"), dt)
+    room.ai.run()
+    room.bullets.update(room.tile_grid, *room.world_size())
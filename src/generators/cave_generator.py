@@ -36,21 +36,25 @@ class CaveParameters:
 
 class CaveGenerator:
     @staticmethod
-    def generate_cave(width, height, params):
-        """Main cave generation function using parameters"""
+    def generate_cave(width, height, params, rng=random):
+        """Main cave generation function using parameters.
+
+        rng is any object with the random module's API; pass a seeded
+        random.Random to generate the same cave on any thread.
+        """
         if params.cave_type == "cellular":
-            return CaveGenerator.generate_cellular_automata(width, height, params)
+            return CaveGenerator.generate_cellular_automata(width, height, params, rng)
         elif params.cave_type == "perlin":
-            return CaveGenerator.generate_perlin_cave(width, height, params)
+            return CaveGenerator.generate_perlin_cave(width, height, params, rng)
         elif params.cave_type == "maze":
-            return CaveGenerator.generate_maze_cave(width, height, params)
+            return CaveGenerator.generate_maze_cave(width, height, params, rng)
         elif params.cave_type == "cavern":
-            return CaveGenerator.generate_cavern(width, height, params)
+            return CaveGenerator.generate_cavern(width, height, params, rng)
         else:  # mixed
-            return CaveGenerator.generate_mixed_cave(width, height, params)
+            return CaveGenerator.generate_mixed_cave(width, height, params, rng)
     
     @staticmethod
-    def generate_cellular_automata(width, height, params):
+    def generate_cellular_automata(width, height, params, rng=random):
         cave = [[False for _ in range(width)] for _ in range(height)]
         
         for y in range(height):
@@ -67,7 +71,7 @@ class CaveGenerator:
                     center_distance = abs(y - height // 2) / (height // 2)
                     base_density += params.horizontal_bias * center_distance * 0.3
                     
-                cave[y][x] = random.random() < base_density
+                cave[y][x] = rng.random() < base_density
         
         # Cellular automata iterations
         for iteration in range(params.iterations):
@@ -82,10 +86,10 @@ class CaveGenerator:
         return cave
     
     @staticmethod
-    def generate_perlin_cave(width, height, params):
+    def generate_perlin_cave(width, height, params, rng=random):
         cave = [[False for _ in range(width)] for _ in range(height)]
-        offset_x = random.randint(0, 1000)
-        offset_y = random.randint(0, 1000)
+        offset_x = rng.randint(0, 1000)
+        offset_y = rng.randint(0, 1000)
         
         for y in range(height):
             for x in range(width):
@@ -108,7 +112,7 @@ class CaveGenerator:
         return cave
     
     @staticmethod
-    def generate_maze_cave(width, height, params):
+    def generate_maze_cave(width, height, params, rng=random):
         """Generate maze-like cave structures"""
         cave = [[True for _ in range(width)] for _ in range(height)]
         
@@ -139,26 +143,26 @@ class CaveGenerator:
             elif params.vertical_bias > 0:
                 directions = [(0, 4), (0, -4), (4, 0), (-4, 0)]
                 
-            random.shuffle(directions)
+            rng.shuffle(directions)
             
             for dx, dy in directions:
                 nx, ny = x + dx, y + dy
                 if (0 < nx < width - 1 and 0 < ny < height - 1 and 
-                    (nx, ny) not in visited and random.random() < 0.7):
+                    (nx, ny) not in visited and rng.random() < 0.7):
                     stack.append((nx, ny))
         
         return cave
     
     @staticmethod
-    def generate_cavern(width, height, params):
+    def generate_cavern(width, height, params, rng=random):
         """Generate large open caverns"""
         cave = [[True for _ in range(width)] for _ in range(height)]
         
         num_caverns = max(2, int(4 * params.room_size_preference))
         
         for _ in range(num_caverns):
-            cx = random.randint(width // 4, 3 * width // 4)
-            cy = random.randint(height // 4, 3 * height // 4)
+            cx = rng.randint(width // 4, 3 * width // 4)
+            cy = rng.randint(height // 4, 3 * height // 4)
             
             base_radius = int(20 + params.room_size_preference * 30)
             
@@ -171,21 +175,21 @@ class CaveGenerator:
                     
                     distance = math.sqrt((dx / x_scale) ** 2 + (dy / y_scale) ** 2)
                     
-                    if distance < base_radius * (0.7 + random.random() * 0.3):
+                    if distance < base_radius * (0.7 + rng.random() * 0.3):
                         cave[y][x] = False
         
         return cave
     
     @staticmethod
-    def generate_mixed_cave(width, height, params):
+    def generate_mixed_cave(width, height, params, rng=random):
         """Combine multiple generation techniques"""
-        cave1 = CaveGenerator.generate_cellular_automata(width, height, params)
+        cave1 = CaveGenerator.generate_cellular_automata(width, height, params, rng)
         
         perlin_params = CaveParameters(
             noise_scale=params.noise_scale * 1.5,
             room_size_preference=1 - params.room_size_preference
         )
-        cave2 = CaveGenerator.generate_perlin_cave(width, height, perlin_params)
+        cave2 = CaveGenerator.generate_perlin_cave(width, height, perlin_params, rng)
         
         combined = [[False for _ in range(width)] for _ in range(height)]
         for y in range(height):
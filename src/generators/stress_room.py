@@ -0,0 +1,107 @@
+import random
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import *
+from entities.bullets import BulletPool
+from entities.entities import Crystal, Enemy, GlitchEnemy, Boss, FallingRock, MovingPlatform
+from entities.room import Room
+from entities.store import EntityStore
+from physics.colliders import ColliderSet
+
+class StressParameters:
+    def __init__(self,
+                 enemies=0,
+                 bosses=0,
+                 rocks=0,
+                 platforms=0,
+                 crystals=0,
+                 bullets=0,
+                 open_arena=True,
+                 bullet_speed=0.3,
+                 size=(CAVE_WIDTH, CAVE_HEIGHT)):
+
+        self.enemies = enemies  # Patrol, chaser and glitch enemies in a 2:2:1 mix
+        self.bosses = bosses
+        self.rocks = rocks  # Falling rocks placed above open tiles
+        self.platforms = platforms  # Moving platforms (dynamic colliders for the player)
+        self.crystals = crystals  # One in five is a glitch crystal
+        self.bullets = bullets  # Live bullets at the start, drifting slowly
+        self.open_arena = open_arena  # Clear the cave interior so nothing starts inside a wall
+        self.bullet_speed = bullet_speed
+        self.size = size  # Room size in tiles; bigger than the screen scrolls
+
+
+def build_stress_room(params, seed=0, room_id=0):
+    """A Room filled with params' counts of each object type.
+
+    The room is generated normally (so the same seed gives the same room),
+    then its objects are replaced with the requested numbers placed at
+    random open tiles.
+    """
+    rng = random.Random(f"stress-{seed}")
+    room = Room(room_id, seed=f"{seed}-{room_id}", size=params.size)
+    if params.open_arena:
+        for y in range(1, room.rows - 1):
+            for x in range(1, room.cols - 1):
+                room.cave_map[y][x] = False
+        room.rebuild_walls()
+        room.generate_wall_rotations()
+
+    # Drop whatever place_objects spawned
+    room.store = EntityStore()
+    room.bullets = BulletPool(capacity=max(BULLET_POOL_SIZE, params.bullets))
+    room.colliders = ColliderSet(room.tile_grid)
+    room.crystals = []
+    room.enemies = []
+    room.keys = []
+    room.doors = []
+    room.falling_rocks = []
+    room.moving_platforms = []
+    room.bosses = []
+    room.pickups = None
+
+    open_tiles = [(x, y) for y in range(2, room.rows - 2) for x in range(2, room.cols - 2)
+                  if not room.cave_map[y][x]]
+    if not open_tiles:
+        return room
+
+    def random_point():
+        x, y = rng.choice(open_tiles)
+        return x * TILE_SIZE + TILE_SIZE // 2, y * TILE_SIZE + TILE_SIZE // 2
+
+    enemy_types = ["patrol", "chaser", "patrol", "chaser", "glitch"]
+    for i in range(params.enemies):
+        x, y = random_point()
+        enemy_type = enemy_types[i % len(enemy_types)]
+        if enemy_type == "glitch":
+            room.enemies.append(GlitchEnemy(x, y, rng=rng, store=room.store))
+        else:
+            room.enemies.append(Enemy(x, y, enemy_type, rng=rng, store=room.store))
+
+    for _ in range(params.bosses):
+        x, y = random_point()
+        room.bosses.append(Boss(x, y, rng=rng, store=room.store))
+
+    for _ in range(params.rocks):
+        x, y = random_point()
+        room.falling_rocks.append(FallingRock(x, max(TILE_SIZE, y - rng.randint(100, 200)), store=room.store))
+
+    for _ in range(params.platforms):
+        x, y = random_point()
+        room.add_platform(MovingPlatform(x, y, TILE_SIZE * 4))
+
+    for i in range(params.crystals):
+        x, y = random_point()
+        room.crystals.append(Crystal(x, y, is_glitch=i % 5 == 4))
+
+    if params.bullets:
+        points = [random_point() for _ in range(params.bullets)]
+        headings = [rng.uniform(-1, 1) for _ in range(params.bullets * 2)]
+        room.bullets.spawn([p[0] for p in points], [p[1] for p in points],
+                           [h * params.bullet_speed for h in headings[::2]],
+                           [h * params.bullet_speed for h in headings[1::2]])
+    return room
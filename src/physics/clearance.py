@@ -0,0 +1,74 @@
+import math
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import *
+from physics.tiles import rects_hit_tiles
+
+CLEARANCE_MAX = 4  # Largest open square tracked, in tiles
+
+
+class ClearanceField:
+    """Per-cell size of the open square whose top-left corner is that cell.
+
+    clearance[row, col] = k means the k x k tiles from (col, row) are all
+    open (capped at CLEARANCE_MAX), so a rect of k tiles fits exactly there.
+    Rebuilt with the tile grid; lookups around a point are one array slice.
+    """
+
+    def __init__(self, grid=None):
+        self.grid = None
+        self.clearance = None
+        if grid is not None:
+            self.set_grid(grid)
+
+    def set_grid(self, grid):
+        self.grid = grid
+        fits = ~grid
+        clearance = fits.astype(np.int8)
+        for _ in range(CLEARANCE_MAX - 1):
+            # A (k+1)-square fits where four overlapping k-squares do
+            grown = np.zeros_like(fits)
+            grown[:-1, :-1] = fits[:-1, :-1] & fits[1:, :-1] & fits[:-1, 1:] & fits[1:, 1:]
+            fits = grown
+            clearance += fits
+        self.clearance = clearance
+
+    def fits(self, x, y, width, height):
+        return not rects_hit_tiles(self.grid, np.array([x]), np.array([y]), width, height)[0]
+
+    def resolve(self, x, y, width, height, radius=TELEPORT_SEARCH_RADIUS, sight=None, origin=None):
+        """Top-left position nearest (x, y) where the rect fits, or None.
+
+        (x, y) itself is kept if it is clear; otherwise cells within radius
+        tiles are ranked by distance. With sight, the spot's centre must also
+        be visible from origin.
+        """
+        def seen(xs, ys):
+            if sight is None:
+                return np.ones(len(xs), dtype=bool)
+            return sight.visible(xs + width / 2, ys + height / 2, origin[0], origin[1])
+
+        if self.fits(x, y, width, height) and seen(np.array([x]), np.array([y]))[0]:
+            return x, y
+
+        need = math.ceil(max(width, height) / TILE_SIZE)
+        rows, cols = self.clearance.shape
+        col = int(round(x / TILE_SIZE))
+        row = int(round(y / TILE_SIZE))
+        first_col, last_col = max(col - radius, 0), min(col + radius + 1, cols)
+        first_row, last_row = max(row - radius, 0), min(row + radius + 1, rows)
+        if first_col >= last_col or first_row >= last_row:
+            return None
+        found_rows, found_cols = np.nonzero(self.clearance[first_row:last_row, first_col:last_col] >= need)
+        spot_x = (found_cols + first_col) * TILE_SIZE
+        spot_y = (found_rows + first_row) * TILE_SIZE
+        order = np.argsort((spot_x - x) ** 2 + (spot_y - y) ** 2, kind="stable")
+        spot_x = spot_x[order]
+        spot_y = spot_y[order]
+        visible = np.flatnonzero(seen(spot_x, spot_y))
+        if not len(visible):
+            return None
+        best = visible[0]
+        return int(spot_x[best]), int(spot_y[best])
@@ -0,0 +1,82 @@
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import *
+from physics.collision import TERRAIN, SOLID_LAYERS
+from physics.sweep import sweep, touching
+from physics.tiles import rects_hit_tiles
+
+
+class ColliderSet:
+    """Everything solid in a room: static tiles plus a few dynamic rects.
+
+    The static set is the room's tile grid (the TERRAIN layer), used as is
+    and never copied. The dynamic set holds the rects of locked doors and
+    moving platforms with their layer; owners move them in place, and a
+    door's rect leaves the set when it unlocks. Queries take a layer mask
+    and read both sets without building any per-tick lists.
+    """
+
+    def __init__(self, grid=None):
+        self.grid = grid
+        self.dynamic = []  # (layer, rect)
+        self.by_mask = {}  # mask -> dynamic rects on those layers, dropped when the set changes
+
+    def set_grid(self, grid):
+        self.grid = grid
+
+    def add(self, rect, layer):
+        """Register a rect its owner keeps up to date; returns it"""
+        self.dynamic.append((layer, rect))
+        self.by_mask.clear()
+        return rect
+
+    def remove(self, rect):
+        self.dynamic = [entry for entry in self.dynamic if entry[1] is not rect]
+        self.by_mask.clear()
+
+    def rects(self, mask):
+        rects = self.by_mask.get(mask)
+        if rects is None:
+            rects = self.by_mask[mask] = [rect for layer, rect in self.dynamic if layer & mask]
+        return rects
+
+    def tiles(self, mask):
+        return self.grid if mask & TERRAIN else None
+
+    def hits_static(self, rect):
+        return bool(rects_hit_tiles(self.grid, np.array([rect.x]), np.array([rect.y]), rect.width, rect.height)[0])
+
+    def overlaps(self, rect, mask=SOLID_LAYERS):
+        if rect.collidelist(self.rects(mask)) != -1:
+            return True
+        return bool(mask & TERRAIN) and self.hits_static(rect)
+
+    def push_out(self, x, y, width, height, mask=SOLID_LAYERS):
+        """Smallest (dx, dy) that moves the body clear of the dynamic rects it overlaps.
+
+        Platforms move after the bodies they hit, so a body can start its
+        tick inside one; it leaves by the shallowest side. Tiles are not
+        considered here (sweep ignores tile overlap instead).
+        """
+        push_x = push_y = 0
+        for rect in self.rects(mask):
+            left, top = x + push_x, y + push_y
+            if not (rect.left < left + width and left < rect.right and
+                    rect.top < top + height and top < rect.bottom):
+                continue
+            exits = (rect.left - left - width, rect.right - left, rect.top - top - height, rect.bottom - top)
+            shortest = min(range(4), key=lambda side: abs(exits[side]))
+            if shortest < 2:
+                push_x += exits[shortest]
+            else:
+                push_y += exits[shortest]
+        return push_x, push_y
+
+    def sweep(self, x, y, width, height, dx, dy, mask=SOLID_LAYERS):
+        """Swept move against the solids on mask's layers (see physics.sweep)"""
+        return sweep(self.tiles(mask), x, y, width, height, dx, dy, self.rects(mask))
+
+    def touching(self, x, y, width, height, dx, dy, mask=SOLID_LAYERS):
+        return touching(self.tiles(mask), x, y, width, height, dx, dy, self.rects(mask))
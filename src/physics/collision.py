@@ -0,0 +1,172 @@
+import numpy as np
+import pygame
+
+# Collision layers (bit flags). Every body is on one layer; its mask lists the layers it collides with
+PLAYER = 1 << 0
+ATTACK = 1 << 1
+ENEMY = 1 << 2
+BOSS = 1 << 3
+PICKUP = 1 << 4
+HAZARD = 1 << 5
+PROJECTILE = 1 << 6
+TERRAIN = 1 << 7
+PLATFORM = 1 << 8
+DOOR = 1 << 9
+LAYERS = (PLAYER, ATTACK, ENEMY, BOSS, PICKUP, HAZARD, PROJECTILE, TERRAIN, PLATFORM, DOOR)
+
+SOLID_LAYERS = TERRAIN | PLATFORM | DOOR  # Blocking geometry, resolved by sweeps (physics.colliders)
+PHASE_MASK = SOLID_LAYERS  # Layers a phasing player passes through
+
+# Who collides with what, in one place; every entry here is enforced.
+# Solid layers are handled by the player's sweeps, the rest are contacts
+# found by CollisionWorld (or, for PROJECTILE, by check_bullet_hits).
+# Pairs are listed once, on the querying side. Enemies, rocks and bullets
+# meet the tile grid in their own batch systems, not through masks.
+COLLISION_MASKS = {
+    PLAYER: PICKUP | ENEMY | HAZARD | PROJECTILE | SOLID_LAYERS,
+    ATTACK: ENEMY | BOSS,
+    ENEMY: 0,
+    BOSS: 0,
+    PICKUP: 0,
+    HAZARD: 0,
+    PROJECTILE: 0,
+    TERRAIN: 0,
+    PLATFORM: 0,
+    DOOR: 0,
+}
+
+class Collider:
+    """A rect registered for one tick, or one contact row of a BodyGroup.
+
+    owner is the game object, parent the list it lives in (so handlers can
+    remove it) and data any per-tick payload such as the attack's weapon stats.
+    Contacts with a group carry the group and row instead of a rect.
+    """
+
+    def __init__(self):
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.owner = None
+        self.parent = None
+        self.data = None
+        self.category = 0  # The collider's layer
+        self.mask = 0
+        self.group = None
+        self.row = -1
+
+
+class BodyGroup:
+    """Many bodies of one layer held as column arrays (x, y, width, height).
+
+    owners[i] is row i's game object and live marks the rows that can be
+    touched (None for all). An archetype's views make a group with no
+    copying; groups that outlive a tick can clear live rows as they go.
+    """
+
+    def __init__(self, category, owners, x, y, width, height, live=None, parent=None):
+        self.category = category
+        self.owners = owners
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.live = live
+        self.parent = parent
+
+    def overlapping(self, rect):
+        """Rows whose rects overlap rect, in row order"""
+        hit = ((self.x < rect.right) & (self.x + self.width > rect.left) &
+               (self.y < rect.bottom) & (self.y + self.height > rect.top))
+        if self.live is not None:
+            hit &= self.live
+        return np.flatnonzero(hit).tolist()
+
+
+class CollisionWorld:
+    """One contact pass per tick, dispatching typed contacts.
+
+    Only colliders with a mask look for contacts, and there are only a
+    few (the player and its attack). Each tests the other colliders and
+    every BodyGroup whose layer is in its mask, a group at a time in
+    whole-array operations, so nothing is rebuilt per entity each tick
+    and groups on other layers are never looked at. Contacts are
+    dispatched grouped by handler, in the order handlers were registered;
+    each querier's contacts follow registration order, then row order.
+    """
+
+    def __init__(self):
+        self.handlers = []  # (category_a, category_b, handler)
+        self.pool = []  # Collider objects reused across ticks
+        self.count = 0
+        self.groups = []
+        self.bodies = []  # Collider objects reused for group contacts
+        self.body_count = 0
+        self.contacts = []
+
+    def on(self, category_a, category_b, handler):
+        """Call handler(a, b) for each contact of an A collider with a B collider"""
+        self.handlers.append((category_a, category_b, handler))
+
+    def begin(self):
+        self.count = 0
+        self.body_count = 0
+        self.groups.clear()
+
+    def add(self, owner, x, y, width, height, category, mask=None, parent=None, data=None):
+        """Register a collider; mask defaults to the category's COLLISION_MASKS entry"""
+        if mask is None:
+            mask = COLLISION_MASKS[category]
+        if self.count == len(self.pool):
+            self.pool.append(Collider())
+        collider = self.pool[self.count]
+        self.count += 1
+        collider.rect.update(x, y, width, height)
+        collider.owner = owner
+        collider.parent = parent
+        collider.data = data
+        collider.category = category
+        collider.mask = mask & ~SOLID_LAYERS  # Solids are resolved by movement, not here
+        return collider
+
+    def add_group(self, group):
+        """Register a BodyGroup for this tick"""
+        self.groups.append(group)
+
+    def body(self, group, row):
+        if self.body_count == len(self.bodies):
+            self.bodies.append(Collider())
+        body = self.bodies[self.body_count]
+        self.body_count += 1
+        body.owner = group.owners[row]
+        body.parent = group.parent
+        body.category = group.category
+        body.group = group
+        body.row = row
+        return body
+
+    def find_contacts(self):
+        """Pairs (querier, other) whose rects overlap and whose masks match"""
+        contacts = self.contacts
+        contacts.clear()
+        pool = self.pool
+        for i in range(self.count):
+            collider = pool[i]
+            mask = collider.mask
+            if not mask:
+                continue
+            rect = collider.rect
+            for j in range(self.count):
+                other = pool[j]
+                if other is not collider and other.category & mask and rect.colliderect(other.rect):
+                    contacts.append((collider, other))
+            for group in self.groups:
+                if group.category & mask:
+                    for row in group.overlapping(rect):
+                        contacts.append((collider, self.body(group, row)))
+        return contacts
+
+    def dispatch(self):
+        """Run handlers over this tick's contacts"""
+        for category_a, category_b, handler in self.handlers:
+            for a, b in self.contacts:
+                if a.category & category_a and b.category & category_b:
+                    handler(a, b)
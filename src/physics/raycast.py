@@ -0,0 +1,129 @@
+"""Line of sight over the tile grid by DDA (grid traversal) from cell to cell.
+
+A ray runs from the centre of one cell to the centre of another and visits
+every cell it crosses, stepping one column or row at a time with exact
+integer arithmetic (on a corner tie it steps the column first). Sight is
+blocked when any cell strictly between the two ends is solid, so an entity
+standing partly in rock can still see out.
+
+LineOfSight answers batches (many cells to one target) with a whole-array
+traversal, and remembers answers per (cell, target cell) for a short time:
+one visibility table per recent target, dropped every LOS_CACHE_TICKS ticks
+or when the grid changes.
+"""
+from collections import OrderedDict
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import *
+
+LOS_CACHE_TICKS = 60
+LOS_CACHE_TARGETS = 32  # Target cells with a remembered visibility table
+
+
+def trace_many(grid, cols, rows, target_col, target_row):
+    """True where the rays from (cols, rows) to the target cell cross no solid cell"""
+    col = np.array(cols, dtype=np.int64)
+    row = np.array(rows, dtype=np.int64)
+    dx = target_col - col
+    dy = target_row - row
+    step_x = np.sign(dx)
+    step_y = np.sign(dy)
+    run_x = np.abs(dx)
+    run_y = np.abs(dy)
+    # Crossing the next column/row boundary happens at (2i + 1) / (2 * run); compare cross-multiplied
+    next_x = run_y.copy()
+    next_y = run_x.copy()
+    run_x2 = run_x * 2
+    run_y2 = run_y * 2
+    steps = run_x + run_y
+    blocked = np.zeros(len(col), dtype=bool)
+    for k in range(int(steps.max(initial=0)) - 1):  # The last step lands on the target
+        moving = (k < steps - 1) & ~blocked
+        if not moving.any():
+            break
+        along_x = moving & (next_x <= next_y)
+        along_y = moving ^ along_x
+        col += along_x * step_x
+        row += along_y * step_y
+        next_x += along_x * run_y2
+        next_y += along_y * run_x2
+        blocked |= moving & grid[row, col]
+    return ~blocked
+
+
+class LineOfSight:
+    """Cached cell-to-cell visibility for one room"""
+
+    def __init__(self, grid=None, cache_ticks=LOS_CACHE_TICKS):
+        self.cache_ticks = cache_ticks
+        self.tables = OrderedDict()  # (col, row) of target -> int8 table: -1 unknown, 0 blocked, 1 clear
+        self.tick = 0
+        self.rays = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.grid = None
+        if grid is not None:
+            self.set_grid(grid)
+
+    def set_grid(self, grid):
+        self.grid = grid
+        self.rows, self.cols = grid.shape
+        self.tables.clear()
+
+    def begin_tick(self):
+        """Forget cached answers every cache_ticks ticks"""
+        self.tick += 1
+        if self.tick % self.cache_ticks == 0:
+            self.tables.clear()
+
+    def cell(self, x, y):
+        """Grid cell containing a point, clamped to the grid (arrays or scalars)"""
+        col = np.clip(np.floor_divide(x, TILE_SIZE).astype(np.int64), 0, self.cols - 1)
+        row = np.clip(np.floor_divide(y, TILE_SIZE).astype(np.int64), 0, self.rows - 1)
+        return col, row
+
+    def table(self, target):
+        table = self.tables.get(target)
+        if table is None:
+            table = self.tables[target] = np.full((self.rows, self.cols), -1, dtype=np.int8)
+            if len(self.tables) > LOS_CACHE_TARGETS:
+                self.tables.popitem(last=False)
+        else:
+            self.tables.move_to_end(target)
+        return table
+
+    def visible_cells(self, cols, rows, target_col, target_row):
+        """Batch query: for each (col, row), can the target cell be seen from it"""
+        cols = np.asarray(cols, dtype=np.int64)
+        rows = np.asarray(rows, dtype=np.int64)
+        table = self.table((int(target_col), int(target_row)))
+        known = table[rows, cols]
+        missing = known < 0
+        misses = int(missing.sum())
+        self.cache_hits += len(known) - misses
+        if misses:
+            self.cache_misses += misses
+            flat = np.unique(rows[missing] * self.cols + cols[missing])
+            self.rays += len(flat)
+            clear = trace_many(self.grid, flat % self.cols, flat // self.cols, target_col, target_row)
+            table.ravel()[flat] = clear
+            known = table[rows, cols]
+        return known == 1
+
+    def visible(self, x, y, target_x, target_y):
+        """Batch query by position: can (target_x, target_y) be seen from each (x, y)"""
+        cols, rows = self.cell(np.atleast_1d(x), np.atleast_1d(y))
+        target_col, target_row = self.cell(target_x, target_y)
+        return self.visible_cells(cols, rows, target_col, target_row)
+
+    def can_see(self, x, y, target_x, target_y):
+        return bool(self.visible(x, y, target_x, target_y)[0])
+
+    def stats(self):
+        return {
+            'rays': self.rays,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses
+        }
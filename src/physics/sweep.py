@@ -0,0 +1,93 @@
+"""Swept AABB movement against the tile grid and a few extra rects.
+
+sweep() moves a rect along one axis and stops it at the first solid tile
+or obstacle rect in its path, visiting only the columns (or rows) between
+the leading edge and where it would end up. Tiles the rect already
+overlaps are ignored, so something embedded in rock can always move out.
+A rect it overlaps still blocks moving further into it (towards its
+centre); moving bodies are pushed out of those first (see ColliderSet).
+Move one axis at a time, x then y, like the player does.
+"""
+import math
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import *
+
+CONTACT_PROBE = 1e-6  # Distance probed for resting contact (hits leave edges exactly on a tile boundary)
+
+
+class Sweep:
+    """Outcome of one axis move: distance travelled, time of impact (0-1) and contact normal"""
+
+    __slots__ = ("distance", "time", "normal")
+
+    def __init__(self, distance, time=1.0, normal=0):
+        self.distance = distance
+        self.time = time
+        self.normal = normal  # -1/1 on the moved axis when blocked, else 0
+
+    @property
+    def hit(self):
+        return self.normal != 0
+
+
+def sweep(grid, x, y, width, height, dx, dy, rects=(), tile_size=TILE_SIZE):
+    """Move the rect by dx or dy (one of them zero) until it touches a solid tile or rect.
+
+    grid may be None to sweep against the rects alone.
+    """
+    if dy:
+        # Sweep the transposed world so one routine handles both axes
+        return sweep_along(None if grid is None else grid.T, y, x, height, width, dy, rects, tile_size, True)
+    if dx:
+        return sweep_along(grid, x, y, width, height, dx, rects, tile_size, False)
+    return Sweep(0.0)
+
+
+def sweep_along(grid, x, y, width, height, dx, rects, tile_size, transposed):
+    """Sweep along the second grid axis (columns); grid is indexed [row, col].
+
+    With transposed, x/y and the rects' axes are swapped to match grid.
+    """
+    rows, cols = grid.shape if grid is not None else (0, 0)
+    first_row = max(int(y // tile_size), 0)
+    last_row = min(math.ceil((y + height) / tile_size) - 1, rows - 1)
+    allowed = dx
+    if dx > 0:
+        edge = x + width
+        # Columns whose left boundary lies in [edge, edge + dx)
+        for col in range(max(math.ceil(edge / tile_size), 0), min(math.ceil((edge + dx) / tile_size), cols)):
+            if grid[first_row:last_row + 1, col].any():
+                allowed = col * tile_size - edge
+                break
+        for rect in rects:
+            left, top, rect_width, rect_height = (rect.top, rect.left, rect.height, rect.width) if transposed else rect
+            if top < y + height and top + rect_height > y:
+                if edge <= left < edge + allowed:
+                    allowed = left - edge
+                elif x < left + rect_width and left < edge and left + rect_width / 2 > x + width / 2:
+                    allowed = 0  # Already inside it; only backing out is free
+    else:
+        edge = x
+        # Columns whose right boundary lies in (edge + dx, edge], nearest first
+        for col in range(min(math.floor(edge / tile_size), cols) - 1, max(math.floor((edge + dx) / tile_size), 0) - 1, -1):
+            if grid[first_row:last_row + 1, col].any():
+                allowed = (col + 1) * tile_size - edge
+                break
+        for rect in rects:
+            left, top, rect_width, rect_height = (rect.top, rect.left, rect.height, rect.width) if transposed else rect
+            right = left + rect_width
+            if top < y + height and top + rect_height > y:
+                if edge + allowed < right <= edge:
+                    allowed = right - edge
+                elif right > edge and left < x + width and left + rect_width / 2 < x + width / 2:
+                    allowed = 0
+    if allowed == dx:
+        return Sweep(dx)
+    return Sweep(allowed, allowed / dx, 1 if dx > 0 else -1)
+
+
+def touching(grid, x, y, width, height, dx, dy, rects=()):
+    """True if the rect rests against something in the direction (dx, dy)"""
+    return sweep(grid, x, y, width, height, dx * CONTACT_PROBE, dy * CONTACT_PROBE, rects).hit
@@ -0,0 +1,40 @@
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import *
+
+
+def build_tile_grid(cave_map):
+    """Solid-tile grid (rows, cols) from a cave map, borders included"""
+    grid = np.array(cave_map, dtype=bool)
+    grid[0, :] = grid[-1, :] = True
+    grid[:, 0] = grid[:, -1] = True
+    return grid
+
+
+def rects_hit_tiles(grid, x, y, width, height, tile_size=TILE_SIZE):
+    """For arrays of rects, True where the rect overlaps a solid tile.
+
+    Positions truncate like pygame.Rect, so the answer matches colliderect
+    against tile-sized rects of the solid tiles. Tiles outside the grid are empty.
+    """
+    left = np.trunc(x).astype(np.int64)
+    top = np.trunc(y).astype(np.int64)
+    first_col = left // tile_size
+    first_row = top // tile_size
+    last_col = (left + width - 1) // tile_size
+    last_row = (top + height - 1) // tile_size
+
+    rows, cols = grid.shape
+    hit = np.zeros(len(left), dtype=bool)
+    if not len(left):
+        return hit
+    for dy in range(int((last_row - first_row).max()) + 1):
+        row = first_row + dy
+        row_ok = (row <= last_row) & (row >= 0) & (row < rows)
+        for dx in range(int((last_col - first_col).max()) + 1):
+            col = first_col + dx
+            inside = row_ok & (col <= last_col) & (col >= 0) & (col < cols)
+            hit |= inside & grid[np.clip(row, 0, rows - 1), np.clip(col, 0, cols - 1)]
+    return hit
@@ -1,13 +1,23 @@
 import pygame
-import os
+from core.asset_manager import asset_manager
+from core.log import get_logger
+
+log = get_logger("audio")
 
 class AudioManager:
     def __init__(self):
-        pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
         self.sounds = {}
         self.music_volume = 0.7
         self.sfx_volume = 0.8
+        self.initialized = False
+        
+    def init(self):
+        """Open the mixer and load all sounds (safe to run on a loader thread)"""
+        if self.initialized:
+            return
+        pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
         self.load_all_sounds()
+        self.initialized = True
         
     def load_sound(self, name, filename):
         """Load a sound file"""
@@ -15,27 +25,29 @@ class AudioManager:
             sound = pygame.mixer.Sound(filename)
             sound.set_volume(self.sfx_volume)
             self.sounds[name] = sound
-            print(f"Loaded sound: {name} from {filename}")
+            log.debug("Loaded sound: %s from %s", name, filename)
         except Exception as e:
-            print(f"Failed to load sound {name} from {filename}: {e}")
+            log.warning("Failed to load sound %s from %s: %s", name, filename, e)
             # Create placeholder sound if file doesn't exist
             self.sounds[name] = None
             
     def play_sound(self, name):
         """Play a sound effect"""
-        print(f"Trying to play sound: {name}")
+        if not self.initialized:
+            return
+        log.debug("Trying to play sound: %s", name)
         # Check if we have a direct sound file
         if name in self.sounds and self.sounds[name]:
-            print(f"Playing direct sound: {name}")
+            log.debug("Playing direct sound: %s", name)
             self.sounds[name].play()
         # Check if we have a mapped sound
         elif hasattr(self, 'sound_mapping') and name in self.sound_mapping:
             mapped_sound = self.sound_mapping[name]
-            print(f"Using mapped sound: {name} -> {mapped_sound}")
+            log.debug("Using mapped sound: %s -> %s", name, mapped_sound)
             if mapped_sound in self.sounds and self.sounds[mapped_sound]:
                 self.sounds[mapped_sound].play()
         else:
-            print(f"No sound found for: {name}, generating beep")
+            log.debug("No sound found for: %s, generating beep", name)
             # Generate simple beep sound programmatically
             self.generate_beep(name)
             
@@ -118,9 +130,9 @@ class AudioManager:
             pygame.mixer.music.load(filename)
             pygame.mixer.music.set_volume(0.3)  # Low volume
             pygame.mixer.music.play(-1)  # Loop indefinitely
-            print(f"Background music loaded and started: {filename}")
+            log.info("Background music loaded and started: %s", filename)
         except Exception as e:
-            print(f"Failed to load background music {filename}: {e}")
+            log.warning("Failed to load background music %s: %s", filename, e)
             
     def set_music_volume(self, volume):
         """Set background music volume (0.0 to 1.0)"""
@@ -149,15 +161,10 @@ class AudioManager:
         }
         
         for name, filename in sound_files.items():
-            # Get path relative to project root
-            project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            asset_path = os.path.join(project_root, "assets", "audio", filename)
-            self.load_sound(name, asset_path)
+            self.load_sound(name, asset_manager.audio_path(filename))
             
         # Load and start background music
-        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        bg_music_path = os.path.join(project_root, "assets", "audio", "bg_sound.wav")
-        self.load_background_music(bg_music_path)
+        self.load_background_music(asset_manager.audio_path("bg_sound.wav"))
             
         # Map sounds to game actions
         self.sound_mapping = {
@@ -0,0 +1,77 @@
+import pygame
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import *
+from ui.text import text_renderer
+
+FRAME_BUDGET_MS = 1000.0 / FPS
+OVERLAY_REFRESH_FRAMES = 15  # Re-render stats text this often
+
+
+class ProfilerOverlay:
+    """On-screen per-phase bars and a frame-time graph for the FrameProfiler"""
+
+    def __init__(self, profiler, x=SCREEN_WIDTH - 330, y=10, width=320):
+        self.profiler = profiler
+        self.x = x
+        self.y = y
+        self.width = width
+        self.frame_counter = 0
+        self.rows = []  # (name surface, numbers surface, avg ms, p95 ms)
+        self.header = None
+        self.background = None
+
+    def refresh(self):
+        """Recompute stats and text only every few frames"""
+        stats = self.profiler.frame_stats()
+        self.header = text_renderer.font(18).render(
+            f"frame  min {stats.min:.1f}  avg {stats.avg:.1f}  p95 {stats.p95:.1f}  max {stats.max:.1f} ms",
+            True, WHITE)
+        self.rows = []
+        for name in sorted(self.profiler.samples):
+            stats = self.profiler.stats(name)
+            label = text_renderer.font(16).render(name, True, WHITE)
+            numbers = text_renderer.font(16).render(
+                f"{stats.min:.2f}  {stats.avg:.2f}  {stats.p95:.2f}  {stats.max:.2f}", True, WHITE)
+            self.rows.append((label, numbers, stats.avg, stats.p95))
+
+    def draw(self, screen):
+        if not self.profiler.enabled:
+            return
+        if self.frame_counter % OVERLAY_REFRESH_FRAMES == 0 or self.header is None:
+            self.refresh()
+        self.frame_counter += 1
+
+        row_height = 14
+        graph_height = 50
+        height = 30 + len(self.rows) * row_height + graph_height + 10
+        if self.background is None or self.background.get_height() != height:
+            self.background = pygame.Surface((self.width, height))
+            self.background.set_alpha(200)
+            self.background.fill((10, 10, 20))
+        screen.blit(self.background, (self.x, self.y))
+        screen.blit(self.header, (self.x + 5, self.y + 5))
+
+        # Per-phase bars: avg filled, p95 tick, scaled to one frame budget
+        bar_x = self.x + 5
+        bar_width = self.width - 10
+        y = self.y + 25
+        for label, numbers, avg, p95 in self.rows:
+            filled = min(bar_width, int(avg / FRAME_BUDGET_MS * bar_width))
+            pygame.draw.rect(screen, (60, 60, 120), (bar_x, y, filled, row_height - 2))
+            p95_x = bar_x + min(bar_width - 1, int(p95 / FRAME_BUDGET_MS * bar_width))
+            pygame.draw.line(screen, YELLOW, (p95_x, y), (p95_x, y + row_height - 3))
+            screen.blit(label, (bar_x + 2, y))
+            screen.blit(numbers, (bar_x + bar_width - numbers.get_width(), y))
+            y += row_height
+
+        # Frame-time graph with the frame budget line
+        graph_top = y + 5
+        budget_y = graph_top + graph_height - int(graph_height / 2)
+        pygame.draw.line(screen, GREEN, (bar_x, budget_y), (bar_x + bar_width, budget_y))
+        for i, frame_ms in enumerate(self.profiler.frame_times):
+            line_height = min(graph_height, int(frame_ms / (FRAME_BUDGET_MS * 2) * graph_height))
+            color = RED if frame_ms > FRAME_BUDGET_MS else CRYSTAL_BLUE
+            x = bar_x + int(i * bar_width / self.profiler.window)
+            pygame.draw.line(screen, color, (x, graph_top + graph_height), (x, graph_top + graph_height - line_height))
@@ -0,0 +1,87 @@
+import pygame
+from collections import OrderedDict
+
+
+class TextRenderer:
+    """Keeps fonts open and caches rendered text surfaces with LRU eviction"""
+
+    def __init__(self, max_entries=512):
+        self.fonts = {}  # size -> Font
+        self.cache = OrderedDict()  # (text, size, color) -> Surface
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size):
+        """Return the default font at the given size, opening it once"""
+        font = self.fonts.get(size)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = pygame.font.Font(None, size)
+            self.fonts[size] = font
+        return font
+
+    def render(self, text, size, color):
+        """Rendered antialiased text, reused while it stays in the cache"""
+        key = (text, size, color)
+        surface = self.cache.get(key)
+        if surface is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.font(size).render(text, True, color)
+        self.cache[key] = surface
+        if len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+        return surface
+
+
+class Label:
+    """Retained text label that only re-renders when its value changes.
+
+    A tuple value fills several template fields.
+    """
+
+    def __init__(self, renderer, size, color, template="{}"):
+        self.renderer = renderer
+        self.size = size
+        self.color = color
+        self.template = template
+        self.value = None
+        self.surface = None
+
+    def set(self, value, color=None):
+        """Update the label and return its surface"""
+        color = color or self.color
+        if self.surface is None or value != self.value or color != self.color:
+            self.value = value
+            self.color = color
+            text = self.template.format(*value) if isinstance(value, tuple) else self.template.format(value)
+            # Render directly; changing values would only churn the shared cache
+            self.surface = self.renderer.font(self.size).render(text, True, color)
+        return self.surface
+
+
+class Hud:
+    """Named retained labels for the on-screen HUD"""
+
+    def __init__(self, renderer):
+        self.renderer = renderer
+        self.labels = {}
+
+    def add(self, name, size, color, template="{}"):
+        self.labels[name] = Label(self.renderer, size, color, template)
+        return self.labels[name]
+
+    def draw(self, screen, name, value, pos, color=None):
+        """Blit a label at a top-left position, re-rendering only on change"""
+        surface = self.labels[name].set(value, color)
+        screen.blit(surface, pos)
+        return surface
+
+
+# Global text renderer instance
+text_renderer = TextRenderer()